@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""ddr_compensation.py
+
+DD-R hidden-compensation analysis (docs/Frameworks_DD_DDR_E.md, DD R §3c/§3d).
+
+Question: when an aggregate series looks restored after a rupture, is the
+restoration structural, or do its components shift in opposite directions
+and cancel out ("compensations artificielles", "divergences cachées")?
+
+Method (structure only, no interpretation):
+- pre/post windows are row ranges [start, end) given by the caller
+- per column (aggregate + components): window means, in chunked passes
+- delta_i = mean_post_i - mean_pre_i (per-component contribution)
+- gross = sum |delta_i|, net = |sum delta_i|
+- compensation_ratio = 1 - net / gross (0: all shifts aligned, 1: full cancel)
+- scale = pre-window standard deviation of the aggregate
+
+Outcomes (DD R §4):
+- restored_structural       aggregate restored, components did not move
+- restored_by_compensation  aggregate restored, large opposing component shifts
+- not_restored              aggregate not back within tolerance
+- inconclusive              not enough points in a window
+
+Inputs:
+- wide CSV: header row, one aggregate column, optional ts column, all other
+  columns are components
+- .npy matrix (rows x (1 + components)), column 0 = aggregate, memory-mapped
+
+Memory is bounded by --chunk-mb whatever the number of rows; NumPy is required.
+
+Usage:
+  python scripts/ddr_compensation.py --input wide.csv --pre 0:1000 --post 5000:6000 --out ddr_report.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+VERDICTS = ("restored_structural", "restored_by_compensation", "not_restored", "inconclusive")
+
+
+def _np():
+    try:
+        import numpy as np
+    except ImportError as e:  # pragma: no cover - depends on the environment
+        raise SystemExit("ddr_compensation requires numpy (pip install numpy)") from e
+    return np
+
+
+def _parse_range(txt: str) -> Tuple[int, int]:
+    try:
+        a, b = txt.split(":")
+        start, end = int(a), int(b)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"range attendu START:END, reçu: {txt}")
+    if start < 0 or end <= start:
+        raise argparse.ArgumentTypeError(f"range vide ou négatif: {txt}")
+    return start, end
+
+
+def _chunk_rows(n_cols: int, chunk_mb: float) -> int:
+    return max(1, int(chunk_mb * 1024 * 1024) // (8 * max(n_cols, 1)))
+
+
+def _iter_csv(
+    path: Path, aggregate_col: str, ts_col: Optional[str], chunk_mb: float
+) -> Tuple[List[str], Iterator[Any]]:
+    """Component names + iterator of (rows, 1 + components) float64 chunks (aggregate first)."""
+    np = _np()
+    f = path.open("r", encoding="utf-8", newline="")
+    header = [h.strip() for h in f.readline().rstrip("\r\n").split(",")]
+    if aggregate_col not in header:
+        f.close()
+        raise ValueError(f"colonne agrégat absente: {aggregate_col}")
+    skip = {aggregate_col} | ({ts_col} if ts_col else set())
+    comp_idx = [i for i, h in enumerate(header) if h not in skip]
+    usecols = [header.index(aggregate_col)] + comp_idx
+    rows = _chunk_rows(len(usecols), chunk_mb)
+
+    def chunks() -> Iterator[Any]:
+        with f:
+            while True:
+                lines = list(itertools.islice(f, rows))
+                if not lines:
+                    return
+                yield np.loadtxt(lines, delimiter=",", usecols=usecols, dtype=np.float64, ndmin=2)
+
+    return [header[i] for i in comp_idx], chunks()
+
+
+def _iter_npy(path: Path, chunk_mb: float) -> Tuple[List[str], Iterator[Any]]:
+    np = _np()
+    mat = np.load(str(path), mmap_mode="r")
+    if mat.ndim != 2 or mat.shape[1] < 2:
+        raise ValueError(f"matrice (rows, 1 + composantes) attendue, reçu: {mat.shape}")
+    rows = _chunk_rows(mat.shape[1], chunk_mb)
+
+    def chunks() -> Iterator[Any]:
+        for r0 in range(0, mat.shape[0], rows):
+            yield np.asarray(mat[r0 : r0 + rows], dtype=np.float64)
+
+    return [f"c{i}" for i in range(1, mat.shape[1])], chunks()
+
+
+def window_means(chunks: Iterator[Any], pre: Tuple[int, int], post: Tuple[int, int]) -> Dict[str, Any]:
+    """One pass: per-column sums over pre/post windows + aggregate pre-window variance.
+
+    The aggregate variance is merged chunk by chunk (Chan et al.), so it stays
+    stable for series with a large mean.
+    """
+    np = _np()
+    acc: Dict[str, Any] = {"pre_sum": None, "post_sum": None, "pre_n": 0, "post_n": 0, "pre_m2_agg": 0.0, "rows": 0}
+    r0 = 0
+    for block in chunks:
+        r1 = r0 + block.shape[0]
+        if acc["pre_sum"] is None:
+            acc["pre_sum"] = np.zeros(block.shape[1])
+            acc["post_sum"] = np.zeros(block.shape[1])
+        for name, (a, b) in (("pre", pre), ("post", post)):
+            lo, hi = max(a, r0), min(b, r1)
+            if lo < hi:
+                part = block[lo - r0 : hi - r0]
+                if name == "pre":
+                    n_a, n_b = acc["pre_n"], hi - lo
+                    mean_a = acc["pre_sum"][0] / n_a if n_a else 0.0
+                    mean_b = float(part[:, 0].mean())
+                    m2_b = float(((part[:, 0] - mean_b) ** 2).sum())
+                    d = mean_b - mean_a
+                    acc["pre_m2_agg"] += m2_b + d * d * n_a * n_b / (n_a + n_b)
+                acc[f"{name}_sum"] += part.sum(axis=0)
+                acc[f"{name}_n"] += hi - lo
+        r0 = r1
+    acc["rows"] = r0
+    return acc
+
+
+def analyze(
+    acc: Dict[str, Any],
+    components: List[str],
+    restore_tol: float = 0.5,
+    compensation_threshold: float = 0.5,
+    min_gross: float = 1.0,
+    min_points: int = 2,
+    top: int = 10,
+) -> Dict[str, Any]:
+    np = _np()
+    report: Dict[str, Any] = {
+        "rows": acc["rows"],
+        "components": len(components),
+        "pre_points": acc["pre_n"],
+        "post_points": acc["post_n"],
+        "params": {
+            "restore_tol": restore_tol,
+            "compensation_threshold": compensation_threshold,
+            "min_gross": min_gross,
+            "min_points": min_points,
+        },
+    }
+    if acc["pre_n"] < min_points or acc["post_n"] < min_points or acc["pre_sum"] is None:
+        report["verdict"] = "inconclusive"
+        return report
+
+    mean_pre = acc["pre_sum"] / acc["pre_n"]
+    mean_post = acc["post_sum"] / acc["post_n"]
+    delta = mean_post - mean_pre
+    std_pre = float(np.sqrt(acc["pre_m2_agg"] / acc["pre_n"]))
+    scale = std_pre if std_pre > 0 else max(abs(float(mean_pre[0])), 1.0)
+
+    d_comp = delta[1:]
+    gross = float(np.abs(d_comp).sum())
+    net_signed = float(d_comp.sum())
+    ratio = 1.0 - abs(net_signed) / gross if gross > 0 else 0.0
+    d_agg = float(delta[0])
+
+    restored = abs(d_agg) <= restore_tol * scale
+    compensated = ratio >= compensation_threshold and gross >= min_gross * scale
+    if restored and compensated:
+        verdict = "restored_by_compensation"
+    elif restored:
+        verdict = "restored_structural"
+    else:
+        verdict = "not_restored"
+
+    k = min(top, d_comp.size)
+    up = np.argsort(-d_comp, kind="stable")[:k]
+    down = np.argsort(d_comp, kind="stable")[:k]
+    report.update(
+        {
+            "verdict": verdict,
+            "hidden_divergence": bool(compensated),
+            "aggregate": {
+                "mean_pre": float(mean_pre[0]),
+                "mean_post": float(mean_post[0]),
+                "delta": d_agg,
+                "std_pre": std_pre,
+                "scale": scale,
+            },
+            "components_sum_delta": net_signed,
+            "residual": d_agg - net_signed,
+            "gross_shift": gross,
+            "compensation_ratio": ratio,
+            "top_positive": [{"component": components[i], "delta": float(d_comp[i])} for i in up if d_comp[i] > 0],
+            "top_negative": [{"component": components[i], "delta": float(d_comp[i])} for i in down if d_comp[i] < 0],
+        }
+    )
+    return report
+
+
+def run(
+    input_path: Path,
+    pre: Tuple[int, int],
+    post: Tuple[int, int],
+    aggregate_col: str = "aggregate",
+    ts_col: Optional[str] = "ts",
+    chunk_mb: float = 64.0,
+    **params: Any,
+) -> Dict[str, Any]:
+    if input_path.suffix.lower() == ".npy":
+        components, chunks = _iter_npy(input_path, chunk_mb)
+    else:
+        components, chunks = _iter_csv(input_path, aggregate_col, ts_col, chunk_mb)
+    report = analyze(window_means(chunks, pre, post), components, **params)
+    report["input"] = str(input_path)
+    report["pre"] = list(pre)
+    report["post"] = list(post)
+    return report
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="DD-R hidden-compensation analysis (aggregate vs components).")
+    ap.add_argument("--input", required=True, help="Wide CSV (header) or .npy matrix (column 0 = aggregate)")
+    ap.add_argument("--pre", required=True, type=_parse_range, help="Pre-rupture rows START:END (half-open)")
+    ap.add_argument("--post", required=True, type=_parse_range, help="Post-rupture rows START:END (half-open)")
+    ap.add_argument("--out", required=True, help="Output JSON report")
+    ap.add_argument("--aggregate-col", default="aggregate", help="CSV aggregate column name")
+    ap.add_argument("--ts-col", default="ts", help="CSV timestamp column to ignore ('' for none)")
+    ap.add_argument("--restore-tol", type=float, default=0.5, help="Restored if |delta agg| <= tol * pre std")
+    ap.add_argument("--compensation-threshold", type=float, default=0.5, help="Min compensation ratio to flag")
+    ap.add_argument("--min-gross", type=float, default=1.0, help="Min gross component shift (in pre std units)")
+    ap.add_argument("--min-points", type=int, default=2, help="Min points per window")
+    ap.add_argument("--top", type=int, default=10, help="Top offsetting components listed per side")
+    ap.add_argument("--chunk-mb", type=float, default=64.0, help="Memory budget per chunk (MB)")
+    args = ap.parse_args()
+
+    try:
+        report = run(
+            Path(args.input),
+            args.pre,
+            args.post,
+            aggregate_col=args.aggregate_col,
+            ts_col=args.ts_col or None,
+            chunk_mb=args.chunk_mb,
+            restore_tol=args.restore_tol,
+            compensation_threshold=args.compensation_threshold,
+            min_gross=args.min_gross,
+            min_points=args.min_points,
+            top=args.top,
+        )
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"[ddr_compensation] {e}\n")
+        return 2
+
+    outp = Path(args.out)
+    outp.parent.mkdir(parents=True, exist_ok=True)
+    outp.write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
+    print(f"[ddr_compensation] verdict={report['verdict']} out={outp}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
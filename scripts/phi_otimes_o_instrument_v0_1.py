@@ -4,11 +4,27 @@
 from __future__ import annotations
 
 import argparse
+import bisect
+import contextlib
+import glob
+import hashlib
+import importlib
+import io
+import itertools
 import json
+import math
 import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from array import array
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 from statistics import median
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 __instrument_id__ = "phi_otimes_o"
 __version__ = "0.1"
@@ -22,6 +38,14 @@ SCORE_MIN = 0
 SCORE_MAX = 3
 
 
+def _sibling(name: str) -> Any:
+    """Sibling module scripts/<name>.py, also when this file runs as a script (no `scripts` package)."""
+    try:
+        return importlib.import_module(f"scripts.{name}")
+    except ImportError:
+        return importlib.import_module(name)
+
+
 def _tau_label() -> str:
     # prefer unicode tau unless forced to ASCII
     force_ascii = os.environ.get("PHIO_FORCE_ASCII_TAU", "0") == "1"
@@ -53,34 +77,679 @@ def _is_int_strict(x: Any) -> bool:
 
 
 def validate_input(data: Dict[str, Any]) -> None:
+    if isinstance(data, ItemTable):
+        # items were validated when the table was built
+        if not len(data):
+            raise ValueError("input.items absent ou vide")
+        return
     items = data.get("items", None)
     if not isinstance(items, list) or not items:
         raise ValueError("input.items absent ou vide")
     for idx, it in enumerate(items):
-        if not isinstance(it, dict):
-            raise ValueError(f"item[{idx}] doit être un objet")
-        if "dimension" not in it:
-            raise ValueError(f"item[{idx}] clé 'dimension' manquante")
-        dim = it.get("dimension")
-        if not isinstance(dim, str) or not dim.strip():
-            raise ValueError(f"item[{idx}].dimension invalide")
-        if "score" not in it:
-            raise ValueError(f"item[{idx}] clé 'score' manquante")
-        sc = it.get("score")
-        if not _is_int_strict(sc):
-            raise ValueError(f"item[{idx}].score doit être int-only (reçu: {type(sc).__name__})")
-        if sc < SCORE_MIN or sc > SCORE_MAX:
-            raise ValueError(f"item[{idx}].score hors borne [{SCORE_MIN},{SCORE_MAX}]: {sc}")
+        _validate_item(idx, it)
+
+
+class InputErrors(ValueError):
+    """Every invalid item of an input (all_errors=True); str() lists them one per line."""
+
+    def __init__(self, errors: List[str]) -> None:
+        super().__init__("\n".join(errors))
+        self.errors = errors
+
+
+def _validate_item(idx: int, it: Any) -> None:
+    if not isinstance(it, dict):
+        raise ValueError(f"item[{idx}] doit être un objet")
+    if "dimension" not in it:
+        raise ValueError(f"item[{idx}] clé 'dimension' manquante")
+    dim = it.get("dimension")
+    if not isinstance(dim, str) or not dim.strip():
+        raise ValueError(f"item[{idx}].dimension invalide")
+    if "score" not in it:
+        raise ValueError(f"item[{idx}] clé 'score' manquante")
+    sc = it.get("score")
+    if not _is_int_strict(sc):
+        raise ValueError(f"item[{idx}].score doit être int-only (reçu: {type(sc).__name__})")
+    if sc < SCORE_MIN or sc > SCORE_MAX:
+        raise ValueError(f"item[{idx}].score hors borne [{SCORE_MIN},{SCORE_MAX}]: {sc}")
+
+
+# Streaming input: the top-level object is read in bounded chunks and the
+# "items" array is yielded one element at a time (never materialized).
+# Files below STREAM_MIN_BYTES are parsed with one json.loads instead.
+STREAM_CHUNK = 1 << 16
+STREAM_MIN_BYTES = 1 << 20
+# values closed by their own delimiter, and the characters that may follow a scalar
+_SELF_DELIMITED = '"{['
+_SCALAR_END = ",}] \t\n\r"
+# characters of "items" decoded per json.loads batch (bounds the dicts alive at once)
+STREAM_BATCH = 1 << 13
+
+
+class _JsonStream:
+    """Sliding text buffer over a file, decoded one JSON value at a time."""
+
+    def __init__(self, f: Any, chunk_size: int = STREAM_CHUNK) -> None:
+        self.f = f
+        self.chunk_size = max(1, chunk_size)
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self._decode = json.JSONDecoder().raw_decode
+        self._batch_failed = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        self._batch_failed = False
+        # grow geometrically while a single value spans the buffer
+        data = self.f.read(max(self.chunk_size, len(self.buf) - self.pos))
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos :] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of input), not consumed."""
+        while True:
+            buf, pos, n = self.buf, self.pos, len(self.buf)
+            while pos < n and buf[pos] in " \t\n\r":
+                pos += 1
+            self.pos = pos
+            if pos < n:
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def punct(self, allowed: str) -> str:
+        c = self.peek()
+        if not c or c not in allowed:
+            what = "fin de fichier" if not c else repr(c)
+            raise ValueError(f"JSON invalide: {' ou '.join(map(repr, allowed))} attendu, reçu {what}")
+        self.pos += 1
+        return c
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # a number or literal is complete only once a delimiter follows it:
+            # "1." or "1e" at the buffer end decodes as 1 but continues in the file
+            if self.buf[self.pos] not in _SELF_DELIMITED and (
+                end == len(self.buf) or self.buf[end] not in _SCALAR_END
+            ):
+                if self._fill():
+                    continue
+            self.pos = end
+            return obj
+
+    def elements(self) -> List[Any]:
+        """Array elements at the head of the buffer, up to the last "}," in STREAM_BATCH chars, in one json.loads.
+
+        A cut inside a string or a nested value leaves a bracket or a string
+        open, so the decode fails and [] is returned (value() then goes one
+        element at a time until the next refill).
+        """
+        if self._batch_failed:
+            return []
+        cut = self.buf.rfind("},", self.pos, self.pos + STREAM_BATCH)
+        if cut < 0:
+            return []
+        try:
+            out = json.loads("[" + self.buf[self.pos : cut + 1] + "]")
+        except ValueError:
+            self._batch_failed = True
+            return []
+        self.pos = cut + 2
+        return out
+
+
+def iter_input_items(path: Path, chunk_size: int = STREAM_CHUNK) -> Iterator[Any]:
+    """Yield the elements of input["items"] from a JSON file, in bounded memory.
+
+    Other top-level keys are parsed and discarded; the whole document is still
+    checked for syntax (the trailing part once the consumer is exhausted).
+    Nothing is yielded when "items" is absent or not a list. A second "items"
+    key is rejected (json.loads would keep the last one, but the first has
+    already been yielded).
+    """
+    with Path(path).open("r", encoding="utf-8") as f:
+        st = _JsonStream(f, chunk_size)
+        if st.peek() != "{":
+            st.value()
+            raise ValueError("input doit être un objet JSON")
+        st.pos += 1
+        seen_items = False
+        if st.peek() == "}":
+            st.pos += 1
+        else:
+            while True:
+                if st.peek() != '"':
+                    st.punct('"')
+                key = st.value()
+                st.punct(":")
+                if key == "items":
+                    if seen_items:
+                        raise ValueError("input.items dupliqué")
+                    seen_items = True
+                    if st.peek() == "[":
+                        st.pos += 1
+                        if st.peek() == "]":
+                            st.pos += 1
+                        else:
+                            while True:
+                                batch = st.elements()
+                                if batch:
+                                    yield from batch
+                                    continue
+                                yield st.value()
+                                if st.punct(",]") == "]":
+                                    break
+                    else:
+                        st.value()
+                else:
+                    st.value()
+                if st.punct(",}") == "}":
+                    break
+        if st.peek():
+            raise ValueError("JSON invalide: données après l'objet")
+
+
+def input_items(path: Path) -> Iterable[Any]:
+    """The items of an input JSON file: one json.loads below STREAM_MIN_BYTES, else iter_input_items()."""
+    path = Path(path)
+    if path.stat().st_size >= STREAM_MIN_BYTES:
+        return iter_input_items(path)
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError("input doit être un objet JSON")
+    items = data.get("items")
+    return items if isinstance(items, list) else []
+
+
+class ItemTable:
+    """Validated input items held as flat columns instead of dicts.
+
+    - labels / codes : interned dimension labels (code = first-appearance rank)
+    - dims           : array('i') of codes, one per item
+    - scores         : array('b') of scores
+    - weights        : array('d') of weights (1.0 when absent, NaN when invalid)
+
+    About 13 bytes per item, against several hundred for a parsed JSON item.
+    Weights are only checked by weighted modes, like the dict path: an
+    invalid one is kept as NaN and reported (item[idx].weight invalide) when
+    a weighted dimension reads it. validate_input, histogram_dimension_scores,
+    aggregate_dimension_scores, score_data and ScoringPlan.score accept a
+    table wherever they accept an input dict.
+    """
+
+    def __init__(self) -> None:
+        self.labels: List[str] = []
+        self.codes: Dict[str, int] = {}
+        self.dims = array("i")
+        self.scores = array("b")
+        self.weights = array("d")
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the three item columns."""
+        return sum(col.itemsize * len(col) for col in (self.dims, self.scores, self.weights))
+
+    def _intern(self, label: str) -> int:
+        code = self.codes.get(label)
+        if code is None:
+            code = self.codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    @classmethod
+    def from_items(cls, items: Iterable[Any], all_errors: bool = False) -> "ItemTable":
+        """Build and validate in one pass (validate_input messages; InputErrors with all_errors)."""
+        table = cls()
+        lo, hi = SCORE_MIN, SCORE_MAX
+        errors: List[str] = []
+        codes_get, dict_t, int_t, float_t = table.codes.get, dict, int, float
+        add_dim, add_score, add_weight = table.dims.append, table.scores.append, table.weights.append
+
+        def weight(idx: int, it: Dict[str, Any]) -> float:
+            try:
+                return _item_weight(idx, it)
+            except ValueError:
+                return math.nan
+
+        def slow(idx: int, it: Any) -> None:
+            try:
+                _validate_item(idx, it)
+            except ValueError as e:
+                if not all_errors:
+                    raise
+                errors.append(str(e))
+                return
+            add_dim(table._intern(it["dimension"]))
+            add_score(it["score"])
+            add_weight(weight(idx, it))
+
+        numbered = enumerate(items)
+        while True:
+            try:
+                for idx, it in numbered:
+                    if type(it) is dict_t:
+                        code = codes_get(it.get("dimension"))
+                        if code is not None:
+                            sc = it.get("score")
+                            if type(sc) is int_t and lo <= sc <= hi:
+                                w = it.get("weight", 1.0)
+                                add_dim(code)
+                                add_score(sc)
+                                add_weight(w if type(w) is float_t and 0.0 <= w < math.inf else weight(idx, it))
+                                continue
+                    slow(idx, it)
+                break
+            except TypeError:  # unhashable dimension: reported by the slow path
+                slow(idx, it)
+        if errors:
+            raise InputErrors(errors)
+        return table
+
+    @classmethod
+    def from_data(cls, data: Any, all_errors: bool = False) -> "ItemTable":
+        if not isinstance(data, dict):
+            raise ValueError("input doit être un objet JSON")
+        items = data.get("items", None)
+        if not isinstance(items, list) or not items:
+            raise ValueError("input.items absent ou vide")
+        return cls.from_items(items, all_errors=all_errors)
+
+    @classmethod
+    def from_file(cls, path: Path, all_errors: bool = False) -> "ItemTable":
+        """Table of an input file: streamed JSON (items never held as dicts) or a .phib container."""
+        if Path(path).suffix.lower() == ".phib":
+            PhibFile = _sibling("phio_binary").PhibFile
+
+            table = cls()
+            with PhibFile(path) as pf:
+                for label in pf.dimensions:
+                    table._intern(label)
+                for label, sc, w in pf.records():
+                    table.dims.append(table.codes[label])
+                    table.scores.append(sc)
+                    table.weights.append(w)
+        else:
+            table = cls.from_items(input_items(path), all_errors=all_errors)
+        if not len(table):
+            raise ValueError("input.items absent ou vide")
+        return table
+
+    def histograms(self, plan: "ScoringPlan") -> Dict[int, List[Any]]:
+        """plan slot -> per-score counts (weight sums for weighted modes), like ScoringPlan.histograms()."""
+        lo = SCORE_MIN
+        rows: List[List[Any]] = [[0] * N_BINS for _ in self.labels]
+        for (code, sc), n in Counter(zip(self.dims, self.scores)).items():
+            rows[code][sc - lo] = n
+        slots = [plan.slot(label) for label in self.labels]
+        masses = {code: [0.0] * N_BINS for code, s in enumerate(slots) if plan.weighted[s]}
+        if masses:
+            # item order, as the dict path, so float sums are identical
+            for idx, (code, sc, w) in enumerate(zip(self.dims, self.scores, self.weights)):
+                row = masses.get(code)
+                if row is not None:
+                    if w != w:
+                        raise ValueError(f"item[{idx}].weight invalide")
+                    row[sc - lo] += w
+            rows = [masses.get(code, row) for code, row in enumerate(rows)]
+        return {s: row for s, row in zip(slots, rows)}
+
+    def to_items(self) -> List[Dict[str, Any]]:
+        """Back to input items (dimension, score, weight)."""
+        labels = self.labels
+        return [
+            {"dimension": labels[code], "score": sc, "weight": w}
+            for code, sc, w in zip(self.dims, self.scores, self.weights)
+        ]
 
 
 def _agg(values: List[float], mode: str) -> float:
-    if not values:
+    # Reference implementation on raw values (kept for non-histogram callers).
+    return resolve_aggregator(mode or "median").scalar(values)
+
+
+N_BINS = SCORE_MAX - SCORE_MIN + 1
+
+
+def _kth_from_counts(counts: List[int], k: int) -> int:
+    # k-th smallest score (0-based) read off a per-score count vector
+    acc = 0
+    for i, c in enumerate(counts):
+        acc += c
+        if k < acc:
+            return i + SCORE_MIN
+    raise IndexError(k)
+
+
+def _median_from_counts(counts: List[int]) -> float:
+    n = sum(counts)
+    if n == 0:
+        return 0.0
+    half = n // 2
+    if n % 2:
+        return float(_kth_from_counts(counts, half))
+    # same arithmetic as statistics.median on an even-sized sample
+    return (_kth_from_counts(counts, half - 1) + _kth_from_counts(counts, half)) / 2
+
+
+def _bottleneck_from_counts(counts: List[int]) -> float:
+    for i, c in enumerate(counts):
+        if c:
+            return float(i + SCORE_MIN)
+    return 0.0
+
+
+def _mode_from_counts(counts: List[int]) -> float:
+    # most frequent score, lowest one on ties
+    if not any(counts):
+        return 0.0
+    return float(counts.index(max(counts)) + SCORE_MIN)
+
+
+def _quantile_from_counts(counts: List[int], p: float) -> float:
+    # linear interpolation between closest ranks (numpy's default "linear")
+    n = sum(counts)
+    if n == 0:
+        return 0.0
+    h = (n - 1) * p
+    i = int(h)
+    lo = _kth_from_counts(counts, i)
+    hi = _kth_from_counts(counts, min(i + 1, n - 1))
+    return lo + (h - i) * (hi - lo)
+
+
+def _trimmed_mean_from_counts(counts: List[int], f: float) -> float:
+    # mean after dropping int(n * f) items at each end
+    n = sum(counts)
+    if n == 0:
+        return 0.0
+    k = int(n * f)
+    total = 0
+    acc = 0
+    for i, c in enumerate(counts):
+        kept = min(acc + c, n - k) - max(acc, k)
+        if kept > 0:
+            total += kept * (i + SCORE_MIN)
+        acc += c
+    return total / (n - 2 * k)
+
+
+# Relative tolerance of the weighted-median half split: weight sums are float
+# sums in item order, so 0.1 + 0.2 against 0.3 must still count as a split.
+WEIGHT_SPLIT_RTOL = 1e-9
+
+
+def _weighted_median_from_masses(masses: List[float]) -> float:
+    # masses: summed item weights per score bin. Lower weighted median, averaged
+    # with the next non-empty bin on a half split (unit weights -> median).
+    total = sum(masses)
+    if total <= 0:
         return 0.0
-    m = (mode or "median").strip().lower()
-    if m == "bottleneck":
-        return float(min(values))
-    # default median
-    return float(median(values))
+    half = total / 2
+    tol = total * WEIGHT_SPLIT_RTOL
+    cum = 0.0
+    lo = None
+    for i, w in enumerate(masses):
+        cum += w
+        if cum > half + tol:
+            return float(i + SCORE_MIN) if lo is None else (lo + i + 2 * SCORE_MIN) / 2
+        if lo is None and w > 0 and cum >= half - tol:
+            lo = i
+    return float(len(masses) - 1 + SCORE_MIN)
+
+
+def _weighted_bottleneck_from_masses(masses: List[float]) -> float:
+    # lowest score carrying a positive weight (zero-weight items do not count)
+    for i, w in enumerate(masses):
+        if w > 0:
+            return float(i + SCORE_MIN)
+    return 0.0
+
+
+# Batched kernels: counts is a NumPy array (..., N_BINS) of per-score counts
+# (weight sums for weighted modes); they return (...) float64 arrays with the
+# same arithmetic as the per-histogram kernels above. np is passed in so that
+# NumPy stays an optional import of the callers.
+
+
+def _kth_batched(np, counts, k):
+    # index of the first bin whose cumulative count exceeds k
+    return (counts.cumsum(axis=-1) <= k[..., None]).sum(axis=-1)
+
+
+def _median_batched(np, counts):
+    n = counts.sum(axis=-1)
+    lo = _kth_batched(np, counts, (n - 1) // 2)
+    hi = _kth_batched(np, counts, n // 2)
+    return np.where(n > 0, (lo + hi + 2 * SCORE_MIN) / 2, 0.0)
+
+
+def _bottleneck_batched(np, counts):
+    nonzero = counts > 0
+    return np.where(nonzero.any(axis=-1), np.argmax(nonzero, axis=-1) + SCORE_MIN, 0).astype(np.float64)
+
+
+_weighted_bottleneck_batched = _bottleneck_batched
+
+
+def _mode_batched(np, counts):
+    return np.where(counts.sum(axis=-1) > 0, np.argmax(counts, axis=-1) + SCORE_MIN, 0).astype(np.float64)
+
+
+def _quantile_batched(np, counts, p):
+    n = counts.sum(axis=-1)
+    h = (n - 1) * p
+    i = np.floor(np.maximum(h, 0)).astype(np.int64)
+    lo = _kth_batched(np, counts, i) + SCORE_MIN
+    hi = _kth_batched(np, counts, np.minimum(i + 1, np.maximum(n - 1, 0))) + SCORE_MIN
+    return np.where(n > 0, lo + (h - i) * (hi - lo), 0.0)
+
+
+def _trimmed_mean_batched(np, counts, f):
+    n = counts.sum(axis=-1)
+    k = (n * f).astype(np.int64)
+    cum = counts.cumsum(axis=-1)
+    kept = np.minimum(cum, (n - k)[..., None]) - np.maximum(cum - counts, k[..., None])
+    total = (np.maximum(kept, 0) * np.arange(SCORE_MIN, SCORE_MIN + counts.shape[-1])).sum(axis=-1)
+    return np.where(n > 0, total / np.maximum(n - 2 * k, 1), 0.0)
+
+
+def _weighted_median_batched(np, masses):
+    cum = masses.cumsum(axis=-1)
+    half = (cum[..., -1] / 2)[..., None]
+    tol = (cum[..., -1] * WEIGHT_SPLIT_RTOL)[..., None]
+    # first bin past half the weight; on a split (within tol), averaged with the split bin
+    past = cum > half + tol
+    j = np.argmax(past, axis=-1)
+    tie = (cum >= half - tol) & ~past & (masses > 0)
+    i = np.argmax(tie, axis=-1)
+    wmed = np.where(tie.any(axis=-1), (i + j + 2 * SCORE_MIN) / 2, (j + SCORE_MIN).astype(np.float64))
+    return np.where(cum[..., -1] > 0, wmed, 0.0)
+
+
+class Aggregator:
+    """One aggregation mode, as three interchangeable kernels.
+
+    - scalar(values, weights=None): raw item values (the reference)
+    - from_counts(vector): one per-score histogram
+    - batched(np, array): many histograms at once, shape (..., N_BINS)
+
+    Weighted modes read per-score weight sums instead of counts. on_grid means
+    the result is always a half-integer score (ZoneLookupTable-compatible).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        from_counts: Callable[[List[int]], float],
+        batched: Callable[[Any, Any], Any],
+        weighted: bool = False,
+        on_grid: bool = True,
+        scalar: Optional[Callable[[List[float]], float]] = None,
+    ) -> None:
+        self.name = name
+        self.from_counts = from_counts
+        self.batched = batched
+        self.weighted = weighted
+        self.on_grid = on_grid
+        self._scalar = scalar
+
+    def scalar(self, values: List[float], weights: Optional[List[float]] = None) -> float:
+        if self._scalar is not None:
+            return self._scalar(values) if values else 0.0
+        masses = [0] * N_BINS
+        for i, v in enumerate(values):
+            b = int(v) - SCORE_MIN
+            if b != v - SCORE_MIN or not 0 <= b < N_BINS:
+                raise ValueError(f"score hors borne [{SCORE_MIN},{SCORE_MAX}]: {v}")
+            masses[b] += weights[i] if (self.weighted and weights is not None) else 1
+        return self.from_counts(masses)
+
+    def __repr__(self) -> str:
+        return f"Aggregator({self.name!r})"
+
+
+# name -> (factory(param or None) -> Aggregator, usage shown in --help)
+_AGGREGATOR_FACTORIES: Dict[str, Tuple[Callable[[Optional[str]], Aggregator], str]] = {}
+
+
+def register_aggregator(name: str, usage: Optional[str] = None) -> Callable:
+    """Decorator: register factory(param) -> Aggregator under `name` (spec: name or name-<param>)."""
+
+    def deco(factory: Callable[[Optional[str]], Aggregator]) -> Callable[[Optional[str]], Aggregator]:
+        _AGGREGATOR_FACTORIES[name] = (factory, usage or name)
+        resolve_aggregator.cache_clear()
+        return factory
+
+    return deco
+
+
+def aggregation_modes() -> List[str]:
+    """Usage strings of every registered mode (as listed by --help)."""
+    return [usage for _, usage in _AGGREGATOR_FACTORIES.values()]
+
+
+@lru_cache(maxsize=256)
+def resolve_aggregator(spec: str) -> Aggregator:
+    """Aggregator for a mode spec ("median", "quantile-0.9", ...); ValueError if unknown."""
+    m = (spec or "").strip().lower()
+    name, _, param = m.partition("-")
+    entry = _AGGREGATOR_FACTORIES.get(name)
+    if entry is None:
+        raise ValueError(f"mode d'agrégation inconnu: {spec!r} (attendu: {'|'.join(aggregation_modes())})")
+    return entry[0](param or None)
+
+
+def _no_param(name: str, param: Optional[str]) -> None:
+    if param is not None:
+        raise ValueError(f"mode d'agrégation {name}: pas de paramètre attendu (reçu: {param})")
+
+
+def _fraction(name: str, param: Optional[str], lo: float, hi: float, hi_open: bool) -> float:
+    try:
+        x = float(param) if param is not None else math.nan
+    except ValueError:
+        x = math.nan
+    if not (lo <= x < hi if hi_open else lo <= x <= hi):
+        bound = f"[{lo:g},{hi:g}{')' if hi_open else ']'}"
+        raise ValueError(f"mode d'agrégation {name}: paramètre dans {bound} attendu (reçu: {param})")
+    return x
+
+
+@register_aggregator("median")
+def _median_aggregator(param: Optional[str]) -> Aggregator:
+    _no_param("median", param)
+    # statistics.median stays the reference on raw values
+    return Aggregator("median", _median_from_counts, _median_batched, scalar=lambda v: float(median(v)))
+
+
+@register_aggregator("bottleneck")
+def _bottleneck_aggregator(param: Optional[str]) -> Aggregator:
+    _no_param("bottleneck", param)
+    return Aggregator("bottleneck", _bottleneck_from_counts, _bottleneck_batched, scalar=lambda v: float(min(v)))
+
+
+@register_aggregator("mode")
+def _mode_aggregator(param: Optional[str]) -> Aggregator:
+    _no_param("mode", param)
+    return Aggregator("mode", _mode_from_counts, _mode_batched)
+
+
+@register_aggregator("quantile", "quantile-<p>")
+def _quantile_aggregator(param: Optional[str]) -> Aggregator:
+    p = _fraction("quantile", param, 0.0, 1.0, hi_open=False)
+    return Aggregator(
+        f"quantile-{p!r}",
+        lambda counts: _quantile_from_counts(counts, p),
+        lambda np, counts: _quantile_batched(np, counts, p),
+        on_grid=False,
+    )
+
+
+@register_aggregator("trimmed_mean", "trimmed_mean[-<f>]")
+def _trimmed_mean_aggregator(param: Optional[str]) -> Aggregator:
+    f = _fraction("trimmed_mean", "0.1" if param is None else param, 0.0, 0.5, hi_open=True)
+    return Aggregator(
+        f"trimmed_mean-{f!r}",
+        lambda counts: _trimmed_mean_from_counts(counts, f),
+        lambda np, counts: _trimmed_mean_batched(np, counts, f),
+        on_grid=False,
+    )
+
+
+@register_aggregator("weighted_median")
+def _weighted_median_aggregator(param: Optional[str]) -> Aggregator:
+    _no_param("weighted_median", param)
+    return Aggregator("weighted_median", _weighted_median_from_masses, _weighted_median_batched, weighted=True)
+
+
+@register_aggregator("weighted_bottleneck")
+def _weighted_bottleneck_aggregator(param: Optional[str]) -> Aggregator:
+    _no_param("weighted_bottleneck", param)
+    return Aggregator(
+        "weighted_bottleneck", _weighted_bottleneck_from_masses, _weighted_bottleneck_batched, weighted=True
+    )
+
+
+def _aggregator_for(agg_modes: Dict[str, str], dim: str) -> Aggregator:
+    """Aggregator of a dimension under agg_modes (τ/tau aliases, default median)."""
+    return resolve_aggregator(agg_modes.get(dim) or agg_modes.get(_normalize_tau_label(dim)) or "median")
+
+
+def _mode_for(agg_modes: Dict[str, str], dim: str) -> str:
+    """Canonical aggregation mode name of a dimension (ValueError if unknown)."""
+    return _aggregator_for(agg_modes, dim).name
+
+
+def _item_weight(idx: int, it: Dict[str, Any]) -> float:
+    # weight of an item under a weighted mode: finite number >= 0, default 1.0
+    w = it.get("weight", 1.0)
+    if isinstance(w, bool) or not isinstance(w, (int, float)) or not (0 <= w < math.inf):
+        raise ValueError(f"item[{idx}].weight invalide")
+    return float(w)
+
+
+def _agg_counts(counts: List[int], mode: str) -> float:
+    """Aggregate one dimension from its per-score histogram (O(N_BINS)).
+
+    Weighted modes expect per-score weight sums instead of counts.
+    """
+    return resolve_aggregator(mode or "median").from_counts(counts)
 
 
 def _normalize_tau_label(dim: str) -> str:
@@ -91,33 +760,151 @@ def _normalize_tau_label(dim: str) -> str:
     return dim
 
 
-def aggregate_dimension_scores(data: Dict[str, Any], agg_modes: Dict[str, str]) -> Dict[str, float]:
-    buckets: Dict[str, List[float]] = {}
-    for it in data.get("items", []) or []:
+def histogram_dimension_scores(data: Dict[str, Any], agg_modes: Optional[Dict[str, str]] = None) -> Dict[str, List[int]]:
+    """One linear pass: dimension -> count per score bin (index = score - SCORE_MIN).
+
+    Dimensions keep their first-appearance order. Scores must be ints in
+    [SCORE_MIN, SCORE_MAX] (i.e. the input went through validate_input).
+    Dimensions with a weighted mode in agg_modes get weight sums instead of counts.
+    """
+    if isinstance(data, ItemTable):
+        plan = compile_plan(agg_modes)
+        return {plan.labels[slot]: row for slot, row in data.histograms(plan).items()}
+    hist: Dict[str, List[int]] = {}
+    lo, hi = SCORE_MIN, SCORE_MAX
+    weighted: Dict[str, bool] = {}
+    for idx, it in enumerate(data.get("items", []) or []):
         dim = it.get("dimension")
         if not dim:
             continue
-        sc = float(it.get("score", 0))
-        buckets.setdefault(str(dim), []).append(sc)
+        if not isinstance(dim, str):
+            dim = str(dim)
+        sc = it.get("score", 0)
+        if not _is_int_strict(sc) or sc < lo or sc > hi:
+            raise ValueError(f"item[{idx}].score hors borne [{SCORE_MIN},{SCORE_MAX}]: {sc}")
+        counts = hist.get(dim)
+        if counts is None:
+            counts = hist[dim] = [0] * N_BINS
+            weighted[dim] = agg_modes is not None and _aggregator_for(agg_modes, dim).weighted
+        counts[sc - lo] += _item_weight(idx, it) if weighted[dim] else 1
+    return hist
+
 
+def aggregate_histograms(hist: Dict[str, List[int]], agg_modes: Dict[str, str]) -> Dict[str, float]:
     out: Dict[str, float] = {}
-    for dim, vals in buckets.items():
-        mode = agg_modes.get(dim) or agg_modes.get(_normalize_tau_label(dim)) or "median"
-        out[dim] = _agg(vals, mode)
+    for dim, counts in hist.items():
+        out[dim] = _agg_counts(counts, _mode_for(agg_modes, dim))
     return out
 
 
+def aggregate_dimension_scores(data: Dict[str, Any], agg_modes: Dict[str, str]) -> Dict[str, float]:
+    return aggregate_histograms(histogram_dimension_scores(data, agg_modes), agg_modes)
+
+
+def _check_item(dim: Any, sc: Any) -> None:
+    # validate_input rules for a single (dimension, score) edit
+    if not isinstance(dim, str) or not dim.strip():
+        raise ValueError("item.dimension invalide")
+    if not _is_int_strict(sc):
+        raise ValueError(f"item.score doit être int-only (reçu: {type(sc).__name__})")
+    if sc < SCORE_MIN or sc > SCORE_MAX:
+        raise ValueError(f"item.score hors borne [{SCORE_MIN},{SCORE_MAX}]: {sc}")
+
+
+class IncrementalScorer:
+    """Running per-dimension histograms with O(1) edits.
+
+    Every edit (add_item / remove_item / update_score) touches one bin and
+    returns the new results payload (dimension_scores, T, K_eff, zone), with
+    the same values as rescoring the edited input from scratch. A dimension
+    whose last item is removed disappears from dimension_scores; dimensions
+    keep the order in which they (re)appeared.
+    """
+
+    def __init__(self, agg_modes: Optional[Dict[str, str]] = None) -> None:
+        self.plan = compile_plan(agg_modes)
+        if self.plan.any_weighted:
+            # edits carry no weight, and float weight sums do not undo exactly
+            raise ValueError("IncrementalScorer: modes pondérés non supportés")
+        self.hist: Dict[str, List[int]] = {}
+        self.dim_scores: Dict[str, float] = {}
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any], agg_modes: Optional[Dict[str, str]] = None) -> "IncrementalScorer":
+        validate_input(data)
+        sc = cls(agg_modes)
+        sc.hist = histogram_dimension_scores(data)
+        sc.dim_scores = {dim: sc.plan.aggregator(dim)(counts) for dim, counts in sc.hist.items()}
+        return sc
+
+    def _refresh(self, dim: str) -> None:
+        counts = self.hist[dim]
+        if any(counts):
+            self.dim_scores[dim] = self.plan.aggregator(dim)(counts)
+        else:
+            del self.hist[dim]
+            del self.dim_scores[dim]
+
+    def snapshot(self) -> Dict[str, Any]:
+        T, K_eff = compute_metrics(self.dim_scores)
+        return _results_payload(dict(self.dim_scores), T, K_eff, assign_zone(T))
+
+    def add_item(self, dimension: str, score: int) -> Dict[str, Any]:
+        _check_item(dimension, score)
+        counts = self.hist.get(dimension)
+        if counts is None:
+            counts = self.hist[dimension] = [0] * N_BINS
+        counts[score - SCORE_MIN] += 1
+        self._refresh(dimension)
+        return self.snapshot()
+
+    def remove_item(self, dimension: str, score: int) -> Dict[str, Any]:
+        _check_item(dimension, score)
+        counts = self.hist.get(dimension)
+        if counts is None or not counts[score - SCORE_MIN]:
+            raise ValueError(f"aucun item {dimension}={score} à retirer")
+        counts[score - SCORE_MIN] -= 1
+        self._refresh(dimension)
+        return self.snapshot()
+
+    def update_score(self, dimension: str, old: int, new: int) -> Dict[str, Any]:
+        _check_item(dimension, new)
+        self.remove_item(dimension, old)
+        return self.add_item(dimension, new)
+
+    def apply(self, events: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Replay delta events and return the final payload.
+
+        Event shapes: {"op": "add"|"remove", "dimension", "score"} or
+        {"op": "update", "dimension", "old", "new"}.
+        """
+        for n, ev in enumerate(events):
+            op = ev.get("op") if isinstance(ev, dict) else None
+            if op == "add":
+                self.add_item(ev.get("dimension"), ev.get("score"))
+            elif op == "remove":
+                self.remove_item(ev.get("dimension"), ev.get("score"))
+            elif op == "update":
+                self.update_score(ev.get("dimension"), ev.get("old"), ev.get("new"))
+            else:
+                raise ValueError(f"event[{n}].op invalide: {op!r}")
+        return self.snapshot()
+
+
+def _metrics(Cx: float, K: float, tau_val: float, G: float, D: float) -> Tuple[float, float]:
+    denom = 1.0 + tau_val + G + D + Cx
+    K_eff = K / denom if denom != 0 else 0.0
+    T = Cx + tau_val + G + D - K_eff
+    return T, K_eff
+
+
 def compute_metrics(dims: Dict[str, float]) -> Tuple[float, float]:
     tau_val = float(dims.get("τ", dims.get("tau", 0.0)))
     Cx = float(dims.get("Cx", 0.0))
     K = float(dims.get("K", 0.0))
     G = float(dims.get("G", 0.0))
     D = float(dims.get("D", 0.0))
-
-    denom = 1.0 + tau_val + G + D + Cx
-    K_eff = K / denom if denom != 0 else 0.0
-    T = Cx + tau_val + G + D - K_eff
-    return T, K_eff
+    return _metrics(Cx, K, tau_val, G, D)
 
 
 def assign_zone(T: float) -> str:
@@ -131,10 +918,1332 @@ def assign_zone(T: float) -> str:
     return ZONE_LABELS[3]
 
 
+def zone_margin(T: float) -> Tuple[float, float]:
+    """(T - nearest ZONE_THRESHOLDS boundary, that boundary); > 0 means T lies above it."""
+    t = min(ZONE_THRESHOLDS, key=lambda b: abs(T - b))
+    return T - t, t
+
+
+METRIC_DIMS = ("Cx", "K", "τ", "G", "D")
+
+
+def compute_metrics_sensitivity(dims: Dict[str, float]) -> Tuple[float, float, Dict[str, Any]]:
+    """compute_metrics() plus analytic partials and the zone margin, from the same terms.
+
+    With denom = 1 + τ + G + D + Cx and K_eff = K / denom:
+      dK_eff/dK = 1/denom      dK_eff/dX = -K/denom²   (X in Cx, τ, G, D)
+      dT/dK = -1/denom         dT/dX = 1 + K/denom²
+    "τ" stands for the value compute_metrics reads (τ, else tau).
+    to_boundary: first-order score change of one dimension that brings T onto
+    the nearest boundary. driver: dimension with the largest contribution
+    to T (X for Cx/τ/G/D, -K_eff for K).
+    """
+    tau_val = float(dims.get("τ", dims.get("tau", 0.0)))
+    Cx = float(dims.get("Cx", 0.0))
+    K = float(dims.get("K", 0.0))
+    G = float(dims.get("G", 0.0))
+    D = float(dims.get("D", 0.0))
+    T, K_eff = _metrics(Cx, K, tau_val, G, D)
+    denom = 1.0 + tau_val + G + D + Cx
+    dk_dk = 1.0 / denom if denom != 0 else 0.0
+    dk_dx = -K / (denom * denom) if denom != 0 else 0.0
+    dK_eff = {"Cx": dk_dx, "K": dk_dk, "τ": dk_dx, "G": dk_dx, "D": dk_dx}
+    dT = {d: -v if d == "K" else 1.0 - v for d, v in dK_eff.items()}
+    margin, boundary = zone_margin(T)
+    contributions = {"Cx": Cx, "K": -K_eff, "τ": tau_val, "G": G, "D": D}
+    report = {
+        "dT": dT,
+        "dK_eff": dK_eff,
+        "zone_margin": margin,
+        "nearest_threshold": boundary,
+        "to_boundary": {d: (-margin / v if v else None) for d, v in dT.items()},
+        "contributions": contributions,
+        "driver": max(METRIC_DIMS, key=lambda d: abs(contributions[d])),
+    }
+    return T, K_eff, report
+
+
+def with_sensitivity(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a results payload with a "sensitivity" section (see compute_metrics_sensitivity)."""
+    _, _, report = compute_metrics_sensitivity(results["dimension_scores"])
+    return dict(results, sensitivity=report)
+
+
+def boundary_entry(case_id: str, results: Dict[str, Any]) -> Dict[str, Any]:
+    """One boundary-index row: how far a scored case is from a zone flip."""
+    sens = results.get("sensitivity") or compute_metrics_sensitivity(results["dimension_scores"])[2]
+    return {
+        "case_id": case_id,
+        "zone": results["zone"],
+        "T": results["T"],
+        "zone_margin": sens["zone_margin"],
+        "nearest_threshold": sens["nearest_threshold"],
+        "driver": sens["driver"],
+    }
+
+
+def boundary_index(entries: Iterable[Dict[str, Any]], max_margin: Optional[float] = None) -> Dict[str, Any]:
+    """Boundary cases sorted by |zone margin| (closest to a zone flip first), ties by case id."""
+    cases = [e for e in entries if max_margin is None or abs(e["zone_margin"]) <= max_margin]
+    cases.sort(key=lambda e: (abs(e["zone_margin"]), e["case_id"]))
+    return {"zone_thresholds": list(ZONE_THRESHOLDS), "max_margin": max_margin, "count": len(cases), "cases": cases}
+
+
+class ScoringPlan:
+    """Scoring configuration compiled once, reused for every input.
+
+    Dimension labels map to integer slots (the five core dimensions, τ and
+    tau included, get fixed slots; other labels get one on first sight) and
+    each slot carries its pre-bound per-histogram aggregator, so scoring an
+    input does no mode or alias resolution.
+    """
+
+    CORE = ("Cx", "K", "τ", "tau", "G", "D")
+    _CX, _K, _TAU_U, _TAU_A, _G, _D = range(6)
+    # labels a shared plan may intern before compile_plan() retires it
+    MAX_LABELS = 4096
+
+    def __init__(self, agg_modes: Optional[Dict[str, str]] = None) -> None:
+        self.agg_modes = default_agg_modes(agg_modes)
+        self.slots: Dict[str, int] = {}
+        self.labels: List[str] = []
+        self.aggregators: List[Callable[[List[int]], float]] = []
+        self.weighted: List[bool] = []
+        # unknown modes fail here, at plan time, not on the first input
+        kernels = [_aggregator_for(self.agg_modes, lb) for lb in self.agg_modes]
+        self.any_weighted = any(k.weighted for k in kernels)
+        self.on_grid = all(_aggregator_for(self.agg_modes, lb).on_grid for lb in self.CORE)
+        self._lock = threading.Lock()
+        for label in self.CORE:
+            self.slot(label)
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "ScoringPlan":
+        return cls(_agg_modes_from_args(args))
+
+    def mode(self, label: str) -> str:
+        return _mode_for(self.agg_modes, label)
+
+    def kernel(self, label: str) -> Aggregator:
+        return _aggregator_for(self.agg_modes, label)
+
+    def aggregator(self, label: str) -> Callable[[List[int]], float]:
+        return self.aggregators[self.slot(label)]
+
+    def slot(self, label: str) -> int:
+        s = self.slots.get(label)
+        if s is None:
+            with self._lock:
+                s = self.slots.get(label)
+                if s is None:
+                    kernel = self.kernel(label)
+                    self.aggregators.append(kernel.from_counts)
+                    self.weighted.append(kernel.weighted)
+                    self.labels.append(label)
+                    s = self.slots[label] = len(self.labels) - 1
+        return s
+
+    def histograms(self, items: Iterable[Any], all_errors: bool = False) -> Dict[int, List[int]]:
+        """Fused validate + bucket pass: slot -> per-score counts, in first-appearance order.
+
+        Items are checked as they are counted, with validate_input() messages.
+        The hot path (known dimension, in-range int score) is a handful of
+        exact type checks; anything else goes through _validate_item(). With
+        all_errors, every invalid item is reported (InputErrors) instead of the
+        first one. Slots with a weighted mode accumulate item weights.
+        """
+        lo, hi = SCORE_MIN, SCORE_MAX
+        fast: Dict[str, List[int]] = {}  # unweighted dimensions already validated
+        buckets: Dict[str, List[Any]] = {}  # every dimension, first-appearance order
+        errors: List[str] = []
+        fast_get, dict_t, int_t = fast.get, dict, int
+
+        def slow(idx: int, it: Any) -> None:
+            try:
+                _validate_item(idx, it)
+                dim = it["dimension"]
+                bucket = buckets.get(dim)
+                weighted = self.weighted[self.slot(dim)]
+                w = _item_weight(idx, it) if weighted else 1
+            except ValueError as e:
+                if not all_errors:
+                    raise
+                errors.append(str(e))
+                return
+            if bucket is None:
+                bucket = buckets[dim] = [0.0] * N_BINS if weighted else [0] * N_BINS
+                if not weighted:
+                    fast[dim] = bucket
+            bucket[it["score"] - lo] += w
+
+        numbered = enumerate(items)
+        while True:
+            try:
+                for idx, it in numbered:
+                    if type(it) is dict_t:
+                        counts = fast_get(it.get("dimension"))
+                        if counts is not None:
+                            sc = it.get("score")
+                            if type(sc) is int_t and lo <= sc <= hi:
+                                counts[sc - lo] += 1
+                                continue
+                    slow(idx, it)
+                break
+            except TypeError:  # unhashable dimension: reported by the slow path
+                slow(idx, it)
+        if errors:
+            raise InputErrors(errors)
+        slots = self.slots
+        return {slots[dim]: bucket for dim, bucket in buckets.items()}
+
+    def accumulate(self, items: Iterable[Any], all_errors: bool = False) -> Dict[int, List[int]]:
+        """histograms() over a stream of items, plus the non-empty check.
+
+        Suited to iter_input_items(): the items are never held together.
+        """
+        hist = self.histograms(items, all_errors=all_errors)
+        if not hist:
+            raise ValueError("input.items absent ou vide")
+        return hist
+
+    def evaluate(self, hist: Dict[int, List[int]]) -> Tuple[Dict[str, float], float, float]:
+        """(dimension_scores, T, K_eff) from slot histograms."""
+        aggs = self.aggregators
+        vals = {s: aggs[s](counts) for s, counts in hist.items()}
+        tau_val = vals[self._TAU_U] if self._TAU_U in vals else vals.get(self._TAU_A, 0.0)
+        T, K_eff = _metrics(
+            vals.get(self._CX, 0.0), vals.get(self._K, 0.0), tau_val, vals.get(self._G, 0.0), vals.get(self._D, 0.0)
+        )
+        labels = self.labels
+        return {labels[s]: v for s, v in vals.items()}, T, K_eff
+
+    def score(self, data: Any, lut: Optional["ZoneLookupTable"] = None, all_errors: bool = False) -> Dict[str, Any]:
+        """Validated results payload for one input dict or ItemTable (ValueError if invalid)."""
+        if isinstance(data, ItemTable):
+            validate_input(data)
+            return self.score_histograms(data.histograms(self), lut=lut)
+        if not isinstance(data, dict):
+            raise ValueError("input doit être un objet JSON")
+        items = data.get("items", None)
+        if not isinstance(items, list) or not items:
+            raise ValueError("input.items absent ou vide")
+        return self.score_histograms(self.histograms(items, all_errors=all_errors), lut=lut)
+
+    def score_file(self, path: Path, lut: Optional["ZoneLookupTable"] = None) -> Dict[str, Any]:
+        """score() reading the input file as a stream (.phib: memory-mapped), flat memory in the item count."""
+        return self.score_histograms(input_histograms(path, self), lut=lut)
+
+    def score_histograms(self, hist: Dict[int, List[int]], lut: Optional["ZoneLookupTable"] = None) -> Dict[str, Any]:
+        dim_scores, T, K_eff = self.evaluate(hist)
+        if lut is not None and self.on_grid:
+            T, K_eff, zone = lut.lookup(dim_scores)
+        else:
+            zone = assign_zone(T)
+        return _results_payload(dim_scores, T, K_eff, zone)
+
+
+_PLANS: Dict[Tuple[Tuple[str, str], ...], ScoringPlan] = {}
+_PLANS_LOCK = threading.Lock()
+_MAX_PLANS = 64
+
+
+def compile_plan(agg_modes: Optional[Dict[str, str]] = None) -> ScoringPlan:
+    """Shared ScoringPlan for these modes (compiled once per distinct configuration).
+
+    A shared plan that has interned ScoringPlan.MAX_LABELS labels is replaced
+    by a fresh one, so a long-running process fed ever-new labels (serve)
+    stays bounded; callers still holding the old plan keep using it.
+    """
+    key = tuple(sorted(default_agg_modes(agg_modes).items()))
+    plan = _PLANS.get(key)
+    if plan is None or len(plan.labels) >= ScoringPlan.MAX_LABELS:
+        with _PLANS_LOCK:
+            plan = _PLANS.get(key)
+            if plan is None or len(plan.labels) >= ScoringPlan.MAX_LABELS:
+                if plan is None and len(_PLANS) >= _MAX_PLANS:
+                    del _PLANS[next(iter(_PLANS))]  # oldest configuration
+                plan = _PLANS[key] = ScoringPlan(dict(key))
+    return plan
+
+
+def _cache_dir(override: Optional[str] = None) -> Path:
+    """Instrument cache root: explicit override > $PHIO_CACHE_DIR > ~/.cache/phio."""
+    if override:
+        return Path(override)
+    env = os.environ.get("PHIO_CACHE_DIR", "").strip()
+    if env:
+        return Path(env)
+    return Path.home() / ".cache" / "phio"
+
+
+class ZoneLookupTable:
+    """Dense table of every (Cx, K, τ, G, D) combination -> (T, K_eff, zone).
+
+    Median/bottleneck of int scores can only take half-integer values in
+    [SCORE_MIN, SCORE_MAX], so the whole output space of compute_metrics +
+    assign_zone is LEVELS ** 5 points. Values are produced by compute_metrics
+    itself, so a lookup is bit-for-bit identical to the computed path.
+    """
+
+    AXES = ("Cx", "K", "τ", "G", "D")
+    LEVELS = tuple(SCORE_MIN + i / 2 for i in range(2 * (SCORE_MAX - SCORE_MIN) + 1))
+    _MAGIC = b"PHIOLUT1"
+
+    def __init__(self, T: array, K_eff: array, zone: array) -> None:
+        self.T = T
+        self.K_eff = K_eff
+        self.zone = zone
+        self._by_T: Optional[List[int]] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.LEVELS) ** len(self.AXES)
+
+    @classmethod
+    def cache_key(cls) -> str:
+        key = {
+            "id": __instrument_id__,
+            "version": __version__,
+            "thresholds": list(ZONE_THRESHOLDS),
+            "labels": list(ZONE_LABELS),
+            "axes": list(cls.AXES),
+            "levels": list(cls.LEVELS),
+        }
+        return hashlib.sha256(json.dumps(key, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def decode(cls, index: int) -> Dict[str, float]:
+        n = len(cls.LEVELS)
+        dims: Dict[str, float] = {}
+        for axis in cls.AXES:
+            index, code = divmod(index, n)
+            dims[axis] = cls.LEVELS[code]
+        return dims
+
+    @classmethod
+    def build(cls) -> "ZoneLookupTable":
+        n = len(cls.LEVELS) ** len(cls.AXES)
+        T_arr, K_arr, z_arr = array("d"), array("d"), array("b")
+        for i in range(n):
+            T, K_eff = compute_metrics(cls.decode(i))
+            T_arr.append(T)
+            K_arr.append(K_eff)
+            z_arr.append(ZONE_LABELS.index(assign_zone(T)))
+        return cls(T_arr, K_arr, z_arr)
+
+    @classmethod
+    def load_or_build(cls, cache_dir: Optional[str] = None) -> "ZoneLookupTable":
+        """Load the cached table for this version/thresholds, or build and cache it."""
+        path = _cache_dir(cache_dir) / f"phio_lut_{cls.cache_key()[:16]}.bin"
+        n = len(cls.LEVELS) ** len(cls.AXES)
+        try:
+            raw = path.read_bytes()
+            if raw[: len(cls._MAGIC)] == cls._MAGIC and len(raw) == len(cls._MAGIC) + n * 17:
+                off = len(cls._MAGIC)
+                T_arr, K_arr, z_arr = array("d"), array("d"), array("b")
+                T_arr.frombytes(raw[off : off + 8 * n])
+                K_arr.frombytes(raw[off + 8 * n : off + 16 * n])
+                z_arr.frombytes(raw[off + 16 * n :])
+                return cls(T_arr, K_arr, z_arr)
+        except OSError:
+            pass
+
+        table = cls.build()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".tmp{os.getpid()}")
+            tmp.write_bytes(cls._MAGIC + table.T.tobytes() + table.K_eff.tobytes() + table.zone.tobytes())
+            os.replace(tmp, path)
+        except OSError:
+            pass  # read-only cache dir: the in-memory table is still valid
+        return table
+
+    def index(self, dims: Dict[str, float]) -> int:
+        """Flat index of a dimension_scores dict (missing dims count as 0.0, τ before tau)."""
+        vals = (
+            dims.get("Cx", 0.0),
+            dims.get("K", 0.0),
+            dims.get("τ", dims.get("tau", 0.0)),
+            dims.get("G", 0.0),
+            dims.get("D", 0.0),
+        )
+        n = len(self.LEVELS)
+        idx = 0
+        for v in reversed(vals):
+            h = (float(v) - SCORE_MIN) * 2
+            code = int(h)
+            if code != h or code < 0 or code >= n:
+                raise ValueError(f"valeur hors table: {v}")
+            idx = idx * n + code
+        return idx
+
+    def lookup(self, dims: Dict[str, float]) -> Tuple[float, float, str]:
+        i = self.index(dims)
+        return self.T[i], self.K_eff[i], ZONE_LABELS[self.zone[i]]
+
+    def combinations(
+        self, zone: Optional[str] = None, t_min: Optional[float] = None, t_max: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Reverse index: every combination with t_min <= T <= t_max (and in zone), sorted by T."""
+        if self._by_T is None:
+            self._by_T = sorted(range(len(self.T)), key=lambda i: (self.T[i], i))
+        order = self._by_T
+        keys = [self.T[i] for i in order]
+        lo = 0 if t_min is None else bisect.bisect_left(keys, t_min)
+        hi = len(order) if t_max is None else bisect.bisect_right(keys, t_max)
+        zi = None if zone is None else ZONE_LABELS.index(zone)
+
+        out: List[Dict[str, Any]] = []
+        for i in order[lo:hi]:
+            if zi is not None and self.zone[i] != zi:
+                continue
+            out.append(
+                {
+                    "dimension_scores": self.decode(i),
+                    "T": self.T[i],
+                    "K_eff": self.K_eff[i],
+                    "zone": ZONE_LABELS[self.zone[i]],
+                }
+            )
+        return out
+
+
+def default_agg_modes(overrides: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Effective aggregation modes, τ/tau kept in sync (same rule as the CLI flags)."""
+    modes = {"Cx": "median", "K": "median", "G": "median", "D": "median", "τ": "median", "tau": "median"}
+    for k, v in (overrides or {}).items():
+        if not v:
+            continue
+        if k in ("τ", "tau"):
+            modes["τ"] = v
+            modes["tau"] = v
+        else:
+            modes[k] = v
+    return modes
+
+
+def _results_payload(dim_scores: Dict[str, float], T: float, K_eff: float, zone: str) -> Dict[str, Any]:
+    return {
+        "instrument": {"id": __instrument_id__, "version": __version__},
+        "dimension_scores": dim_scores,
+        "T": T,
+        "K_eff": K_eff,
+        "zone": zone,
+    }
+
+
+def score_data(
+    data: Dict[str, Any], agg_modes: Dict[str, str], lut: Optional[ZoneLookupTable] = None
+) -> Dict[str, Any]:
+    """validate_input -> aggregate_dimension_scores -> compute_metrics -> assign_zone.
+
+    With a ZoneLookupTable, metrics and zone are read from the table instead.
+    Returns the results.json payload. Raises ValueError on invalid input.
+    Code scoring many inputs should hold a ScoringPlan and call plan.score().
+    """
+    return compile_plan(agg_modes).score(data, lut=lut)
+
+
+class ResultCache:
+    """Content-addressed on-disk cache of results.json payloads, LRU-evicted.
+
+    Key = sha256 of the items as an order-insensitive (dimension, score)
+    multiset (per-score weight sums for dimensions in a weighted mode), the
+    effective aggregation mode of each present dimension,
+    instrument id/version, ZONE_THRESHOLDS and the payload schema. Input
+    files are keyed by their raw bytes instead (key_from_file), so a hit is
+    found before the file is decoded. Only successfully scored inputs are
+    stored, so a hit skips validation and scoring entirely. Recency is the
+    entry mtime (bumped on every hit). Hit/miss/entry counts are kept in
+    memory and added to stats.json once, by flush() at the end of a command.
+    """
+
+    SCHEMA = 2
+    DEFAULT_MAX_ENTRIES = 10000
+
+    def __init__(self, root: Optional[str] = None, max_entries: Optional[int] = None) -> None:
+        self.dir = _cache_dir(root) / "results"
+        env_max = os.environ.get("PHIO_CACHE_MAX_ENTRIES", "").strip()
+        self.max_entries = max_entries or (int(env_max) if env_max else self.DEFAULT_MAX_ENTRIES)
+        self.hits = 0
+        self.misses = 0
+        self.added = 0
+        self._entries: Optional[int] = None  # stored entries, read from stats.json on the first put
+
+    @classmethod
+    def key(cls, data: Any, agg_modes: Dict[str, str]) -> Optional[str]:
+        """Cache key, or None when the input shape is not cacheable."""
+        items = data.get("items") if isinstance(data, dict) else None
+        if not isinstance(items, list) or not items:
+            return None
+        multiset: Counter = Counter()
+        masses: Dict[str, List[float]] = {}
+        weighted: Dict[str, bool] = {}
+        for it in items:
+            if type(it) is dict and type(it.get("dimension")) is str and type(it.get("score")) is int:
+                dim, sc = it["dimension"], it["score"]
+                w = weighted.get(dim)
+                if w is None:
+                    w = weighted[dim] = _aggregator_for(agg_modes, dim).weighted
+                if not w:
+                    multiset[(dim, sc)] += 1
+                    continue
+                wt = it.get("weight", 1.0)
+                if type(wt) in (int, float) and 0 <= wt < math.inf and SCORE_MIN <= sc <= SCORE_MAX:
+                    # weighted dimensions are keyed by their per-score weight sums
+                    masses.setdefault(dim, [0.0] * N_BINS)[sc - SCORE_MIN] += float(wt)
+                    continue
+            # malformed item: kept verbatim so it can never alias a valid input
+            multiset[("\0raw", json.dumps(it, ensure_ascii=False, sort_keys=True, default=str))] += 1
+        return cls._key_for(multiset, masses, agg_modes)
+
+    @classmethod
+    def key_from_histograms(cls, plan: ScoringPlan, hist: Dict[int, List[int]]) -> str:
+        """Same key as key() for the (valid) input these plan histograms came from."""
+        multiset: Dict[Tuple[str, Any], int] = {}
+        masses: Dict[str, List[float]] = {}
+        for s, counts in hist.items():
+            if plan.weighted[s]:
+                masses[plan.labels[s]] = list(counts)
+            else:
+                multiset.update(((plan.labels[s], b + SCORE_MIN), n) for b, n in enumerate(counts) if n)
+        return cls._key_for(multiset, masses, plan.agg_modes)
+
+    @classmethod
+    def key_from_file(cls, path: Path, plan: ScoringPlan) -> str:
+        """Key of an input file from its raw bytes and the plan's modes (no decoding)."""
+        h = hashlib.sha256()
+        with Path(path).open("rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        material = {
+            "schema": cls.SCHEMA,
+            "instrument": [__instrument_id__, __version__],
+            "thresholds": list(ZONE_THRESHOLDS),
+            "file_sha256": h.hexdigest(),
+            "modes": sorted(plan.agg_modes.items()),
+        }
+        return hashlib.sha256(json.dumps(material, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _key_for(
+        cls, multiset: Dict[Tuple[str, Any], int], masses: Dict[str, List[float]], agg_modes: Dict[str, str]
+    ) -> str:
+        dims = {dim for dim, _ in multiset} | set(masses)
+        material = {
+            "schema": cls.SCHEMA,
+            "instrument": [__instrument_id__, __version__],
+            "thresholds": list(ZONE_THRESHOLDS),
+            "items": sorted([list(k), n] for k, n in multiset.items()),
+            "masses": sorted([dim, m] for dim, m in masses.items()),
+            "modes": sorted((dim, _mode_for(agg_modes, dim)) for dim in dims),
+        }
+        return hashlib.sha256(json.dumps(material, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        p = self._path(key)
+        try:
+            payload = json.loads(p.read_text(encoding="utf-8"))
+            os.utime(p)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return payload
+
+    def put(self, key: str, payload: Dict[str, Any]) -> None:
+        p = self._path(key)
+        try:
+            p.parent.mkdir(parents=True, exist_ok=True)
+            tmp = p.with_suffix(f".tmp{os.getpid()}")
+            tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, p)
+            if self._entries is None:
+                self._entries = self.stats().get("entries", 0)
+            self.added += 1
+            if self._entries + self.added > self.max_entries:
+                self.evict()
+        except OSError:
+            pass  # a cache that cannot be written is just a miss next time
+
+    def evict(self, target: Optional[int] = None) -> int:
+        """Drop least-recently-used entries down to target (default 90% of max_entries)."""
+        keep = int(self.max_entries * 0.9) if target is None else target
+        entries = []
+        for p in self.dir.glob("*/*.json"):
+            try:
+                entries.append((p.stat().st_mtime, p))
+            except OSError:
+                continue
+        entries.sort()
+        removed = 0
+        for _, p in entries[: max(0, len(entries) - keep)]:
+            try:
+                p.unlink()
+                removed += 1
+            except OSError:
+                pass
+        # entries counted from disk: this process's additions are included
+        self._entries, self.added = len(entries) - removed, 0
+        self._write_stats(dict(self.stats(), entries=self._entries))
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        try:
+            return json.loads((self.dir / "stats.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {"hits": 0, "misses": 0, "entries": 0}
+
+    def _write_stats(self, stats: Dict[str, int]) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.dir / f"stats.json.tmp{os.getpid()}"
+        tmp.write_text(json.dumps(stats, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.dir / "stats.json")
+
+    def flush(self) -> None:
+        """Add this instance's counts to stats.json (one atomic replace) and reset them."""
+        delta = {"hits": self.hits, "misses": self.misses, "entries": self.added}
+        if not any(delta.values()):
+            return
+        stats = self.stats()
+        for k, v in delta.items():
+            stats[k] = stats.get(k, 0) + v
+        try:
+            self._write_stats(stats)
+        except OSError:
+            pass
+        if self._entries is not None:
+            self._entries += self.added
+        self.hits = self.misses = self.added = 0
+
+
+def _result_cache(args: argparse.Namespace) -> Optional[ResultCache]:
+    """The score command's result cache: opt-in (--cache, --cache-dir or $PHIO_CACHE_DIR), off with --no-cache."""
+    if args.no_cache or not (args.cache or args.cache_dir or os.environ.get("PHIO_CACHE_DIR", "").strip()):
+        return None
+    return ResultCache(args.cache_dir, args.cache_max_entries)
+
+
+def _phase(perf: Any, name: str) -> Any:
+    # perf: a scripts.phio_perf.PerfRecorder, or None (not measuring)
+    return perf.phase(name) if perf is not None else contextlib.nullcontext({})
+
+
+def cached_score_data(
+    data: Any, plan: ScoringPlan, cache: Optional[ResultCache], all_errors: bool = False, perf: Any = None
+) -> Dict[str, Any]:
+    """plan.score() behind a ResultCache (cache=None scores directly)."""
+    with _phase(perf, "cache_lookup"):
+        key = ResultCache.key(data, plan.agg_modes) if cache is not None else None
+        hit = cache.get(key) if key is not None else None
+    if hit is not None:
+        return hit
+    with _phase(perf, "validate_aggregate"):
+        out = plan.score(data, all_errors=all_errors)
+    if key is not None:
+        with _phase(perf, "cache_store"):
+            cache.put(key, out)
+    return out
+
+
+def input_histograms(path: Path, plan: ScoringPlan, all_errors: bool = False) -> Dict[int, List[int]]:
+    """Validated plan histograms of an input file: JSON (see input_items), or a memory-mapped .phib."""
+    if Path(path).suffix.lower() == ".phib":
+        PhibFile = _sibling("phio_binary").PhibFile
+
+        with PhibFile(path) as pf:
+            return pf.histograms(plan)
+    return plan.accumulate(input_items(path), all_errors=all_errors)
+
+
+def cached_score_file(
+    path: Path, plan: ScoringPlan, cache: Optional[ResultCache], all_errors: bool = False, perf: Any = None
+) -> Dict[str, Any]:
+    """Score an input file (see input_histograms) behind a ResultCache keyed by the file bytes.
+
+    The lookup comes first, so a hit neither decodes nor validates the file.
+    perf phases: cache_lookup, decode_validate (one fused pass over the items), aggregate, cache_store.
+    """
+    with _phase(perf, "cache_lookup"):
+        key = ResultCache.key_from_file(path, plan) if cache is not None else None
+        hit = cache.get(key) if key is not None else None
+    if hit is not None:
+        return hit
+    with _phase(perf, "decode_validate"):
+        hist = input_histograms(path, plan, all_errors=all_errors)
+    with _phase(perf, "aggregate"):
+        out = plan.score_histograms(hist)
+    if key is not None:
+        with _phase(perf, "cache_store"):
+            cache.put(key, out)
+    return out
+
+
+SWEEP_DIMS = ("Cx", "K", "τ", "G", "D")
+DEFAULT_SWEEP_MODES = ("median", "bottleneck")
+
+
+def _label_histograms(
+    source: Any, needs_masses: Callable[[str], bool]
+) -> Tuple[Dict[str, List[int]], Dict[str, List[float]]]:
+    """One validated pass: label -> per-score counts, and weight sums where needs_masses(label).
+
+    source: input file path (streamed JSON or .phib) or an already parsed input dict.
+    """
+    if isinstance(source, dict):
+        items: Iterable[Any] = source.get("items") if isinstance(source.get("items"), list) else []
+    elif Path(source).suffix.lower() == ".phib":
+        PhibFile = _sibling("phio_binary").PhibFile
+
+        with PhibFile(source) as pf:
+            cells = pf.cell_counts()
+            need = [needs_masses(label) for label in pf.dimensions]
+            cell_masses = pf.cell_masses() if any(need) else []
+            counts_by, masses_by = {}, {}
+            for code, label in enumerate(pf.dimensions):
+                row = cells[code * N_BINS : (code + 1) * N_BINS]
+                if any(row):
+                    counts_by[label] = row
+                    if need[code]:
+                        masses_by[label] = cell_masses[code * N_BINS : (code + 1) * N_BINS]
+            return counts_by, masses_by
+    elif not isinstance(source, (str, Path)):
+        raise ValueError("input doit être un objet JSON")
+    else:
+        items = input_items(Path(source))
+
+    counts_by: Dict[str, List[int]] = {}
+    masses_by: Dict[str, List[float]] = {}
+    need: Dict[str, bool] = {}
+    for idx, it in enumerate(items):
+        _validate_item(idx, it)
+        dim, b = it["dimension"], it["score"] - SCORE_MIN
+        counts = counts_by.get(dim)
+        if counts is None:
+            counts = counts_by[dim] = [0] * N_BINS
+            need[dim] = needs_masses(dim)
+            if need[dim]:
+                masses_by[dim] = [0.0] * N_BINS
+        counts[b] += 1
+        if need[dim]:
+            masses_by[dim][b] += _item_weight(idx, it)
+    if not counts_by:
+        raise ValueError("input.items absent ou vide")
+    return counts_by, masses_by
+
+
+def aggregation_sweep(
+    source: Any, modes: Iterable[str] = DEFAULT_SWEEP_MODES, agg_modes: Optional[Dict[str, str]] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Score one input under every combination of `modes` over SWEEP_DIMS, from one parse.
+
+    The input (path or parsed dict) is read and bucketed once; each dimension
+    is aggregated once per mode, and the len(modes) ** 5 combinations only
+    recombine those values (τ and tau share one axis). Returns
+    (results payload under agg_modes, sweep table).
+    """
+    kernels: List[Aggregator] = []
+    for m in modes:
+        k = resolve_aggregator(m)
+        if k.name not in [x.name for x in kernels]:
+            kernels.append(k)
+    if not kernels:
+        raise ValueError("sweep: aucun mode d'agrégation")
+    plan = compile_plan(agg_modes)
+    sweep_weighted = any(k.weighted for k in kernels)
+    swept = set(SWEEP_DIMS) | {"tau"}
+    counts_by, masses_by = _label_histograms(
+        source, lambda label: plan.kernel(label).weighted or (sweep_weighted and label in swept)
+    )
+
+    def value(kernel: Aggregator, label: str) -> float:
+        return kernel.from_counts(masses_by[label] if kernel.weighted else counts_by[label])
+
+    dim_scores = {label: value(plan.kernel(label), label) for label in counts_by}
+    T, K_eff = compute_metrics(dim_scores)
+    results = _results_payload(dim_scores, T, K_eff, assign_zone(T))
+
+    table: Dict[str, Dict[str, float]] = {}
+    for dim in SWEEP_DIMS:
+        label = dim if dim in counts_by else ("tau" if dim == "τ" and "tau" in counts_by else None)
+        table[dim] = {k.name: (value(k, label) if label else 0.0) for k in kernels}
+
+    rows: List[Dict[str, Any]] = []
+    zone_counts: Counter = Counter()
+    for combo in itertools.product(kernels, repeat=len(SWEEP_DIMS)):
+        v = {dim: table[dim][k.name] for dim, k in zip(SWEEP_DIMS, combo)}
+        t, k_eff = _metrics(v["Cx"], v["K"], v["τ"], v["G"], v["D"])
+        zone = assign_zone(t)
+        zone_counts[zone] += 1
+        rows.append({"agg_modes": {dim: k.name for dim, k in zip(SWEEP_DIMS, combo)}, "T": t, "K_eff": k_eff, "zone": zone})
+
+    sweep = {
+        "instrument": {"id": __instrument_id__, "version": __version__},
+        "dimensions": list(SWEEP_DIMS),
+        "modes": [k.name for k in kernels],
+        "dimension_values": table,
+        "combinations": rows,
+        "T_range": [min(r["T"] for r in rows), max(r["T"] for r in rows)],
+        "zone_counts": {z: zone_counts[z] for z in ZONE_LABELS if zone_counts[z]},
+    }
+    return results, sweep
+
+
+class _ScoreRequestHandler(socketserver.StreamRequestHandler):
+    """One client connection: newline-delimited JSON requests -> replies, in order."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            req_id = None
+            try:
+                req = json.loads(line)
+                if not isinstance(req, dict):
+                    raise ValueError("requête: objet JSON attendu")
+                req_id = req.get("id")
+                data = req["input"] if "input" in req else {"items": req.get("items")}
+                reply = {"id": req_id, "ok": True, "results": compile_plan(req.get("agg_modes")).score(data)}
+            except Exception as e:
+                reply = {"id": req_id, "ok": False, "error": str(e)}
+            self.wfile.write((json.dumps(reply, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+# Unix domain sockets are POSIX-only; `serve` is unavailable elsewhere.
+_UnixStreamServer = getattr(socketserver, "UnixStreamServer", socketserver.TCPServer)
+
+
+class ScoringServer(socketserver.ThreadingMixIn, _UnixStreamServer):
+    """Warm instrument on a Unix domain socket, one thread per client."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str) -> None:
+        p = Path(socket_path)
+        if p.exists() or p.is_symlink():
+            p.unlink()  # stale socket from a previous server
+        super().__init__(str(p), _ScoreRequestHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            Path(self.server_address).unlink()
+        except OSError:
+            pass
+
+
+class ScoringClient:
+    """Persistent connection to a ScoringServer (see the serve subcommand).
+
+    Protocol: one JSON object per line,
+      request  {"id", "input": <instrument input> | "items": [...], "agg_modes": {...}}
+      reply    {"id", "ok": true, "results": {...}} | {"id", "ok": false, "error": "..."}
+    """
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = 30.0) -> None:
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(str(socket_path))
+        self._rfile = self._sock.makefile("rb")
+        self._next_id = 0
+
+    def close(self) -> None:
+        self._rfile.close()
+        self._sock.close()
+
+    def __enter__(self) -> "ScoringClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def request(self, data: Any, agg_modes: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        self._next_id += 1
+        req = {"id": self._next_id, "input": data, "agg_modes": agg_modes or {}}
+        self._sock.sendall((json.dumps(req, ensure_ascii=False) + "\n").encode("utf-8"))
+        line = self._rfile.readline()
+        if not line:
+            raise ConnectionError("serveur de scoring: connexion fermée")
+        return json.loads(line)
+
+    def score(self, data: Any, agg_modes: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """results payload, or ValueError with the server-side message."""
+        reply = self.request(data, agg_modes)
+        if not reply.get("ok"):
+            raise ValueError(reply.get("error", "erreur serveur"))
+        return reply["results"]
+
+    def run_score_argv(self, argv: List[str]) -> Tuple[int, str, str]:
+        """Same contract as `score ...` on the CLI (results.json, exit code 2, result cache), via the server.
+
+        Returns (returncode, stdout, stderr).
+        """
+        err = io.StringIO()
+        try:
+            with contextlib.redirect_stderr(err):
+                args = parse_args(list(argv))
+        except SystemExit as e:
+            return int(e.code or 0), "", err.getvalue()
+        if args.cmd != "score":
+            return 2, "", f"serveur de scoring: commande non supportée: {args.cmd}\n"
+        if (
+            args.sweep
+            or args.all_errors
+            or args.sensitivity
+            or args.perf
+            or args.cprofile
+            or args.case is not None
+            or Path(args.input).suffix.lower() == ".phib"
+            or args.format != "json"
+            or args.outdir == "-"
+        ):
+            # local reads (mapped .phib, indexed case, one-parse sweep, full error report),
+            # non-default outputs and profiling: nothing to ship to the server
+            out = io.StringIO()
+            with contextlib.redirect_stderr(err), contextlib.redirect_stdout(out):
+                rc = main(list(argv))
+            return rc, out.getvalue(), err.getvalue()
+        try:
+            plan = ScoringPlan.from_args(args)
+            cache = _result_cache(args)
+            data = json.loads(Path(args.input).read_text(encoding="utf-8"))
+            key = ResultCache.key(data, plan.agg_modes) if cache is not None else None
+            out = cache.get(key) if key is not None else None
+            if out is None:
+                out = self.score(data, plan.agg_modes)
+                if key is not None:
+                    cache.put(key, out)
+            if cache is not None:
+                cache.flush()
+            write_results(out, args.outdir)
+        except (ConnectionError, socket.timeout):
+            raise
+        except Exception as e:
+            return 2, "", str(e) + "\n"
+        return 0, "", ""
+
+
+def _case_id(record: Any, default: str) -> str:
+    if isinstance(record, dict):
+        for k in ("case_id", "id"):
+            v = record.get(k)
+            if isinstance(v, (str, int)) and not isinstance(v, bool):
+                return str(v)
+    return default
+
+
+def _is_jsonl(path: Path) -> bool:
+    return path.suffix.lower() in (".jsonl", ".ndjson")
+
+
+def iter_batch_inputs(
+    source: str, case_ids: Optional[List[str]] = None, span: Optional[slice] = None
+) -> Iterator[Tuple[str, Any]]:
+    """Yield (case_id, data_or_exception) for a directory, a glob pattern or a JSONL file.
+
+    - directory: every *.json file (sorted), case_id = file path
+    - JSONL file: one input per non-empty line, case_id = case_id|id|<file>:<lineno>
+    - anything else: glob pattern (sorted); a plain .json path is a 1-case batch
+
+    case_ids / span select cases of a JSONL file through its offset index
+    (scripts/phio_case_store.py) instead of scanning it.
+
+    Parse errors are yielded in place of the data so that one bad case never
+    aborts the batch.
+    """
+    src = Path(source)
+    if case_ids or span is not None:
+        if not (src.is_file() and _is_jsonl(src)):
+            raise ValueError(f"sélection de cas: fichier JSONL attendu, reçu: {source}")
+        CaseStore = _sibling("phio_case_store").CaseStore
+
+        yield from CaseStore(src).iter_cases(case_ids, span)
+        return
+    if src.is_dir():
+        paths = sorted(p for p in src.glob("*.json") if p.is_file())
+    elif src.is_file() and _is_jsonl(src):
+        paths = [src]
+    else:
+        paths = [Path(x) for x in sorted(glob.glob(source)) if Path(x).is_file()]
+        if not paths:
+            raise ValueError(f"aucune entrée trouvée pour: {source}")
+
+    for p in paths:
+        if _is_jsonl(p):
+            with p.open("r", encoding="utf-8") as f:
+                for lineno, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    default = f"{p.name}:{lineno}"
+                    try:
+                        rec = json.loads(line)
+                    except Exception as e:
+                        yield default, e
+                        continue
+                    yield _case_id(rec, default), rec
+        else:
+            try:
+                yield str(p), json.loads(p.read_text(encoding="utf-8"))
+            except Exception as e:
+                yield str(p), e
+
+
+ENGINES = ("python", "numpy", "lut")
+
+
+def score_many(
+    source: str,
+    agg_modes: Optional[Dict[str, str]] = None,
+    engine: str = "python",
+    case_ids: Optional[List[str]] = None,
+    span: Optional[slice] = None,
+    all_errors: bool = False,
+    sensitivity: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """Score every (selected) case of a batch source in-process, one row per case.
+
+    Rows: {"case_id", "ok": True, "results"} or {"case_id", "ok": False, "error"}.
+    A failing case is captured in its row and never stops the batch. With
+    all_errors, "error" lists every invalid item of the case (one per line).
+    With sensitivity, results carry a "sensitivity" section (with_sensitivity()).
+
+    engine="numpy" scores the whole batch with the columnar engine
+    (scripts/phio_columnar.py, requires numpy); engine="lut" reads metrics and
+    zone from the cached ZoneLookupTable. Rows are identical for all engines.
+    """
+    plan = compile_plan(agg_modes)
+    if engine == "numpy":
+        score_many_columnar = _sibling("phio_columnar").score_many_columnar
+
+        for row in score_many_columnar(iter_batch_inputs(source, case_ids, span), plan.agg_modes):
+            if sensitivity and row["ok"]:
+                row["results"] = with_sensitivity(row["results"])
+            yield row
+        return
+    if engine not in ENGINES:
+        raise ValueError(f"engine inconnu: {engine} (attendu: {'|'.join(ENGINES)})")
+    lut = ZoneLookupTable.load_or_build() if engine == "lut" else None
+    for case_id, data in iter_batch_inputs(source, case_ids, span):
+        try:
+            if isinstance(data, Exception):
+                raise data
+            out = plan.score(data, lut=lut, all_errors=all_errors)
+            yield {"case_id": case_id, "ok": True, "results": with_sensitivity(out) if sensitivity else out}
+        except Exception as e:
+            yield {"case_id": case_id, "ok": False, "error": str(e)}
+
+
+def _enumerate_moves(
+    classes: List[Tuple[str, int, int]], size: int, start: int = 0
+) -> Iterator[Tuple[List[Tuple[str, int, int, int]], int]]:
+    """Distinct k-item ±1 perturbations of a histogram, with their multiplicity.
+
+    classes: (dimension, bin, count). Items sharing (dimension, score) are
+    interchangeable, so a perturbation is a set of (dimension, bin, up, down)
+    moves weighted by C(count, up + down) * C(up + down, up). Moves leaving
+    [SCORE_MIN, SCORE_MAX] are not perturbations and are never generated.
+    """
+    if size == 0:
+        yield [], 1
+        return
+    for ci in range(start, len(classes)):
+        dim, b, c = classes[ci]
+        can_up = b + 1 < N_BINS
+        can_down = b > 0
+        for m in range(1, min(c, size) + 1):
+            for up in range(m + 1):
+                down = m - up
+                if (up and not can_up) or (down and not can_down):
+                    continue
+                w = math.comb(c, m) * math.comb(m, up)
+                for rest, w_rest in _enumerate_moves(classes, size - m, ci + 1):
+                    yield [(dim, b, up, down)] + rest, w * w_rest
+
+
+def _dimension_margins(dims: Dict[str, float], zone: str) -> Dict[str, Dict[str, Any]]:
+    # smallest decrease / increase of one dimension score (others fixed) that changes the zone
+    out: Dict[str, Dict[str, Any]] = {}
+    for dim, v0 in dims.items():
+        down: Optional[float] = None
+        up: Optional[float] = None
+        for v in ZoneLookupTable.LEVELS:
+            if v == v0:
+                continue
+            trial = dict(dims)
+            trial[dim] = v
+            T, _ = compute_metrics(trial)
+            if assign_zone(T) == zone:
+                continue
+            d = v - v0
+            if d < 0 and (down is None or -d < down):
+                down = -d
+            if d > 0 and (up is None or d < up):
+                up = d
+        out[dim] = {"value": v0, "down": down, "up": up}
+    return out
+
+
+def robustness_analysis(data: Dict[str, Any], agg_modes: Optional[Dict[str, str]] = None, k: int = 1) -> Dict[str, Any]:
+    """Exact zone stability under every j-item ±1 perturbation, j = 1..k.
+
+    Perturbations are enumerated on the per-dimension histograms (see
+    _enumerate_moves), so the cost depends on the number of distinct
+    (dimension, score) classes, not on the number of items.
+    """
+    if k < 1:
+        raise ValueError("k doit être >= 1")
+    plan = compile_plan(agg_modes)
+    if plan.any_weighted:
+        # items of a bin are interchangeable only when they carry no weight
+        raise ValueError("robustness: modes pondérés non supportés")
+    baseline = plan.score(data)
+    hist = histogram_dimension_scores(data)
+    base_dims = baseline["dimension_scores"]
+    T0 = baseline["T"]
+    z0 = baseline["zone"]
+    classes = [(dim, b, c) for dim, counts in hist.items() for b, c in enumerate(counts) if c]
+
+    levels: List[Dict[str, Any]] = []
+    for size in range(1, k + 1):
+        total = changed = 0
+        worst: Optional[Dict[str, Any]] = None
+        for moves, ways in _enumerate_moves(classes, size):
+            touched: Dict[str, List[int]] = {}
+            for dim, b, up, down in moves:
+                counts = touched.get(dim)
+                if counts is None:
+                    counts = touched[dim] = list(hist[dim])
+                counts[b] -= up + down
+                if up:
+                    counts[b + 1] += up
+                if down:
+                    counts[b - 1] += down
+            dims = dict(base_dims)
+            for dim, counts in touched.items():
+                dims[dim] = plan.aggregator(dim)(counts)
+            T, _ = compute_metrics(dims)
+            zone = assign_zone(T)
+            total += ways
+            if zone != z0:
+                changed += ways
+            if worst is None or abs(T - T0) > abs(worst["delta_T"]):
+                worst = {
+                    "T": T,
+                    "delta_T": T - T0,
+                    "zone": zone,
+                    "moves": [
+                        {"dimension": dim, "score": b + SCORE_MIN, "up": up, "down": down} for dim, b, up, down in moves
+                    ],
+                }
+        levels.append(
+            {
+                "k": size,
+                "perturbations": total,
+                "zone_changes": changed,
+                "zone_change_rate": (changed / total) if total else 0.0,
+                "max_T_swing": abs(worst["delta_T"]) if worst else 0.0,
+                "worst_case": worst,
+            }
+        )
+
+    return {
+        "instrument": {"id": __instrument_id__, "version": __version__},
+        "baseline": baseline,
+        "k_max": k,
+        "levels": levels,
+        "t_margin": min(abs(T0 - t) for t in ZONE_THRESHOLDS),
+        "dimension_margins": _dimension_margins(base_dims, z0),
+    }
+
+
+# Output layer: results.json files (default, pretty-printed), compact JSON,
+# NDJSON records appended to one file, or a stream to stdout (--outdir -).
+OUTPUT_FORMATS = ("json", "compact", "ndjson")
+OUTPUT_BLOCK = 1 << 20  # characters buffered before a write reaches the file
+
+
+def dump_json(obj: Any, fmt: str = "json") -> str:
+    if fmt == "json":
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+class OutputSink:
+    """Text sink for a file ("-": stdout) that writes in blocks of OUTPUT_BLOCK characters."""
+
+    def __init__(self, target: str, append: bool = False, block: int = OUTPUT_BLOCK) -> None:
+        self.block = block
+        self._parts: List[str] = []
+        self._size = 0
+        if target == "-":
+            self.f: Any = sys.stdout
+            self._owned = False
+        else:
+            path = Path(target)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.f = path.open("a" if append else "w", encoding="utf-8")
+            self._owned = True
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.block:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._parts:
+            self.f.write("".join(self._parts))
+            self._parts, self._size = [], 0
+        self.f.flush()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            if self._owned:
+                self.f.close()
+
+    def __enter__(self) -> "OutputSink":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def write_results(
+    out: Dict[str, Any],
+    outdir: str,
+    fmt: str = "json",
+    sweep: Optional[Dict[str, Any]] = None,
+    case_id: Optional[str] = None,
+) -> None:
+    """Write one score result.
+
+    - json / compact: <outdir>/results.json (+ sweep.json); indent=2 for json
+    - ndjson        : one {"case_id", "ok", "results"[, "sweep"]} line appended to <outdir>/results.ndjson
+    - outdir "-"    : the same content on stdout (json/compact with a sweep: {"results", "sweep"})
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"format de sortie inconnu: {fmt} (attendu: {'|'.join(OUTPUT_FORMATS)})")
+    if fmt == "ndjson":
+        record: Dict[str, Any] = {"case_id": case_id, "ok": True, "results": out}
+        if sweep is not None:
+            record["sweep"] = sweep
+        target = "-" if outdir == "-" else str(Path(outdir) / "results.ndjson")
+        with OutputSink(target, append=True) as sink:
+            sink.write(dump_json(record, "compact") + "\n")
+        return
+    if outdir == "-":
+        with OutputSink("-") as sink:
+            sink.write(dump_json(out if sweep is None else {"results": out, "sweep": sweep}, fmt) + "\n")
+        return
+    d = Path(outdir)
+    d.mkdir(parents=True, exist_ok=True)
+    (d / "results.json").write_text(dump_json(out, fmt), encoding="utf-8")
+    if sweep is not None:
+        (d / "sweep.json").write_text(dump_json(sweep, fmt), encoding="utf-8")
+
+
+def _perf_recorder(requested: bool, started: Tuple[float, float]) -> Any:
+    """PerfRecorder (scripts/phio_perf.py) when --perf or $PHIO_PERF_OUT asks for one, else None."""
+    if not (requested or os.environ.get("PHIO_PERF_OUT")):
+        return None
+    perf = _sibling("phio_perf").PerfRecorder(*started)
+    perf.add("args", time.perf_counter() - started[0], cpu_s=round(time.process_time() - started[1], 6))
+    return perf
+
+
+def _write_perf(perf: Any, command: str, default: Optional[Path]) -> None:
+    """Perf report to $PHIO_PERF_OUT (set by run_core), else to default (None: not written)."""
+    if perf is None:
+        return
+    env = os.environ.get("PHIO_PERF_OUT")
+    path = Path(env) if env else default
+    if path is None:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(dict(perf.report(), command=command), indent=2, sort_keys=True), encoding="utf-8")
+
+
+def _cprofile(path: Optional[Path]) -> Any:
+    if path is None:
+        return contextlib.nullcontext()
+    return _sibling("phio_perf").cprofile_to(path)
+
+
+def _score_batch(args: argparse.Namespace, perf: Any) -> int:
+    """score-batch command body (perf phases: score_rows, boundary_index)."""
+    span = None
+    if args.slice:
+        parse_slice = _sibling("phio_case_store").parse_slice
+
+        span = parse_slice(args.slice)
+    n_ok = n_err = 0
+    with _phase(perf, "score_rows"), OutputSink(args.out) as sink:
+        rows = score_many(
+            args.input,
+            _agg_modes_from_args(args),
+            engine=args.engine,
+            case_ids=args.case,
+            span=span,
+            all_errors=args.all_errors,
+            sensitivity=args.sensitivity,
+        )
+        boundary: List[Dict[str, Any]] = []
+        for row in rows:
+            if row["ok"]:
+                n_ok += 1
+                if args.boundary_index:
+                    boundary.append(boundary_entry(row["case_id"], row["results"]))
+            else:
+                n_err += 1
+            sink.write(dump_json(row, "compact") + "\n")
+    if args.boundary_index:
+        with _phase(perf, "boundary_index"):
+            index = boundary_index(boundary, args.boundary_margin)
+            with OutputSink(args.boundary_index) as out_index:
+                out_index.write(dump_json(index))
+    # keep stdout a pure NDJSON stream when the rows go there
+    log = sys.stderr if args.out == "-" else sys.stdout
+    log.write(f"[score-batch] cases={n_ok + n_err} ok={n_ok} errors={n_err} out={args.out}\n")
+    return 0 if n_err == 0 else 2
+
+
+def _add_agg_arguments(sp: argparse.ArgumentParser) -> None:
+    modes = "|".join(aggregation_modes())
+    for d in ["Cx", "K", "G", "D"]:
+        sp.add_argument(f"--agg_{d}", default="median", help=f"Aggregation for {d} ({modes})")
+    sp.add_argument("--agg_τ", dest="agg_tau_unicode", default=None, help=f"Aggregation for τ ({modes})")
+    sp.add_argument("--agg_tau", dest="agg_tau_ascii", default=None, help=f"Aggregation for tau ({modes})")
+    sp.add_argument("--bottleneck", action="store_true", help="Alias: set all aggregations to bottleneck")
+
+
+def _agg_modes_from_args(args: argparse.Namespace) -> Dict[str, str]:
+    agg_modes = {
+        "Cx": getattr(args, "agg_Cx", "median"),
+        "K": getattr(args, "agg_K", "median"),
+        "G": getattr(args, "agg_G", "median"),
+        "D": getattr(args, "agg_D", "median"),
+    }
+    tau_mode = args.agg_tau_unicode or args.agg_tau_ascii or "median"
+    agg_modes["τ"] = tau_mode
+    agg_modes["tau"] = tau_mode
+
+    if getattr(args, "bottleneck", False):
+        for k in list(agg_modes.keys()):
+            agg_modes[k] = "bottleneck"
+    return agg_modes
+
+
 def parse_args(argv: List[str]) -> argparse.Namespace:
     p = argparse.ArgumentParser(
         prog="phi_otimes_o_instrument_v0_1",
         description="PhiO instrument CLI (contract-driven).",
+        epilog=f"Aggregation modes (--agg_<dim>): {', '.join(aggregation_modes())}",
     )
     sub = p.add_subparsers(dest="cmd", required=False)
 
@@ -143,14 +2252,97 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
     sp_t.add_argument("--out", required=True, help="Output JSON path")
 
     sp_s = sub.add_parser("score", help="Score an input JSON and write results.json to outdir")
-    sp_s.add_argument("--input", required=True, help="Input JSON path")
-    sp_s.add_argument("--outdir", required=True, help="Output directory")
+    sp_s.add_argument(
+        "--input",
+        required=True,
+        help="Input JSON path (or .phib binary input); JSON of 1 MiB or more is streamed and must not repeat the items key",
+    )
+    sp_s.add_argument("--outdir", required=True, help="Output directory ('-': write to stdout)")
+    sp_s.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help="json: results.json, indented (default); compact: one-line JSON; ndjson: append to results.ndjson",
+    )
+    sp_s.add_argument("--case", default=None, help="Score one case of a JSONL store (--input) by case id")
+    sp_s.add_argument(
+        "--sweep", action="store_true", help="Also write sweep.json: T/K_eff/zone for every mode combination over Cx,K,τ,G,D"
+    )
+    sp_s.add_argument(
+        "--sweep-modes",
+        dest="sweep_modes",
+        default=",".join(DEFAULT_SWEEP_MODES),
+        help="Comma-separated aggregation modes swept per dimension (default: median,bottleneck)",
+    )
+    _add_agg_arguments(sp_s)
+    sp_s.add_argument(
+        "--all-errors", dest="all_errors", action="store_true", help="Report every invalid item, not only the first"
+    )
+    sp_s.add_argument(
+        "--sensitivity", action="store_true", help="Add analytic dT/dK_eff partials and the zone margin to the results"
+    )
+    sp_s.add_argument("--perf", action="store_true", help="Write per-phase timings and resources to <outdir>/perf.json")
+    sp_s.add_argument("--cprofile", action="store_true", help="Dump a cProfile pstats file to <outdir>/score.pstats")
+    sp_s.add_argument(
+        "--cache", action="store_true", help="Use the on-disk result cache (implied by --cache-dir or $PHIO_CACHE_DIR)"
+    )
+    sp_s.add_argument("--no-cache", dest="no_cache", action="store_true", help="Bypass the on-disk result cache")
+    sp_s.add_argument("--cache-dir", dest="cache_dir", default=None, help="Cache directory (default: $PHIO_CACHE_DIR or ~/.cache/phio)")
+    sp_s.add_argument(
+        "--cache-max-entries", dest="cache_max_entries", type=int, default=None, help="Result cache size bound (LRU eviction)"
+    )
 
-    for d in ["Cx", "K", "G", "D"]:
-        sp_s.add_argument(f"--agg_{d}", default="median", help=f"Aggregation for {d} (median|bottleneck)")
-    sp_s.add_argument("--agg_τ", dest="agg_tau_unicode", default=None, help="Aggregation for τ (median|bottleneck)")
-    sp_s.add_argument("--agg_tau", dest="agg_tau_ascii", default=None, help="Aggregation for tau (median|bottleneck)")
-    sp_s.add_argument("--bottleneck", action="store_true", help="Alias: set all aggregations to bottleneck")
+    sp_b = sub.add_parser("score-batch", help="Score many inputs in one process and write one JSONL row per case")
+    sp_b.add_argument("--input", required=True, help="Input directory, glob pattern or JSONL file")
+    sp_b.add_argument("--out", required=True, help="Output JSONL path (one results row per case; '-': stdout)")
+    sp_b.add_argument(
+        "--engine", choices=ENGINES, default="python", help="Scoring engine (numpy: columnar, optional dep; lut: lookup table)"
+    )
+    sp_b.add_argument("--case", action="append", default=None, help="Only this case id of a JSONL input (repeatable)")
+    sp_b.add_argument("--slice", default=None, help="Only cases START:STOP of a JSONL input (file order, Python slice)")
+    sp_b.add_argument(
+        "--all-errors",
+        dest="all_errors",
+        action="store_true",
+        help="Per-case errors list every invalid item (python/lut engines)",
+    )
+    sp_b.add_argument("--sensitivity", action="store_true", help="Add the sensitivity section to every results row")
+    sp_b.add_argument("--perf", action="store_true", help="Write per-phase timings and resources to <out>.perf.json")
+    sp_b.add_argument("--cprofile", action="store_true", help="Dump a cProfile pstats file to <out>.pstats")
+    sp_b.add_argument(
+        "--boundary-index",
+        dest="boundary_index",
+        default=None,
+        help="Write scored cases sorted by distance to the nearest zone threshold (JSON)",
+    )
+    sp_b.add_argument(
+        "--boundary-margin",
+        dest="boundary_margin",
+        type=float,
+        default=None,
+        help="Keep only cases within this |T - threshold| in the boundary index",
+    )
+    _add_agg_arguments(sp_b)
+
+    sp_r = sub.add_parser("robustness", help="Exact zone stability under every k-item ±1 perturbation")
+    sp_r.add_argument("--input", required=True, help="Input JSON path")
+    sp_r.add_argument("--out", required=True, help="Output JSON path (robustness report)")
+    sp_r.add_argument("--k", type=int, default=1, help="Perturb up to k items at once (default: 1)")
+    _add_agg_arguments(sp_r)
+
+    sp_v = sub.add_parser("serve", help="Keep the instrument loaded and score NDJSON requests on a Unix socket")
+    sp_v.add_argument("--socket", required=True, help="Unix domain socket path")
+
+    sp_l = sub.add_parser("lut", help="Query the precomputed (T, K_eff, zone) lookup table by zone and/or T range")
+    sp_l.add_argument("--out", required=True, help="Output JSON path (combinations sorted by T)")
+    sp_l.add_argument("--zone", choices=ZONE_LABELS, default=None, help="Keep only combinations in this zone")
+    sp_l.add_argument("--t-min", dest="t_min", type=float, default=None, help="Lower bound on T (inclusive)")
+    sp_l.add_argument("--t-max", dest="t_max", type=float, default=None, help="Upper bound on T (inclusive)")
+    sp_l.add_argument("--cache-dir", dest="cache_dir", default=None, help="Cache directory (default: $PHIO_CACHE_DIR or ~/.cache/phio)")
+
+    sp_c = sub.add_parser("convert", help="Convert an input between JSON and the .phib binary container")
+    sp_c.add_argument("--input", required=True, help="Source path (.json or .phib)")
+    sp_c.add_argument("--out", required=True, help="Destination path (.phib or .json)")
 
     return p.parse_args(argv)
 
@@ -158,18 +2350,26 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
 def main(argv: List[str] | None = None) -> int:
     import sys
 
+    started = (time.perf_counter(), time.process_time())
     argv = list(sys.argv[1:] if argv is None else argv)
 
     if not argv or argv == ["--help"] or argv == ["-h"]:
         parser = argparse.ArgumentParser(
             prog="phi_otimes_o_instrument_v0_1",
             description="PhiO instrument CLI (contract-driven).",
+            epilog=f"Aggregation modes (--agg_<dim>): {', '.join(aggregation_modes())}",
         )
         sub = parser.add_subparsers(dest="cmd")
         sub.add_parser("new-template", help="Generate a pytest template JSON")
         sub.add_parser("score", help="Score an input JSON and write results.json to outdir")
+        sub.add_parser("score-batch", help="Score many inputs in one process and write one JSONL row per case")
+        sub.add_parser("robustness", help="Exact zone stability under every k-item ±1 perturbation")
+        sub.add_parser("serve", help="Keep the instrument loaded and score NDJSON requests on a Unix socket")
+        sub.add_parser("lut", help="Query the precomputed (T, K_eff, zone) lookup table by zone and/or T range")
+        sub.add_parser("convert", help="Convert an input between JSON and the .phib binary container")
         parser.add_argument("--input", help="(score) input JSON")
-        parser.add_argument("--outdir", help="(score) output directory")
+        parser.add_argument("--outdir", help="(score) output directory ('-': stdout)")
+        parser.add_argument("--format", help="(score) json (default) | compact | ndjson (appended to results.ndjson)")
         parser.add_argument("--agg_Cx", help="Aggregation for Cx")
         parser.add_argument("--agg_K", help="Aggregation for K")
         parser.add_argument("--agg_G", help="Aggregation for G")
@@ -177,6 +2377,14 @@ def main(argv: List[str] | None = None) -> int:
         parser.add_argument("--agg_τ", help="Aggregation for τ")
         parser.add_argument("--agg_tau", help="Aggregation for tau")
         parser.add_argument("--bottleneck", help="Use bottleneck aggregation")
+        parser.add_argument("--cache", help="(score) use the on-disk result cache (opt-in; implied by --cache-dir)")
+        parser.add_argument("--no-cache", help="(score) bypass the on-disk result cache")
+        parser.add_argument("--all-errors", help="(score, score-batch) report every invalid item")
+        parser.add_argument("--sweep", help="(score) every aggregation-mode combination, written to sweep.json")
+        parser.add_argument("--sensitivity", help="(score, score-batch) analytic partials and zone margin")
+        parser.add_argument("--boundary-index", help="(score-batch) cases sorted by distance to a zone threshold")
+        parser.add_argument("--perf", help="(score, score-batch) per-phase timings and resources to perf.json")
+        parser.add_argument("--cprofile", help="(score, score-batch) dump a cProfile pstats file next to the outputs")
         parser.print_help()
         return 0
 
@@ -191,39 +2399,86 @@ def main(argv: List[str] | None = None) -> int:
             return 0
 
         if args.cmd == "score":
-            inp = Path(args.input)
-            data = json.loads(inp.read_text(encoding="utf-8"))
+            perf = _perf_recorder(args.perf, started)
+            to_stdout = args.outdir == "-"
+            with _cprofile(Path("score.pstats" if to_stdout else Path(args.outdir) / "score.pstats") if args.cprofile else None):
+                with _phase(perf, "setup"):
+                    cache = _result_cache(args)
+                    plan = ScoringPlan.from_args(args)
+                sweep = None
+                if args.sweep:
+                    source: Any = Path(args.input)
+                    if args.case is not None:
+                        CaseStore = _sibling("phio_case_store").CaseStore
 
-            validate_input(data)
+                        with _phase(perf, "read_case"):
+                            source = CaseStore(Path(args.input)).get(args.case)
+                    with _phase(perf, "sweep"):
+                        out, sweep = aggregation_sweep(source, args.sweep_modes.split(","), _agg_modes_from_args(args))
+                elif args.case is not None:
+                    CaseStore = _sibling("phio_case_store").CaseStore
 
-            agg_modes = {
-                "Cx": getattr(args, "agg_Cx", "median"),
-                "K": getattr(args, "agg_K", "median"),
-                "G": getattr(args, "agg_G", "median"),
-                "D": getattr(args, "agg_D", "median"),
-            }
-            tau_mode = args.agg_tau_unicode or args.agg_tau_ascii or "median"
-            agg_modes["τ"] = tau_mode
-            agg_modes["tau"] = tau_mode
+                    with _phase(perf, "read_case"):
+                        data = CaseStore(Path(args.input)).get(args.case)
+                    out = cached_score_data(data, plan, cache, all_errors=args.all_errors, perf=perf)
+                else:
+                    out = cached_score_file(Path(args.input), plan, cache, all_errors=args.all_errors, perf=perf)
+                if cache is not None:
+                    cache.flush()
+                if args.sensitivity:
+                    with _phase(perf, "sensitivity"):
+                        out = with_sensitivity(out)
 
-            if getattr(args, "bottleneck", False):
-                for k in list(agg_modes.keys()):
-                    agg_modes[k] = "bottleneck"
+                with _phase(perf, "write"):
+                    write_results(out, args.outdir, args.format, sweep=sweep, case_id=args.case or args.input)
+            _write_perf(perf, "score", None if to_stdout else Path(args.outdir) / "perf.json")
+            return 0
 
-            dim_scores = aggregate_dimension_scores(data, agg_modes)
-            T, K_eff = compute_metrics(dim_scores)
-            zone = assign_zone(T)
+        if args.cmd == "score-batch":
+            perf = _perf_recorder(args.perf, started)
+            side = Path("score-batch" if args.out == "-" else args.out)
+            with _cprofile(side.with_name(side.name + ".pstats") if args.cprofile else None):
+                rc = _score_batch(args, perf)
+            _write_perf(perf, "score-batch", side.with_name(side.name + ".perf.json"))
+            return rc
 
-            outdir = Path(args.outdir)
-            outdir.mkdir(parents=True, exist_ok=True)
-            out = {
-                "instrument": {"id": __instrument_id__, "version": __version__},
-                "dimension_scores": dim_scores,
-                "T": T,
-                "K_eff": K_eff,
-                "zone": zone,
-            }
-            (outdir / "results.json").write_text(json.dumps(out, ensure_ascii=False, indent=2), encoding="utf-8")
+        if args.cmd == "robustness":
+            data = json.loads(Path(args.input).read_text(encoding="utf-8"))
+            report = robustness_analysis(data, _agg_modes_from_args(args), k=args.k)
+            outp = Path(args.out)
+            outp.parent.mkdir(parents=True, exist_ok=True)
+            outp.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+            return 0
+
+        if args.cmd == "serve":
+            import signal
+
+            def _stop(signum: int, frame: Any) -> None:
+                raise KeyboardInterrupt
+
+            server = ScoringServer(args.socket)
+            signal.signal(signal.SIGTERM, _stop)
+            sys.stderr.write(f"[serve] listening on {args.socket}\n")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.server_close()
+            return 0
+
+        if args.cmd == "lut":
+            table = ZoneLookupTable.load_or_build(args.cache_dir)
+            rows = table.combinations(zone=args.zone, t_min=args.t_min, t_max=args.t_max)
+            outp = Path(args.out)
+            outp.parent.mkdir(parents=True, exist_ok=True)
+            outp.write_text(json.dumps(rows, ensure_ascii=False), encoding="utf-8")
+            return 0
+
+        if args.cmd == "convert":
+            convert = _sibling("phio_binary").convert
+
+            convert(Path(args.input), Path(args.out))
             return 0
 
         return 2
@@ -235,4 +2490,6 @@ def main(argv: List[str] | None = None) -> int:
 
 
 if __name__ == "__main__":
+    # sibling modules then import this very module instead of a second copy
+    sys.modules.setdefault("phi_otimes_o_instrument_v0_1", sys.modules[__name__])
     raise SystemExit(main())
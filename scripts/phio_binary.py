@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""phio_binary.py
+
+Compact binary container (.phib) for PhiO instrument inputs.
+
+Layout (all integers little-endian):
+- magic        : 8 bytes, b"PHIOBIN1"
+- header_len   : uint32
+- header       : UTF-8 JSON object, space-padded so the columns start 8-byte aligned
+    {"format": "phib", "version": 2, "count": n,
+     "dimensions": [label, ...],          # code -> label, first-appearance order
+     "cell_width": 1 | 2,                 # bytes per cell
+     "cells_offset": o1, "weights_offset": o2,
+     "meta": {...}}                       # every top-level key but "items"
+- cells        : n unsigned ints, cell = code * N_BINS + (score - SCORE_MIN)
+- weights      : n float64 (1.0 when absent, NaN when invalid)
+
+A record (dimension code, score, weight) is split across the two columns so
+that scoring only touches the cells: per-cell counts are taken chunk by chunk
+over the memory-mapped file, never building one Python object per item.
+Item fields other than dimension/score/weight (e.g. justification) are not
+stored. As in ItemTable, an invalid weight is kept as NaN and only reported
+(item[idx].weight invalide) when a weighted mode reads it.
+
+Usage (from the instrument):
+  python phi_otimes_o_instrument_v0_1.py convert --input in.json --out in.phib
+  python phi_otimes_o_instrument_v0_1.py score --input in.phib --outdir out/
+  python phi_otimes_o_instrument_v0_1.py convert --input in.phib --out in.json
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+try:
+    from scripts.phi_otimes_o_instrument_v0_1 import N_BINS, SCORE_MIN, ScoringPlan, _item_weight, validate_input
+except ImportError:  # imported by the instrument run as `python scripts/phi_otimes_o_instrument_v0_1.py`
+    from phi_otimes_o_instrument_v0_1 import (  # type: ignore[no-redef]
+        N_BINS,
+        SCORE_MIN,
+        ScoringPlan,
+        _item_weight,
+        validate_input,
+    )
+
+
+MAGIC = b"PHIOBIN1"
+VERSION = 2
+SUFFIX = ".phib"
+
+# Cells counted per pass (bounds the bytes copied out of the mapping at once).
+CHUNK_CELLS = 1 << 24
+
+
+def is_phib(path: Path) -> bool:
+    return Path(path).suffix.lower() == SUFFIX
+
+
+def _align(n: int, k: int = 8) -> int:
+    return (n + k - 1) // k * k
+
+
+def _pack_header(header: Dict[str, Any]) -> bytes:
+    """magic + length + header JSON, with the column offsets filled in."""
+    n = header["count"]
+    # offsets depend on the header length, which depends on the offsets: fix point
+    header["cells_offset"] = header["weights_offset"] = 0
+    while True:
+        raw = json.dumps(header, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        cells_offset = _align(len(MAGIC) + 4 + len(raw))
+        weights_offset = _align(cells_offset + n * header["cell_width"])
+        if (header["cells_offset"], header["weights_offset"]) == (cells_offset, weights_offset):
+            break
+        header["cells_offset"], header["weights_offset"] = cells_offset, weights_offset
+    raw = raw.ljust(cells_offset - len(MAGIC) - 4, b" ")
+    return MAGIC + struct.pack("<I", len(raw)) + raw
+
+
+def _le(arr: array) -> bytes:
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def write_phib(data: Dict[str, Any], path: Path) -> Dict[str, Any]:
+    """Encode an instrument input (the build_template() shape) to .phib; returns the header."""
+    if not isinstance(data, dict):
+        raise ValueError("input doit être un objet JSON")
+    validate_input(data)
+    codes: Dict[str, int] = {}
+    dims: List[str] = []
+    cells = array("H")
+    weights = array("d")
+    for idx, it in enumerate(data["items"]):
+        code = codes.get(it["dimension"])
+        if code is None:
+            code = codes[it["dimension"]] = len(dims)
+            dims.append(it["dimension"])
+            if len(dims) * N_BINS > 1 << 16:
+                raise ValueError(f"trop de dimensions pour .phib: {len(dims)}")
+        cells.append(code * N_BINS + it["score"] - SCORE_MIN)
+        try:
+            weights.append(_item_weight(idx, it))
+        except ValueError:
+            weights.append(math.nan)  # only an error for weighted modes, as when scoring the JSON
+
+    width = 1 if len(dims) * N_BINS <= 1 << 8 else 2
+    header = {
+        "format": "phib",
+        "version": VERSION,
+        "count": len(cells),
+        "dimensions": dims,
+        "cell_width": width,
+        "meta": {k: v for k, v in data.items() if k != "items"},
+    }
+    head = _pack_header(header)
+    body = array("B", cells).tobytes() if width == 1 else _le(cells)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        f.write(head)
+        f.write(body)
+        f.write(b"\0" * (header["weights_offset"] - header["cells_offset"] - len(body)))
+        f.write(_le(weights))
+    return header
+
+
+class PhibFile:
+    """Read-only memory-mapped .phib input."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.header = self._read_header()
+        except Exception:
+            self.mm.close()
+            raise
+
+    def _read_header(self) -> Dict[str, Any]:
+        mm = self.mm
+        if mm[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"fichier .phib invalide (magic): {self.path}")
+        (hlen,) = struct.unpack_from("<I", mm, len(MAGIC))
+        header = json.loads(mm[len(MAGIC) + 4 : len(MAGIC) + 4 + hlen].decode("utf-8"))
+        if header.get("format") != "phib" or header.get("version") != VERSION:
+            raise ValueError(f"version .phib non supportée: {header.get('version')}")
+        n, width = header["count"], header["cell_width"]
+        if width not in (1, 2) or header["weights_offset"] + 8 * n > len(mm):
+            raise ValueError(f"fichier .phib tronqué ou corrompu: {self.path}")
+        return header
+
+    def close(self) -> None:
+        self.mm.close()
+
+    def __enter__(self) -> "PhibFile":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def dimensions(self) -> List[str]:
+        return self.header["dimensions"]
+
+    def cell_counts(self, chunk_cells: int = CHUNK_CELLS) -> List[int]:
+        """Per-cell item counts over the mapped cells column."""
+        n, width, off = self.header["count"], self.header["cell_width"], self.header["cells_offset"]
+        n_cells = len(self.dimensions) * N_BINS
+        counts = [0] * n_cells
+        needles = [bytes((v,)) for v in range(n_cells)] if width == 1 else []
+        for c0 in range(0, n, chunk_cells):
+            chunk = self.mm[off + c0 * width : off + min(n, c0 + chunk_cells) * width]
+            if width == 1:
+                for v, needle in enumerate(needles):
+                    counts[v] += chunk.count(needle)
+            else:
+                arr = array("H", chunk)
+                if sys.byteorder == "big":
+                    arr.byteswap()
+                for v, c in Counter(arr).items():
+                    if v >= n_cells:
+                        raise ValueError(f"fichier .phib corrompu: cellule {v}")
+                    counts[v] += c
+        if sum(counts) != n:
+            raise ValueError(f"fichier .phib corrompu: {n - sum(counts)} cellule(s) hors dictionnaire")
+        return counts
+
+    def cell_masses(self, chunk_cells: int = CHUNK_CELLS) -> List[float]:
+        """Per-cell weight sums, accumulated in item order (one Python step per item)."""
+        n, width = self.header["count"], self.header["cell_width"]
+        c_off, w_off = self.header["cells_offset"], self.header["weights_offset"]
+        masses = [0.0] * (len(self.dimensions) * N_BINS)
+        for c0 in range(0, n, chunk_cells):
+            c1 = min(n, c0 + chunk_cells)
+            cells = array("B" if width == 1 else "H", self.mm[c_off + c0 * width : c_off + c1 * width])
+            weights = array("d", self.mm[w_off + 8 * c0 : w_off + 8 * c1])
+            if sys.byteorder == "big":
+                weights.byteswap()
+                if width == 2:
+                    cells.byteswap()
+            for c, w in zip(cells, weights):
+                masses[c] += w
+        return masses
+
+    def histograms(self, plan: ScoringPlan) -> Dict[int, List[int]]:
+        """plan slot -> per-score counts, as ScoringPlan.accumulate() would build them.
+
+        Weighted-mode dimensions get weight sums in item order, identical to
+        the JSON path.
+        """
+        counts = self.cell_counts()
+        slots = [plan.slot(label) for label in self.dimensions]
+        masses = self.cell_masses() if any(plan.weighted[s] for s in slots) else None
+        hist: Dict[int, List[int]] = {}
+        for code, s in enumerate(slots):
+            row = counts[code * N_BINS : (code + 1) * N_BINS]
+            if any(row):
+                if plan.weighted[s]:
+                    row = masses[code * N_BINS : (code + 1) * N_BINS]
+                    if any(m != m for m in row):
+                        self._invalid_weight({lb for lb, t in zip(self.dimensions, slots) if plan.weighted[t]})
+                hist[s] = row
+        if not hist:
+            raise ValueError("input.items absent ou vide")
+        return hist
+
+    def _invalid_weight(self, labels: set) -> None:
+        # first NaN weight read by a weighted dimension, with the JSON path's message
+        for idx, (dim, _, w) in enumerate(self.records()):
+            if w != w and dim in labels:
+                raise ValueError(f"item[{idx}].weight invalide")
+
+    def records(self) -> Iterator[Tuple[str, int, float]]:
+        """(dimension, score, weight) per item, in file order."""
+        n, width = self.header["count"], self.header["cell_width"]
+        c0, w0 = self.header["cells_offset"], self.header["weights_offset"]
+        cells = array("B" if width == 1 else "H", self.mm[c0 : c0 + n * width])
+        weights = array("d", self.mm[w0 : w0 + 8 * n])
+        if sys.byteorder == "big":
+            weights.byteswap()
+            if width == 2:
+                cells.byteswap()
+        dims = self.dimensions
+        for cell, w in zip(cells, weights):
+            yield dims[cell // N_BINS], cell % N_BINS + SCORE_MIN, w
+
+    def to_json(self) -> Dict[str, Any]:
+        """Back to the instrument JSON shape (items: dimension, score, weight; NaN for an invalid weight)."""
+        data = dict(self.header["meta"])
+        data["items"] = [{"dimension": d, "score": s, "weight": w} for d, s, w in self.records()]
+        return data
+
+
+def convert(src: Path, dst: Path) -> None:
+    """JSON -> .phib or .phib -> JSON, chosen from the file suffixes."""
+    src, dst = Path(src), Path(dst)
+    if is_phib(src) and not is_phib(dst):
+        with PhibFile(src) as pf:
+            data = pf.to_json()
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        dst.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    elif is_phib(dst) and not is_phib(src):
+        write_phib(json.loads(src.read_text(encoding="utf-8")), dst)
+    else:
+        raise ValueError(f"conversion attendue JSON <-> {SUFFIX}: {src} -> {dst}")
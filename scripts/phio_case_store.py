@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""phio_case_store.py
+
+Indexed JSONL case store: random access to one case of a large JSONL file.
+
+A sidecar index `<file>.idx.json` maps every non-empty line to
+(case_id, byte offset, byte length, line number). Case ids follow the batch
+rules (case_id | id | <file>:<lineno>), so rows are the same as a full
+score-batch scan. Records are read through mmap and raw_decode, one line at a
+time.
+
+Index maintenance:
+- the index remembers how many bytes it covers and a digest of the last 4 KiB
+- file only appended to -> only the new bytes are scanned
+- anything else (truncated, rewritten) -> full rebuild
+- an unterminated last line is indexed but rescanned at the next refresh
+- the sidecar is best effort: a read-only directory keeps the index in memory
+
+Duplicate case ids resolve to the last occurrence (append = update).
+
+Usage (from the instrument):
+  python phi_otimes_o_instrument_v0_1.py score --input cases.jsonl --case case-42 --outdir out/
+  python phi_otimes_o_instrument_v0_1.py score-batch --input cases.jsonl --slice 1000:2000 --out rows.jsonl
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from scripts.phi_otimes_o_instrument_v0_1 import _case_id
+except ImportError:  # imported by the instrument run as `python scripts/phi_otimes_o_instrument_v0_1.py`
+    from phi_otimes_o_instrument_v0_1 import _case_id  # type: ignore[no-redef]
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".idx.json"
+TAIL_BYTES = 4096
+
+
+def parse_slice(txt: str) -> slice:
+    """'START:STOP' (either side optional, negatives allowed) -> slice."""
+    parts = txt.split(":")
+    if len(parts) != 2:
+        raise ValueError(f"slice attendu START:STOP, reçu: {txt}")
+    try:
+        start, stop = (int(x) if x.strip() else None for x in parts)
+    except ValueError:
+        raise ValueError(f"slice attendu START:STOP, reçu: {txt}")
+    return slice(start, stop)
+
+
+class CaseStore:
+    """Offset index over a JSONL file of instrument inputs."""
+
+    def __init__(self, path: Path, index_path: Optional[Path] = None) -> None:
+        self.path = Path(path)
+        self.index_path = Path(index_path) if index_path else self.path.with_name(self.path.name + INDEX_SUFFIX)
+        self.ids: List[str] = []
+        self.offsets: List[int] = []
+        self.lengths: List[int] = []
+        self.lines: List[int] = []
+        self.size = 0  # bytes covered by complete (newline-terminated) lines
+        self.n_lines = 0  # lines covered by self.size
+        self.tail = ""
+        self._by_id: Dict[str, int] = {}
+        self._decode = json.JSONDecoder().raw_decode
+        self.scanned = self.refresh()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # -- index ---------------------------------------------------------------
+
+    def _tail_digest(self, mm: Any, end: int) -> str:
+        return hashlib.sha256(mm[max(0, end - TAIL_BYTES) : end]).hexdigest()
+
+    def _load(self) -> bool:
+        try:
+            idx = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if not isinstance(idx, dict) or idx.get("version") != INDEX_VERSION:
+            return False
+        self.ids, self.offsets, self.lengths, self.lines = idx["ids"], idx["offsets"], idx["lengths"], idx["lines"]
+        self.size, self.n_lines, self.tail = idx["size"], idx["n_lines"], idx["tail"]
+        return True
+
+    def _save(self) -> None:
+        idx = {
+            "version": INDEX_VERSION,
+            "source": self.path.name,
+            "size": self.size,
+            "n_lines": self.n_lines,
+            "tail": self.tail,
+            "ids": self.ids,
+            "offsets": self.offsets,
+            "lengths": self.lengths,
+            "lines": self.lines,
+        }
+        tmp = self.index_path.with_name(self.index_path.name + f".tmp{os.getpid()}")
+        try:
+            tmp.write_text(json.dumps(idx, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.index_path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+    def _reset(self) -> None:
+        self.ids, self.offsets, self.lengths, self.lines = [], [], [], []
+        self.size = self.n_lines = 0
+        self.tail = ""
+
+    def refresh(self) -> int:
+        """Bring the index up to date with the file; returns the number of bytes scanned."""
+        file_size = self.path.stat().st_size
+        loaded = self._load()
+        with self.path.open("rb") as f:
+            if file_size == 0:
+                self._reset()
+                self._rebuild_ids()
+                return 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if not loaded or self.size > file_size or self._tail_digest(mm, self.size) != self.tail:
+                    self._reset()
+                # drop the unterminated line indexed last time, if any
+                keep = len(self.offsets)
+                while keep and self.offsets[keep - 1] >= self.size:
+                    keep -= 1
+                del self.ids[keep:], self.offsets[keep:], self.lengths[keep:], self.lines[keep:]
+                scanned = file_size - self.size
+                if scanned or not loaded:
+                    self._scan(mm, file_size)
+                    self.tail = self._tail_digest(mm, self.size)
+                    self._save()
+        self._rebuild_ids()
+        return scanned
+
+    def _scan(self, mm: Any, end: int) -> None:
+        pos, lineno = self.size, self.n_lines
+        name = self.path.name
+        while pos < end:
+            nl = mm.find(b"\n", pos, end)
+            stop = end if nl < 0 else nl
+            lineno += 1
+            raw = mm[pos:stop]
+            if raw.strip():
+                default = f"{name}:{lineno}"
+                try:
+                    rec = json.loads(raw)
+                except ValueError:
+                    rec = None
+                self.ids.append(_case_id(rec, default))
+                self.offsets.append(pos)
+                self.lengths.append(stop - pos)
+                self.lines.append(lineno)
+            if nl < 0:
+                break  # unterminated: not counted in size, rescanned next time
+            pos = nl + 1
+            self.size, self.n_lines = pos, lineno
+
+    def _rebuild_ids(self) -> None:
+        self._by_id = {cid: i for i, cid in enumerate(self.ids)}
+
+    # -- access --------------------------------------------------------------
+
+    def _parse(self, mm: Any, i: int) -> Any:
+        off, n = self.offsets[i], self.lengths[i]
+        text = mm[off : off + n].decode("utf-8")
+        start = len(text) - len(text.lstrip())
+        obj, end = self._decode(text, start)
+        if text[end:].strip():
+            raise ValueError(f"JSON invalide ({self.path.name}:{self.lines[i]}): données après l'objet")
+        return obj
+
+    def read_at(self, i: int) -> Any:
+        """Parsed record at index position i (ValueError on invalid JSON)."""
+        with self.path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return self._parse(mm, i)
+
+    def get(self, case_id: str) -> Any:
+        i = self._by_id.get(case_id)
+        if i is None:
+            raise ValueError(f"cas introuvable: {case_id} ({self.path.name})")
+        return self.read_at(i)
+
+    def select(self, case_ids: Optional[Iterable[str]] = None, span: Optional[slice] = None) -> List[int]:
+        """Index positions for explicit case ids (in the given order) or a slice of file order."""
+        if case_ids:
+            out = []
+            for cid in case_ids:
+                i = self._by_id.get(cid)
+                if i is None:
+                    raise ValueError(f"cas introuvable: {cid} ({self.path.name})")
+                out.append(i)
+            return out
+        return list(range(len(self.ids)))[span or slice(None)]
+
+    def iter_cases(
+        self, case_ids: Optional[Iterable[str]] = None, span: Optional[slice] = None
+    ) -> Iterator[Tuple[str, Any]]:
+        """(case_id, data_or_exception), like iter_batch_inputs(), for the selected cases."""
+        with self.path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for i in self.select(case_ids, span):
+                try:
+                    obj = self._parse(mm, i)
+                except Exception as e:
+                    yield self.ids[i], e
+                    continue
+                yield self.ids[i], obj
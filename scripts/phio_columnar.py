@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""phio_columnar.py
+
+Optional NumPy columnar scoring engine for the PhiO instrument.
+
+Many cases are held at once as flat columns:
+- case  : case index per item (int64)
+- dim   : interned dimension code per item (int32)
+- score : item score (int8)
+- weight: item weight (float64, 1.0 outside weighted modes)
+
+Only the (case, dimension) cells a case actually uses are materialized: per
+pass over a run of whole cases, the cells are numbered with np.unique and
+their per-score counts (and, for weighted modes, weight sums) are built with
+one bincount; each aggregation mode then runs its batched kernel (see
+Aggregator in the instrument) over its cells, and K_eff/T and zones are
+evaluated as whole-array operations. Memory follows the number of items (a
+pass holds at most CHUNK_BYTES of temporaries), not cases x distinct labels.
+The arithmetic mirrors the scalar path operation by operation, so results are
+bit-for-bit identical to score_data().
+
+NumPy is not a repo dependency: it is imported lazily and only this engine
+needs it.
+
+Usage (from the instrument):
+  python phi_otimes_o_instrument_v0_1.py score-batch --engine numpy --input cases.jsonl --out rows.jsonl
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from scripts.phi_otimes_o_instrument_v0_1 import (
+        N_BINS,
+        SCORE_MIN,
+        ZONE_LABELS,
+        ZONE_THRESHOLDS,
+        __instrument_id__,
+        __version__,
+        ScoringPlan,
+        _item_weight,
+        compile_plan,
+        validate_input,
+    )
+except ImportError:  # imported by the instrument run as `python scripts/phi_otimes_o_instrument_v0_1.py`
+    from phi_otimes_o_instrument_v0_1 import (  # type: ignore[no-redef]
+        N_BINS,
+        SCORE_MIN,
+        ZONE_LABELS,
+        ZONE_THRESHOLDS,
+        __instrument_id__,
+        __version__,
+        ScoringPlan,
+        _item_weight,
+        compile_plan,
+        validate_input,
+    )
+
+# Temporaries allowed per bincount pass; a pass always covers whole cases.
+CHUNK_BYTES = 64 << 20
+# Temporary bytes per item in a pass: cell key, inverse, bin index, first index,
+# plus one counts row and one masses row per (at most one per item) cell.
+_PASS_BYTES_PER_ITEM = 8 * (4 + 2 * N_BINS)
+
+
+def _np():
+    try:
+        import numpy as np
+    except ImportError as e:  # pragma: no cover - depends on the environment
+        raise RuntimeError("engine 'numpy' requires numpy (pip install numpy)") from e
+    return np
+
+
+class ColumnarBatch:
+    """Flat columns for many cases; invalid cases are kept as per-case errors."""
+
+    def __init__(self, plan: Optional[ScoringPlan] = None) -> None:
+        self.plan = plan
+        self.case_ids: List[str] = []
+        self.errors: Dict[int, str] = {}
+        self.labels: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._case = array("q")
+        self._dim = array("i")
+        self._score = array("b")
+        self._weight = array("d")
+
+    def _intern(self, label: str) -> int:
+        code = self._codes.get(label)
+        if code is None:
+            code = self._codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def add_case(self, case_id: str, data: Any) -> None:
+        ci = len(self.case_ids)
+        self.case_ids.append(case_id)
+        try:
+            if isinstance(data, Exception):
+                raise data
+            if not isinstance(data, dict):
+                raise ValueError("input doit être un objet JSON")
+            validate_input(data)
+            weights = self._weights(data["items"])
+        except Exception as e:
+            self.errors[ci] = str(e)
+            return
+        intern = self._intern
+        for it, w in zip(data["items"], weights):
+            self._case.append(ci)
+            self._dim.append(intern(it["dimension"]))
+            self._score.append(it["score"])
+            self._weight.append(w)
+
+    def _weights(self, items: List[Dict[str, Any]]) -> List[float]:
+        plan = self.plan
+        if plan is None or not plan.any_weighted:
+            return [1.0] * len(items)
+        return [
+            _item_weight(idx, it) if plan.kernel(it["dimension"]).weighted else 1.0
+            for idx, it in enumerate(items)
+        ]
+
+    @classmethod
+    def from_cases(cls, cases: Iterable[Tuple[str, Any]], plan: Optional[ScoringPlan] = None) -> "ColumnarBatch":
+        b = cls(plan)
+        for case_id, data in cases:
+            b.add_case(case_id, data)
+        return b
+
+    def columns(self):
+        np = _np()
+        return (
+            np.frombuffer(self._case, dtype=np.int64),
+            np.frombuffer(self._dim, dtype=np.int32),
+            np.frombuffer(self._score, dtype=np.int8),
+            np.frombuffer(self._weight, dtype=np.float64),
+        )
+
+
+class ColumnarScores:
+    """Whole-batch results: sparse (case, dim) cells in first-seen order, plus T/K_eff/zone arrays."""
+
+    def __init__(self, batch: ColumnarBatch, cell_case, cell_dim, cell_value, T, K_eff, zone_idx) -> None:
+        np = _np()
+        self.batch = batch
+        self.cell_case = cell_case  # (cells,) int64, non-decreasing
+        self.cell_dim = cell_dim  # (cells,) int64 dimension code
+        self.cell_value = cell_value  # (cells,) float64 aggregated score
+        # cells of case ci: offsets[ci]:offsets[ci + 1]
+        self.offsets = np.searchsorted(cell_case, np.arange(len(batch.case_ids) + 1), side="left")
+        self.T = T
+        self.K_eff = K_eff
+        self.zone_idx = zone_idx
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Same rows as score_many(), in case order."""
+        labels = self.batch.labels
+        offsets = self.offsets.tolist()
+        for ci, case_id in enumerate(self.batch.case_ids):
+            err = self.batch.errors.get(ci)
+            if err is not None:
+                yield {"case_id": case_id, "ok": False, "error": err}
+                continue
+            a, b = offsets[ci], offsets[ci + 1]
+            dims = self.cell_dim[a:b].tolist()
+            vals = self.cell_value[a:b].tolist()
+            yield {
+                "case_id": case_id,
+                "ok": True,
+                "results": {
+                    "instrument": {"id": __instrument_id__, "version": __version__},
+                    "dimension_scores": {labels[j]: v for j, v in zip(dims, vals)},
+                    "T": float(self.T[ci]),
+                    "K_eff": float(self.K_eff[ci]),
+                    "zone": ZONE_LABELS[int(self.zone_idx[ci])],
+                },
+            }
+
+
+def _passes(np, case, max_items: int) -> Iterator[Tuple[int, int]]:
+    """Item ranges [i0, i1) of at most max_items that never split a case (a larger case gets its own pass)."""
+    n = len(case)
+    i0 = 0
+    while i0 < n:
+        i1 = min(n, i0 + max_items)
+        if i1 < n:
+            i1 = int(np.searchsorted(case, case[i1], side="left"))
+            if i1 == i0:
+                i1 = int(np.searchsorted(case, case[i0], side="right"))
+        yield i0, i1
+        i0 = i1
+
+
+def score_columnar(batch: ColumnarBatch, agg_modes: Dict[str, str], chunk_bytes: int = CHUNK_BYTES) -> ColumnarScores:
+    np = _np()
+    case, dim, score, weight = batch.columns()
+    n_cases = len(batch.case_ids)
+    n_dims = max(len(batch.labels), 1)
+
+    plan = compile_plan(agg_modes)
+    # dimension codes grouped by aggregation mode: one batched kernel call per mode and pass
+    groups: Dict[str, int] = {}
+    kernels = []
+    dim_group = np.zeros(n_dims, dtype=np.int64)
+    for j, lb in enumerate(batch.labels):
+        g = groups.get(plan.mode(lb))
+        if g is None:
+            g = groups[plan.mode(lb)] = len(kernels)
+            kernels.append(plan.kernel(lb))
+        dim_group[j] = g
+
+    parts: List[Tuple[Any, Any, Any]] = []
+    for i0, i1 in _passes(np, case, max(1, chunk_bytes // _PASS_BYTES_PER_ITEM)):
+        key = case[i0:i1] * n_dims + dim[i0:i1]
+        uniq, first, inv = np.unique(key, return_index=True, return_inverse=True)
+        flat = inv.reshape(-1) * N_BINS + (score[i0:i1].astype(np.int64) - SCORE_MIN)
+        counts = np.bincount(flat, minlength=len(uniq) * N_BINS).reshape(-1, N_BINS)
+        masses = None
+        if plan.any_weighted:
+            masses = np.bincount(flat, weights=weight[i0:i1], minlength=len(uniq) * N_BINS).reshape(-1, N_BINS)
+        vals = np.empty(len(uniq), dtype=np.float64)
+        grp = dim_group[uniq % n_dims]
+        for g, kernel in enumerate(kernels):
+            sel = np.flatnonzero(grp == g)
+            if sel.size:
+                vals[sel] = kernel.batched(np, (masses if kernel.weighted else counts)[sel])
+        parts.append((uniq, first + i0, vals))
+
+    if parts:
+        uniq = np.concatenate([p[0] for p in parts])
+        first = np.concatenate([p[1] for p in parts])
+        vals = np.concatenate([p[2] for p in parts])
+    else:
+        uniq = first = np.zeros(0, dtype=np.int64)
+        vals = np.zeros(0, dtype=np.float64)
+    # items are stored case by case, so item order is (case, first occurrence) order
+    order = np.argsort(first, kind="stable")
+    cell_case, cell_dim, cell_value = uniq[order] // n_dims, uniq[order] % n_dims, vals[order]
+
+    def col(label: str):
+        out = np.zeros(n_cases, dtype=np.float64)
+        has = np.zeros(n_cases, dtype=bool)
+        j = batch._codes.get(label)
+        if j is not None:
+            m = cell_dim == j
+            out[cell_case[m]] = cell_value[m]
+            has[cell_case[m]] = True
+        return out, has
+
+    Cx, _ = col("Cx")
+    K, _ = col("K")
+    G, _ = col("G")
+    D, _ = col("D")
+    tau_u, has_tau_u = col("τ")
+    tau_a, _ = col("tau")
+    # dims.get("τ", dims.get("tau", 0.0))
+    tau_val = np.where(has_tau_u, tau_u, tau_a)
+
+    # same evaluation order as compute_metrics
+    denom = 1.0 + tau_val + G + D + Cx
+    K_eff = np.divide(K, denom, out=np.zeros_like(denom), where=denom != 0)
+    T = Cx + tau_val + G + D - K_eff
+    zone_idx = np.searchsorted(np.asarray(ZONE_THRESHOLDS, dtype=np.float64), T, side="left")
+
+    return ColumnarScores(batch, cell_case, cell_dim, cell_value, T, K_eff, zone_idx)
+
+
+def score_many_columnar(cases: Iterable[Tuple[str, Any]], agg_modes: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+    batch = ColumnarBatch.from_cases(cases, compile_plan(agg_modes))
+    return score_columnar(batch, agg_modes).rows()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""phio_perf.py
+
+Per-phase timing and resource accounting for the PhiO runners and instrument.
+
+A PerfRecorder collects named phases, each with:
+- wall_s      : elapsed time (perf_counter)
+- cpu_s       : process CPU time, user + system (process_time)
+- read_bytes  : bytes read by the process during the phase   (Linux /proc/self/io rchar)
+- write_bytes : bytes written by the process during the phase (Linux /proc/self/io wchar)
+
+report() adds totals and peak RSS of the process and of its waited-for
+children (resource.getrusage), for the `perf` section of run manifests.
+Counters a platform does not provide are reported as null.
+
+cprofile_to(path) wraps a block in cProfile and dumps a pstats file.
+
+Usage:
+  perf = PerfRecorder()
+  with perf.phase("decode"):
+      ...
+  manifest["perf"] = perf.report()
+"""
+
+from __future__ import annotations
+
+import contextlib
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+_PROC_IO = Path("/proc/self/io")
+
+
+def io_counters() -> Tuple[Optional[int], Optional[int]]:
+    """(bytes read, bytes written) by this process so far, or (None, None)."""
+    try:
+        fields = dict(line.split(":", 1) for line in _PROC_IO.read_text().splitlines())
+        return int(fields["rchar"]), int(fields["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def peak_rss_bytes(children: bool = False) -> Optional[int]:
+    """Peak resident set size of this process (or of its terminated children)."""
+    if resource is None:
+        return None
+    ru = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is in KiB on Linux, in bytes on macOS
+    return int(ru.ru_maxrss) * (1 if sys.platform == "darwin" else 1024)
+
+
+def _delta(a: Optional[int], b: Optional[int]) -> Optional[int]:
+    return None if a is None or b is None else b - a
+
+
+class PerfRecorder:
+    """Ordered list of measured phases (see module docstring)."""
+
+    def __init__(self, wall0: Optional[float] = None, cpu0: Optional[float] = None) -> None:
+        """wall0/cpu0: perf_counter()/process_time() readings the totals start from (default: now)."""
+        self.phases: List[Dict[str, Any]] = []
+        self._wall0 = time.perf_counter() if wall0 is None else wall0
+        self._cpu0 = time.process_time() if cpu0 is None else cpu0
+        self._io0 = io_counters()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[Dict[str, Any]]:
+        """Measure the enclosed block; the yielded dict can carry extra fields (e.g. a child's own perf)."""
+        rec: Dict[str, Any] = {"name": name}
+        r0, w0 = io_counters()
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield rec
+        finally:
+            r1, w1 = io_counters()
+            rec.update(
+                wall_s=round(time.perf_counter() - wall0, 6),
+                cpu_s=round(time.process_time() - cpu0, 6),
+                read_bytes=_delta(r0, r1),
+                write_bytes=_delta(w0, w1),
+            )
+            self.phases.append(rec)
+
+    def add(self, name: str, wall_s: float, **fields: Any) -> None:
+        """Record a phase measured elsewhere (e.g. a child's interpreter startup)."""
+        self.phases.append(dict(fields, name=name, wall_s=round(wall_s, 6)))
+
+    def report(self) -> Dict[str, Any]:
+        r1, w1 = io_counters()
+        return {
+            "phases": list(self.phases),
+            "total": {
+                "wall_s": round(time.perf_counter() - self._wall0, 6),
+                "cpu_s": round(time.process_time() - self._cpu0, 6),
+                "read_bytes": _delta(self._io0[0], r1),
+                "write_bytes": _delta(self._io0[1], w1),
+            },
+            "peak_rss_bytes": peak_rss_bytes(),
+            "children_peak_rss_bytes": peak_rss_bytes(children=True),
+        }
+
+
+@contextlib.contextmanager
+def cprofile_to(path: Optional[Path]) -> Iterator[None]:
+    """Run the block under cProfile and dump pstats to path (no-op when path is None)."""
+    if path is None:
+        yield
+        return
+    import cProfile
+
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        prof.dump_stats(str(path))
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""phio_timeseries.py
+
+Streaming `ts,value` CSV adapter for the core runner (scripts/run_core.py).
+
+Input (the test_data/minimal_timeseries.csv shape):
+  ts,value
+  2026-01-01T00:00:00Z,1.0
+  ...
+
+The file is read in fixed-size binary chunks (--chunk-mb); only the current
+chunk's rows are held in memory, whatever the file size. The `ts` column is
+parsed by a fixed-format ISO-8601 UTC parser (YYYY-MM-DDTHH:MM:SSZ only):
+date and time-of-day fields are validated once per distinct value and then
+served from bounded caches, so a row costs two dict lookups instead of a
+datetime parse.
+
+Summary (structure only, no interpretation):
+- rows, chunks
+- ts    : first/last (ISO-8601), span_s, step_min_s/step_max_s between
+          consecutive rows, gaps (steps longer than step_min_s; null past
+          MAX_STEP_KINDS distinct steps), out_of_order (steps < 0),
+          duplicates (steps == 0)
+- value : min, max, mean, std (population; merged chunk by chunk, Chan et al.)
+
+Usage:
+  python scripts/phio_timeseries.py --input test_data/minimal_timeseries.csv --out timeseries.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import operator
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+SUFFIX = ".csv"
+HEADER = ("ts", "value")
+SUMMARY_FILE = "timeseries.json"
+
+# Bytes read per pass (bounds the rows held at once).
+CHUNK_BYTES = 1 << 20
+# Distinct step sizes tracked for `gaps` (beyond that the series is reported irregular: gaps = null).
+MAX_STEP_KINDS = 1024
+
+_TS_LEN = len("2026-01-01T00:00:00Z")
+# fixed-width fields of a row: date, "T" + time of day + "Z" + separator, value
+_DATE = operator.itemgetter(slice(0, 10))
+_TIME = operator.itemgetter(slice(10, 21))
+_VALUE = operator.itemgetter(slice(21, None))
+
+
+def is_timeseries(path: Path) -> bool:
+    return Path(path).suffix.lower() == SUFFIX
+
+
+def _days_from_civil(y: int, m: int, d: int) -> int:
+    """Days since 1970-01-01 of a proleptic Gregorian date (H. Hinnant's algorithm)."""
+    y -= m <= 2
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * (m + (-3 if m > 2 else 9)) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def _days_in_month(y: int, m: int) -> int:
+    if m == 2:
+        return 29 if y % 4 == 0 and (y % 100 != 0 or y % 400 == 0) else 28
+    return 30 if m in (4, 6, 9, 11) else 31
+
+
+def _date_seconds(raw: bytes) -> int:
+    """b"YYYY-MM-DD" -> epoch seconds at 00:00:00Z."""
+    if len(raw) != 10 or raw[4:5] != b"-" or raw[7:8] != b"-" or not (raw[:4] + raw[5:7] + raw[8:]).isdigit():
+        raise ValueError
+    y, m, d = int(raw[:4]), int(raw[5:7]), int(raw[8:])
+    if not (1 <= m <= 12 and 1 <= d <= _days_in_month(y, m)):
+        raise ValueError
+    return _days_from_civil(y, m, d) * 86400
+
+
+def _time_seconds(raw: bytes) -> int:
+    """b"THH:MM:SS" (optionally followed by b"Z,") -> seconds since midnight."""
+    if raw[9:] not in (b"", b"Z,"):
+        raise ValueError
+    if len(raw) < 9 or raw[:1] != b"T" or raw[3:4] != b":" or raw[6:7] != b":":
+        raise ValueError
+    if not (raw[1:3] + raw[4:6] + raw[7:9]).isdigit():
+        raise ValueError
+    h, mi, s = int(raw[1:3]), int(raw[4:6]), int(raw[7:9])
+    if h > 23 or mi > 59 or s > 59:
+        raise ValueError
+    return h * 3600 + mi * 60 + s
+
+
+class TimestampParser:
+    """Fixed-format `YYYY-MM-DDTHH:MM:SSZ` -> epoch seconds (int), with validated-field caches.
+
+    The caches hold one entry per distinct date and at most two per second of
+    the day (bare and with the trailing "Z," of a CSV row), so they stay
+    bounded on arbitrarily long series.
+    """
+
+    def __init__(self) -> None:
+        self.dates: Dict[bytes, int] = {}
+        self.times: Dict[bytes, int] = {}
+
+    def __call__(self, raw: bytes) -> int:
+        if len(raw) != _TS_LEN or raw[19:] != b"Z":
+            raise ValueError(f"horodatage invalide (YYYY-MM-DDTHH:MM:SSZ attendu): {raw!r}")
+        key = raw[:10]
+        day = self.dates.get(key)
+        if day is None:
+            try:
+                day = self.dates[key] = _date_seconds(key)
+            except ValueError:
+                raise ValueError(f"date invalide: {raw!r}") from None
+        key = raw[10:19]
+        tod = self.times.get(key)
+        if tod is None:
+            try:
+                tod = self.times[key] = _time_seconds(key)
+            except ValueError:
+                raise ValueError(f"heure invalide: {raw!r}") from None
+        return day + tod
+
+    def column(self, keys: List[bytes], cache: Dict[bytes, int], field: Callable[[bytes], int]) -> List[int]:
+        """cache[k] for every key, validating and caching the keys not seen yet (ValueError if invalid)."""
+        try:
+            return list(map(cache.__getitem__, keys))
+        except KeyError:
+            for k in set(keys).difference(cache):
+                cache[k] = field(k)
+            return list(map(cache.__getitem__, keys))
+
+
+def parse_ts(text: str) -> int:
+    """One `YYYY-MM-DDTHH:MM:SSZ` timestamp -> epoch seconds."""
+    return TimestampParser()(text.encode("ascii", "replace"))
+
+
+def format_ts(seconds: int) -> str:
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def iter_line_chunks(path: Path, chunk_bytes: int = CHUNK_BYTES) -> Iterator[Tuple[int, List[bytes]]]:
+    """(line number of the first line, complete lines) per chunk; the header is line 1."""
+    with Path(path).open("rb") as f:
+        carry = b""
+        line_no = 1
+        while True:
+            block = f.read(chunk_bytes)
+            if not block:
+                break
+            lines = (carry + block).split(b"\n")
+            carry = lines.pop()
+            if lines:
+                yield line_no, lines
+                line_no += len(lines)
+        if carry:
+            yield line_no, [carry]
+
+
+class _Acc:
+    """Running totals across chunks."""
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.chunks = 0
+        self.first: Optional[int] = None
+        self.last: Optional[int] = None
+        # step (s) -> count between consecutive rows; None once more than MAX_STEP_KINDS distinct steps
+        self.steps: Optional[Counter] = Counter()
+        self.step_min: Optional[int] = None
+        self.step_max: Optional[int] = None
+        self.out_of_order = 0
+        self.duplicates = 0
+        self.vmin = math.inf
+        self.vmax = -math.inf
+        self.mean = 0.0
+        self.m2 = 0.0
+
+
+def _parse_chunk(lines: List[bytes], parse: TimestampParser) -> Tuple[List[int], List[float]]:
+    """Whole-chunk parse: fixed-width slicing and cache lookups, column by column, no per-row Python code.
+
+    Raises ValueError on any malformed row (including blank lines); _parse_lines then locates it.
+    """
+    days = parse.column(list(map(_DATE, lines)), parse.dates, _date_seconds)
+    tods = parse.column(list(map(_TIME, lines)), parse.times, _time_seconds)
+    vals = list(map(float, map(_VALUE, lines)))
+    return list(map(operator.add, days, tods)), vals
+
+
+def _parse_lines(lines: List[bytes], line_no: int, parse: TimestampParser) -> Tuple[List[int], List[float]]:
+    """Row-by-row parse with line-numbered errors; skips blank lines."""
+    tss: List[int] = []
+    vals: List[float] = []
+    add_ts, add_val = tss.append, vals.append
+    for n, line in enumerate(lines, line_no):
+        ts, sep, val = line.partition(b",")
+        if not sep:
+            if not line.strip():
+                continue
+            raise ValueError(f"ligne {n}: 2 colonnes attendues (ts,value)")
+        try:
+            t = parse(ts)
+        except ValueError as e:
+            raise ValueError(f"ligne {n}: {e}") from None
+        try:
+            v = float(val)
+        except ValueError:
+            raise ValueError(f"ligne {n}: valeur invalide: {val.strip()!r}") from None
+        add_ts(t)
+        add_val(v)
+    return tss, vals
+
+
+def _raise_non_finite(lines: List[bytes], line_no: int) -> None:
+    for n, line in enumerate(lines, line_no):
+        _, sep, val = line.partition(b",")
+        if sep and not math.isfinite(float(val)):
+            raise ValueError(f"ligne {n}: valeur non finie: {val.strip()!r}")
+
+
+def _merge(acc: _Acc, tss: List[int], vals: List[float]) -> None:
+    if not tss:
+        return
+    if acc.first is None:
+        acc.first = tss[0]
+    prev = tss[:-1] if acc.last is None else [acc.last] + tss[:-1]
+    cur = tss[1:] if acc.last is None else tss
+    acc.last = tss[-1]
+    steps = Counter(map(operator.sub, cur, prev))
+    for step, c in steps.items():
+        if step < 0:
+            acc.out_of_order += c
+        elif step == 0:
+            acc.duplicates += c
+        else:
+            acc.step_min = step if acc.step_min is None else min(acc.step_min, step)
+            acc.step_max = step if acc.step_max is None else max(acc.step_max, step)
+            if acc.steps is not None:
+                acc.steps[step] += c
+    if acc.steps is not None and len(acc.steps) > MAX_STEP_KINDS:
+        acc.steps = None
+
+    n_a, n_b = acc.rows, len(vals)
+    mean_b = math.fsum(vals) / n_b
+    dev = list(map(operator.sub, vals, repeat(mean_b, n_b)))
+    m2_b = math.fsum(map(operator.mul, dev, dev))
+    d = mean_b - acc.mean
+    acc.mean += d * n_b / (n_a + n_b)
+    acc.m2 += m2_b + d * d * n_a * n_b / (n_a + n_b)
+    acc.vmin = min(acc.vmin, min(vals))
+    acc.vmax = max(acc.vmax, max(vals))
+    acc.rows += n_b
+
+
+def summarize_csv(path: Path, chunk_bytes: int = CHUNK_BYTES) -> Dict[str, Any]:
+    """Stream a `ts,value` CSV and return its summary (see module docstring)."""
+    path = Path(path)
+    parse = TimestampParser()
+    acc = _Acc()
+    for k, (line_no, lines) in enumerate(iter_line_chunks(path, chunk_bytes)):
+        if k == 0:
+            header = tuple(h.strip() for h in lines[0].decode("utf-8-sig", "replace").split(","))
+            if header != HEADER:
+                raise ValueError(f"en-tête CSV attendu 'ts,value', reçu: {','.join(header)!r}")
+            lines, line_no = lines[1:], line_no + 1
+        try:
+            tss, vals = _parse_chunk(lines, parse) if lines else ([], [])
+        except ValueError:
+            tss, vals = _parse_lines(lines, line_no, parse)
+        if vals and not math.isfinite(math.fsum(vals)):
+            _raise_non_finite(lines, line_no)
+        _merge(acc, tss, vals)
+        acc.chunks += 1
+    if acc.rows == 0:
+        raise ValueError(f"série CSV vide: {path}")
+
+    steps = acc.steps
+    return {
+        "format": "timeseries",
+        "input": str(path),
+        "columns": list(HEADER),
+        "rows": acc.rows,
+        "chunks": acc.chunks,
+        "ts": {
+            "first": format_ts(acc.first),
+            "last": format_ts(acc.last),
+            "span_s": acc.last - acc.first,
+            "step_min_s": acc.step_min,
+            "step_max_s": acc.step_max,
+            "gaps": None if steps is None else sum(c for step, c in steps.items() if step > acc.step_min),
+            "out_of_order": acc.out_of_order,
+            "duplicates": acc.duplicates,
+        },
+        "value": {
+            "min": acc.vmin,
+            "max": acc.vmax,
+            "mean": acc.mean,
+            "std": math.sqrt(acc.m2 / acc.rows),
+        },
+    }
+
+
+def write_summary(summary: Dict[str, Any], outdir: Path) -> Path:
+    outdir.mkdir(parents=True, exist_ok=True)
+    outp = outdir / SUMMARY_FILE
+    outp.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    return outp
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Streaming summary of a ts,value CSV time series.")
+    ap.add_argument("--input", required=True, help="CSV with a 'ts,value' header")
+    ap.add_argument("--out", required=True, help="Output JSON summary")
+    ap.add_argument("--chunk-mb", type=float, default=CHUNK_BYTES / (1 << 20), help="Bytes read per pass (MB)")
+    args = ap.parse_args()
+
+    try:
+        summary = summarize_csv(Path(args.input), max(1, int(args.chunk_mb * (1 << 20))))
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"[phio_timeseries] {e}\n")
+        return 2
+
+    outp = Path(args.out)
+    outp.parent.mkdir(parents=True, exist_ok=True)
+    outp.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
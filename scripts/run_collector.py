@@ -8,12 +8,14 @@ Collector module runner (data acquisition only).
 Rules:
 - No DD/DD-R/E calculations here
 - No semantic judgement
-- Write a collector_manifest.json with hashes + provenance
+- Write a collector_manifest.json with hashes + provenance (and a `perf`
+  section: per-phase wall/CPU time, bytes read/written, peak RSS)
 
 Profile format: TOML (stdlib tomllib on Python >=3.11)
 
 Usage:
   python scripts/run_collector.py --profile collectors/local_copy_example.toml
+  python scripts/run_collector.py --profile collectors/local_copy_example.toml --cprofile
 """
 
 from __future__ import annotations
@@ -28,6 +30,11 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+try:
+    from scripts.phio_perf import PerfRecorder, cprofile_to
+except ImportError:  # run as `python scripts/run_collector.py` without the repo root on sys.path
+    from phio_perf import PerfRecorder, cprofile_to  # type: ignore[no-redef]
+
 
 def _utc_run_id() -> str:
     return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
@@ -79,7 +86,10 @@ def _parse_profile(profile_path: Path) -> CollectorProfile:
     return CollectorProfile(kind=kind, source=str(source), out_base=out_base, tag=tag)
 
 
-def _collector_local_copy(repo_root: Path, prof: CollectorProfile, run_id: str) -> Path:
+def _collector_local_copy(
+    repo_root: Path, prof: CollectorProfile, run_id: str, perf: Optional[PerfRecorder] = None
+) -> Path:
+    perf = perf if perf is not None else PerfRecorder()
     src = (repo_root / prof.source).resolve() if not os.path.isabs(prof.source) else Path(prof.source)
     out_base = (repo_root / prof.out_base).resolve() if not os.path.isabs(prof.out_base) else Path(prof.out_base)
     outdir = out_base / run_id
@@ -89,7 +99,10 @@ def _collector_local_copy(repo_root: Path, prof: CollectorProfile, run_id: str)
         raise SystemExit(f"Collector source not found: {src}")
 
     dst = outdir / src.name
-    dst.write_bytes(src.read_bytes())
+    with perf.phase("copy"):
+        dst.write_bytes(src.read_bytes())
+    with perf.phase("hash"):
+        sha256 = _sha256_file(dst)
 
     manifest = {
         "run_id": run_id,
@@ -97,9 +110,10 @@ def _collector_local_copy(repo_root: Path, prof: CollectorProfile, run_id: str)
         "tag": prof.tag,
         "source": str(src),
         "output": str(dst),
-        "sha256": _sha256_file(dst),
+        "sha256": sha256,
         "utc": datetime.now(timezone.utc).isoformat(),
         "profile": asdict(prof),
+        "perf": perf.report(),
     }
     (outdir / "collector_manifest.json").write_text(
         json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8"
@@ -112,14 +126,21 @@ def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--profile", required=True, help="TOML collector profile")
     ap.add_argument("--run-id", default=None, help="Override run id (default: UTC timestamp)")
+    ap.add_argument(
+        "--cprofile", action="store_true", help="Dump a cProfile pstats file to <out_base>/<run_id>/run_collector.pstats"
+    )
     args = ap.parse_args()
 
-    repo_root = Path(__file__).resolve().parents[1]
-    profile_path = (repo_root / args.profile).resolve() if not os.path.isabs(args.profile) else Path(args.profile)
-    prof = _parse_profile(profile_path)
+    perf = PerfRecorder()
+    with perf.phase("profile"):
+        repo_root = Path(__file__).resolve().parents[1]
+        profile_path = (repo_root / args.profile).resolve() if not os.path.isabs(args.profile) else Path(args.profile)
+        prof = _parse_profile(profile_path)
     run_id = args.run_id or _utc_run_id()
 
-    _ = _collector_local_copy(repo_root, prof, run_id)
+    out_base = (repo_root / prof.out_base).resolve() if not os.path.isabs(prof.out_base) else Path(prof.out_base)
+    with cprofile_to(out_base / run_id / "run_collector.pstats" if args.cprofile else None):
+        _ = _collector_local_copy(repo_root, prof, run_id, perf)
     print(f"[run_collector] ok: {run_id}")
     return 0
 
@@ -15,21 +15,75 @@ so you can run stable, reproducible jobs from a profile file.
 
 Profile format: TOML (stdlib tomllib on Python >=3.11)
 
+Execution modes:
+- subprocess (default): `python <instrument> score ...`, any instrument CLI
+- inproc (--inproc or [core].mode = "inproc"): the instrument module is
+  imported once and its `main(argv)` called directly; stdout/stderr are
+  captured into the run manifest. Instruments without such an entry point
+  fall back to subprocess.
+- server (--server): a warm `instrument serve` instance
+
+Fan-out: [core].inputs (paths and/or glob patterns) scores every input under
+one run_id, one subdirectory per input, on a pool of [core].jobs worker
+processes. The aggregated run_manifest.json lists the inputs in expansion
+order, whatever the completion order.
+
+Incremental re-runs: every successful input is recorded in
+<out_base>/.fingerprints.json under a fingerprint of (input sha256 and file
+name, profile scoring settings, instrument sources sha256, score args).
+A later run with the same fingerprint links the prior outputs into its own
+outdir (symlinks, copies where links are unavailable) instead of scoring
+again; --force always rescores.
+
+Performance: manifests carry a `perf` section (scripts/phio_perf.py): per
+phase wall/CPU time, bytes read/written and peak RSS of run_core, plus the
+instrument's own phases (reported through $PHIO_PERF_OUT) and the startup
+time derived from them. --cprofile dumps <outdir>/run_core.pstats.
+
+Time series: a `ts,value` CSV input (e.g. test_data/minimal_timeseries.csv)
+is not passed to the instrument, which reads JSON only; it is streamed
+through scripts/phio_timeseries.py in bounded chunks and summarized to
+<outdir>/timeseries.json (execution mode "timeseries").
+
 Usage:
   python scripts/run_core.py --profile profiles/core_example.toml
+  python scripts/run_core.py --profile profiles/core_example.toml --force
+  python scripts/run_core.py --profile profiles/core_example.toml --inproc --write-run-manifest
+  python scripts/run_core.py --profile profiles/nightly.toml --jobs 8
 """
 
 from __future__ import annotations
 
 import argparse
+import ast
+import contextlib
+import glob
+import hashlib
+import importlib.util
+import inspect
+import io
 import json
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from scripts import phio_timeseries
+    from scripts.phio_perf import PerfRecorder, cprofile_to
+except ImportError:  # run as `python scripts/run_core.py` without the repo root on sys.path
+    import phio_timeseries  # type: ignore[no-redef]
+    from phio_perf import PerfRecorder, cprofile_to  # type: ignore[no-redef]
+
+MODES = ("subprocess", "inproc")
 
 
 def _utc_run_id() -> str:
@@ -52,6 +106,17 @@ class CoreProfile:
     input: str
     out_base: str
     extra_args: List[str]
+    sweep: Tuple[str, ...] = ()
+    mode: str = "subprocess"
+    inputs: Tuple[str, ...] = ()
+    jobs: int = 1
+
+    def score_args(self) -> List[str]:
+        """Arguments appended after `score --input ... --outdir ...`."""
+        args = list(self.extra_args)
+        if self.sweep:
+            args += ["--sweep", "--sweep-modes", ",".join(self.sweep)]
+        return args
 
 
 def _parse_profile(profile_path: Path) -> CoreProfile:
@@ -64,29 +129,447 @@ def _parse_profile(profile_path: Path) -> CoreProfile:
     input_path = core.get("input")
     out_base = str(core.get("out_base", "./runs"))
     extra_args = core.get("extra_args", [])
-
-    if not input_path:
-        raise SystemExit(f"Invalid profile: [core].input is required: {profile_path}")
+    # sweep = true (median/bottleneck) or a list of aggregation modes -> score --sweep
+    sweep = core.get("sweep", False)
+    mode = core.get("mode", "subprocess")
+    # inputs = ["data/a.json", "data/batch/*.json"] -> one scored subdirectory per input
+    inputs = core.get("inputs", [])
+    jobs = core.get("jobs", 1)
+
+    if not input_path and not inputs:
+        raise SystemExit(f"Invalid profile: [core].input or [core].inputs is required: {profile_path}")
+    if not isinstance(inputs, list) or not all(isinstance(x, str) and x for x in inputs):
+        raise SystemExit(f"Invalid profile: [core].inputs must be a list of paths or glob patterns: {profile_path}")
+    if isinstance(jobs, bool) or not isinstance(jobs, int) or jobs < 1:
+        raise SystemExit(f"Invalid profile: [core].jobs must be an integer >= 1: {profile_path}")
     if not isinstance(extra_args, list) or not all(isinstance(x, str) for x in extra_args):
         raise SystemExit(f"Invalid profile: [core].extra_args must be a list of strings: {profile_path}")
+    if sweep is True:
+        sweep = ["median", "bottleneck"]
+    elif sweep is False:
+        sweep = []
+    if not isinstance(sweep, list) or not all(isinstance(x, str) and x for x in sweep):
+        raise SystemExit(f"Invalid profile: [core].sweep must be a boolean or a list of modes: {profile_path}")
+    if mode not in MODES:
+        raise SystemExit(f"Invalid profile: [core].mode must be one of {', '.join(MODES)}: {profile_path}")
 
     return CoreProfile(
         instrument=instrument,
-        input=str(input_path),
+        input=str(input_path or ""),
         out_base=out_base,
         extra_args=list(extra_args),
+        sweep=tuple(sweep),
+        mode=mode,
+        inputs=tuple(inputs),
+        jobs=jobs,
     )
 
 
-def _run_instrument(instrument: Path, input_path: Path, outdir: Path, extra_args: List[str]) -> int:
+def _run_instrument(
+    instrument: Path, input_path: Path, outdir: Path, extra_args: List[str], env: Optional[Dict[str, str]] = None
+) -> int:
     cmd = [sys.executable, str(instrument), "score", "--input", str(input_path), "--outdir", str(outdir)]
     cmd.extend(extra_args)
 
     print("[run_core] cmd:", " ".join(cmd))
-    cp = subprocess.run(cmd, text=True, capture_output=False, check=False)
+    cp = subprocess.run(cmd, text=True, capture_output=False, check=False, env=env)
     return cp.returncode
 
 
+@contextlib.contextmanager
+def _sys_path(paths: List[str]) -> Iterator[None]:
+    """Prepend paths to sys.path for the block only."""
+    saved = list(sys.path)
+    sys.path[:0] = [p for p in paths if p not in sys.path]
+    try:
+        yield
+    finally:
+        sys.path[:] = saved
+
+
+# instrument path -> its main(argv), or None when it cannot run in-process
+_INPROC_MAINS: Dict[Path, Optional[Callable[[List[str]], int]]] = {}
+
+
+def _load_inproc_main(instrument: Path) -> Optional[Callable[[List[str]], int]]:
+    """Import the instrument module once and return its `main(argv)` entry point (None if unusable)."""
+    key = instrument.resolve()
+    if key in _INPROC_MAINS:
+        return _INPROC_MAINS[key]
+    entry = None
+    # the repo instrument and its sibling modules import `scripts.*`, some of them lazily:
+    # the paths are added while importing and while main runs, never left behind
+    paths = [str(Path(__file__).resolve().parents[1]), str(key.parent)]
+    try:
+        with _sys_path(paths):
+            spec = importlib.util.spec_from_file_location(f"_phio_inproc_{len(_INPROC_MAINS)}", key)
+            mod = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(mod)
+        # the repo-root shim re-exports main as _main
+        fn = getattr(mod, "main", None) or getattr(mod, "_main", None)
+        if callable(fn) and inspect.signature(fn).parameters:
+
+            def entry(argv: List[str], _fn: Callable[[List[str]], int] = fn) -> int:
+                with _sys_path(paths):
+                    return _fn(argv)
+
+    except Exception as e:
+        print(f"[run_core] inproc import failed ({type(e).__name__}: {e})")
+    _INPROC_MAINS[key] = entry
+    return entry
+
+
+def _run_instrument_inproc(
+    main_fn: Callable[[List[str]], int], input_path: Path, outdir: Path, extra_args: List[str]
+) -> Tuple[int, str, str]:
+    """Call the instrument's main(argv) in this process; returns (returncode, stdout, stderr)."""
+    argv = ["score", "--input", str(input_path), "--outdir", str(outdir)] + list(extra_args)
+    print("[run_core] inproc argv:", " ".join(argv))
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            rc = main_fn(argv)
+        except SystemExit as e:  # argparse errors, sys.exit() in the instrument
+            if isinstance(e.code, str):
+                err.write(e.code + "\n")
+            rc = e.code if isinstance(e.code, int) or e.code is None else 1
+        except Exception:
+            traceback.print_exc()
+            rc = 2
+    return int(rc or 0), out.getvalue(), err.getvalue()
+
+
+def run_scoring(
+    mode: str, instrument: Path, input_path: Path, outdir: Path, extra_args: List[str], server: Optional[str] = None
+) -> Tuple[int, Dict[str, object]]:
+    """Run one `score` in the requested mode; returns (returncode, manifest fields).
+
+    inproc falls back to subprocess when the instrument has no importable main(argv).
+    A `ts,value` CSV input goes to the time-series adapter whatever the mode.
+    """
+    if phio_timeseries.is_timeseries(input_path):
+        return run_timeseries(input_path, outdir)
+    if server:
+        return _run_instrument_via_server(server, input_path, outdir, extra_args)
+    # the repo instrument reports its own phases to $PHIO_PERF_OUT; other instruments ignore it
+    fd, perf_out = tempfile.mkstemp(prefix="phio_perf_", suffix=".json")
+    os.close(fd)
+    t0 = time.perf_counter()
+    try:
+        execution: Dict[str, Any]
+        main_fn = _load_inproc_main(instrument) if mode == "inproc" else None
+        if mode == "inproc" and main_fn is None:
+            print(f"[run_core] no main(argv) in {instrument}: falling back to subprocess")
+        if main_fn is not None:
+            with _environ(PHIO_PERF_OUT=perf_out):
+                rc, out, err = _run_instrument_inproc(main_fn, input_path, outdir, extra_args)
+            sys.stdout.write(out)
+            sys.stderr.write(err)
+            execution = {"mode": "inproc", "stdout": out, "stderr": err}
+        else:
+            env = dict(os.environ, PHIO_PERF_OUT=perf_out)
+            rc, execution = _run_instrument(instrument, input_path, outdir, extra_args, env=env), {"mode": "subprocess"}
+        execution["perf"] = _instrument_perf(Path(perf_out), time.perf_counter() - t0)
+    finally:
+        os.unlink(perf_out)
+    return rc, execution
+
+
+def run_timeseries(input_path: Path, outdir: Path) -> Tuple[int, Dict[str, Any]]:
+    """Stream a `ts,value` CSV into <outdir>/timeseries.json; returns (returncode, manifest fields)."""
+    print(f"[run_core] timeseries: {input_path}")
+    t0 = time.perf_counter()
+    try:
+        summary = phio_timeseries.summarize_csv(input_path)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"[run_core] {e}\n")
+        return 2, {"mode": "timeseries", "error": str(e)}
+    outp = phio_timeseries.write_summary(summary, outdir)
+    wall_s = time.perf_counter() - t0
+    size = input_path.stat().st_size
+    return 0, {
+        "mode": "timeseries",
+        "output": str(outp),
+        "perf": {
+            "wall_s": round(wall_s, 6),
+            "rows": summary["rows"],
+            "read_bytes": size,
+            "mb_per_s": round(size / 1e6 / max(wall_s, 1e-9), 3),
+        },
+    }
+
+
+@contextlib.contextmanager
+def _environ(**values: str) -> Iterator[None]:
+    saved = {k: os.environ.get(k) for k in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+def _instrument_perf(perf_out: Path, wall_s: float) -> Dict[str, Any]:
+    """Call wall time, the instrument's own perf report (if it wrote one) and the startup it implies."""
+    try:
+        report = json.loads(perf_out.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        report = None
+    perf: Dict[str, Any] = {"wall_s": round(wall_s, 6), "instrument": report}
+    if report:
+        # interpreter startup + imports + anything outside the instrument's main()
+        perf["startup_s"] = round(max(0.0, wall_s - report["total"]["wall_s"]), 6)
+    return perf
+
+
+def _phase(perf: Optional[PerfRecorder], name: str) -> Any:
+    return perf.phase(name) if perf is not None else contextlib.nullcontext({})
+
+
+FINGERPRINTS_FILE = ".fingerprints.json"
+FINGERPRINTS_VERSION = 1
+# [core] keys that select inputs or scheduling, not what a score produces
+_UNSCORED_KEYS = ("input", "inputs", "out_base", "jobs", "mode")
+
+
+def _sha256_file(p: Path) -> str:
+    h = hashlib.sha256()
+    with p.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _sha256_json(obj: Any) -> str:
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def profile_digest(prof: CoreProfile) -> str:
+    """sha256 of the profile settings that shape the outputs (input selection and scheduling excluded)."""
+    return _sha256_json({k: v for k, v in asdict(prof).items() if k not in _UNSCORED_KEYS})
+
+
+def _local_imports(path: Path, roots: List[Path]) -> List[Path]:
+    """Source files under roots that a Python file imports (any scope, so lazy imports count).
+
+    Besides import statements, calls with a literal module name count:
+    importlib.import_module("x") and the instrument's _sibling("x") (scripts.x or x).
+    """
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+    except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+        return []
+    names: List[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names += [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+            names += [f"{node.module}.{a.name}" for a in node.names]
+        elif isinstance(node, ast.Call) and node.args:
+            func = node.func
+            fname = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+            arg = node.args[0]
+            if fname in ("import_module", "_sibling") and isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                names.append(arg.value)
+                if fname == "_sibling":
+                    names.append(f"scripts.{arg.value}")
+    found: List[Path] = []
+    for name in names:
+        rel = Path(*name.split("."))
+        for root in roots:
+            for cand in (root / rel.with_suffix(".py"), root / rel / "__init__.py"):
+                cand = cand.resolve()
+                if cand.is_file() and cand not in found:
+                    found.append(cand)
+    return found
+
+
+def instrument_digest(instrument: Path, repo_root: Path) -> str:
+    """sha256 over the instrument file and the local modules it imports, transitively."""
+    roots = [instrument.parent.resolve(), repo_root.resolve()]
+    seen = [instrument.resolve()]
+    i = 0
+    while i < len(seen):
+        if seen[i].suffix == ".py":
+            seen += [p for p in _local_imports(seen[i], roots) if p not in seen]
+        i += 1
+    return _sha256_json(sorted((p.name, _sha256_file(p)) for p in seen))
+
+
+def input_fingerprint(input_path: Path, profile_sha: str, instrument_sha: str, score_args: List[str]) -> Dict[str, Any]:
+    fp = {
+        "input_sha256": _sha256_file(input_path),
+        "input_name": input_path.name,
+        "profile_sha256": profile_sha,
+        "instrument_sha256": instrument_sha,
+        "score_args": list(score_args),
+    }
+    if phio_timeseries.is_timeseries(input_path):
+        # summarized by the adapter rather than the instrument
+        fp["adapter_sha256"] = _sha256_file(Path(phio_timeseries.__file__))
+    fp["fingerprint"] = _sha256_json(fp)
+    return fp
+
+
+class FingerprintStore:
+    """<out_base>/.fingerprints.json: fingerprint -> outputs of the run that produced them."""
+
+    def __init__(self, out_base: Path) -> None:
+        self.path = out_base / FINGERPRINTS_FILE
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == FINGERPRINTS_VERSION:
+                self.entries = data["entries"]
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass
+
+    def lookup(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Prior entry whose outputs are still on disk, else None."""
+        entry = self.entries.get(fingerprint)
+        if entry is None or not _output_files(Path(entry["outdir"])):
+            return None
+        return entry
+
+    def record(self, fingerprint: str, outdir: Path, run_id: str, input_path: Path) -> None:
+        self.entries[fingerprint] = {"outdir": str(outdir), "run_id": run_id, "input": str(input_path)}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + f".tmp{os.getpid()}")
+        data = {"version": FINGERPRINTS_VERSION, "entries": self.entries}
+        tmp.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+# Scoring outputs a run directory may hold (instrument `score`, time-series summary). Only
+# these are reused: never the runner's own artifacts (run_manifest.json, *.pstats, perf.json).
+_REUSABLE_OUTPUTS = ("results.json", "results.ndjson", "sweep.json", phio_timeseries.SUMMARY_FILE)
+
+
+def _output_files(outdir: Path) -> List[Path]:
+    return sorted(p for p in (outdir / name for name in _REUSABLE_OUTPUTS) if p.is_file())
+
+
+def reuse_outputs(store: FingerprintStore, fp: Dict[str, Any], outdir: Path) -> Optional[Dict[str, Any]]:
+    """Link the outputs recorded for this fingerprint into outdir; execution fields, or None if stale."""
+    prior = store.lookup(fp["fingerprint"])
+    if prior is None:
+        return None
+    src = Path(prior["outdir"])
+    _ensure_dir(outdir)
+    if src.resolve() != outdir.resolve():
+        for f in _output_files(src):
+            dst = outdir / f.name
+            if dst.is_symlink() or dst.exists():
+                continue
+            try:
+                os.symlink(f.resolve(), dst)
+            except OSError:
+                shutil.copy2(f, dst)
+    return {"mode": "reused", "reused_from": prior["outdir"], "reused_run_id": prior["run_id"]}
+
+
+def _resolve(repo_root: Path, p: str) -> Path:
+    return (repo_root / p).resolve() if not os.path.isabs(p) else Path(p)
+
+
+def expand_inputs(repo_root: Path, prof: CoreProfile) -> List[Path]:
+    """[core].input then [core].inputs, globs expanded (sorted), duplicates dropped, in that order."""
+    out: List[Path] = []
+    for entry in ([prof.input] if prof.input else []) + list(prof.inputs):
+        if glob.has_magic(entry):
+            matches = sorted(Path(m).resolve() for m in glob.glob(str(_resolve(repo_root, entry)), recursive=True))
+            if not matches:
+                raise SystemExit(f"No input matches pattern: {entry}")
+        else:
+            matches = [_resolve(repo_root, entry)]
+        for m in matches:
+            if m not in out:
+                out.append(m)
+    return out
+
+
+def _input_subdirs(inputs: List[Path]) -> List[str]:
+    """One subdirectory name per input: the file stem, suffixed -2, -3... on collisions."""
+    names: List[str] = []
+    seen: Dict[str, int] = {}
+    for p in inputs:
+        n = seen[p.stem] = seen.get(p.stem, 0) + 1
+        names.append(p.stem if n == 1 else f"{p.stem}-{n}")
+    return names
+
+
+def _score_task(task: Tuple[str, Path, Path, Path, List[str], Optional[str]]) -> Dict[str, Any]:
+    """One fan-out input (runs in a pool worker): score it and time it."""
+    mode, instrument, input_path, outdir, extra_args, server = task
+    _ensure_dir(outdir)
+    t0 = time.perf_counter()
+    if input_path.exists():
+        rc, execution = run_scoring(mode, instrument, input_path, outdir, extra_args, server=server)
+    else:
+        rc, execution = 2, {"mode": mode, "error": f"Input not found: {input_path}"}
+    return {
+        "input": str(input_path),
+        "outdir": str(outdir),
+        "returncode": rc,
+        "duration_s": round(time.perf_counter() - t0, 6),
+        "execution": execution,
+    }
+
+
+def run_fanout(tasks: List[Tuple[str, Path, Path, Path, List[str], Optional[str]]], jobs: int) -> List[Dict[str, Any]]:
+    """Score every task on up to `jobs` worker processes; results in task order."""
+    if jobs <= 1 or len(tasks) <= 1:
+        return [_score_task(t) for t in tasks]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+        # map() yields in submission order, so the manifest never depends on completion order
+        return list(pool.map(_score_task, tasks))
+
+
+def _run_instrument_via_server(
+    socket_path: str, input_path: Path, outdir: Path, extra_args: List[str]
+) -> Tuple[int, Dict[str, Any]]:
+    """Same call as _run_instrument, served by a warm `serve` instance (no interpreter startup).
+
+    A server that cannot be reached fails this input only (rc 2, error in the manifest fields).
+    """
+    try:
+        from scripts.phi_otimes_o_instrument_v0_1 import ScoringClient
+    except ImportError:  # run as `python scripts/run_core.py` without the repo root on sys.path
+        from phi_otimes_o_instrument_v0_1 import ScoringClient  # type: ignore[no-redef]
+
+    argv = ["score", "--input", str(input_path), "--outdir", str(outdir)] + list(extra_args)
+    print(f"[run_core] server={socket_path} argv:", " ".join(argv))
+    try:
+        with ScoringClient(socket_path) as client:
+            rc, out, err = client.run_score_argv(argv)
+    except OSError as e:  # ConnectionError, socket.timeout, no socket file
+        msg = f"Scoring server unavailable ({socket_path}): {type(e).__name__}: {e}"
+        print(f"[run_core] {msg}", file=sys.stderr)
+        return 2, {"mode": "server", "error": msg}
+    if out:
+        sys.stdout.write(out)
+    if err:
+        sys.stderr.write(err)
+    return rc, {"mode": "server"}
+
+
+def _jobs_arg(value: str) -> int:
+    try:
+        jobs = int(value)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        raise argparse.ArgumentTypeError(f"must be an integer >= 1: {value}")
+    return jobs
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--profile", required=True, help="TOML profile file")
@@ -94,17 +577,31 @@ def main() -> int:
     ap.add_argument(
         "--write-run-manifest",
         action="store_true",
-        help="Write a tiny run manifest next to outputs (structure-only).",
+        help="Write a tiny run manifest next to outputs (structure-only; always written for [core].inputs).",
+    )
+    ap.add_argument(
+        "--server",
+        default=os.environ.get("PHIO_SERVER_SOCKET") or None,
+        help="Score through a running `instrument serve --socket PATH` (default: $PHIO_SERVER_SOCKET)",
+    )
+    ap.add_argument(
+        "--inproc",
+        action="store_true",
+        help="Import the instrument and call its main(argv) in this process ([core].mode = \"inproc\")",
     )
+    ap.add_argument("--jobs", type=_jobs_arg, default=None, help="Worker processes for [core].inputs (default: [core].jobs)")
+    ap.add_argument("--force", action="store_true", help="Rescore even when the input fingerprint is up to date")
+    ap.add_argument("--cprofile", action="store_true", help="Dump a cProfile pstats file to <outdir>/run_core.pstats")
     args = ap.parse_args()
 
-    repo_root = Path(__file__).resolve().parents[1]
-    profile_path = (repo_root / args.profile).resolve() if not os.path.isabs(args.profile) else Path(args.profile)
-    prof = _parse_profile(profile_path)
+    perf = PerfRecorder()
+    with perf.phase("profile"):
+        repo_root = Path(__file__).resolve().parents[1]
+        profile_path = (repo_root / args.profile).resolve() if not os.path.isabs(args.profile) else Path(args.profile)
+        prof = _parse_profile(profile_path)
 
-    instrument = (repo_root / prof.instrument).resolve() if not os.path.isabs(prof.instrument) else Path(prof.instrument)
-    input_path = (repo_root / prof.input).resolve() if not os.path.isabs(prof.input) else Path(prof.input)
-    out_base = (repo_root / prof.out_base).resolve() if not os.path.isabs(prof.out_base) else Path(prof.out_base)
+        instrument = _resolve(repo_root, prof.instrument)
+        out_base = _resolve(repo_root, prof.out_base)
 
     run_id = args.run_id or _utc_run_id()
     outdir = out_base / run_id
@@ -112,10 +609,32 @@ def main() -> int:
 
     if not instrument.exists():
         raise SystemExit(f"Instrument not found: {instrument}")
+
+    with cprofile_to(outdir / "run_core.pstats" if args.cprofile else None):
+        return _main_run(args, profile_path, prof, instrument, outdir, run_id, repo_root, perf)
+
+
+def _main_run(
+    args: argparse.Namespace,
+    profile_path: Path,
+    prof: CoreProfile,
+    instrument: Path,
+    outdir: Path,
+    run_id: str,
+    repo_root: Path,
+    perf: PerfRecorder,
+) -> int:
+    mode = "inproc" if args.inproc else prof.mode
+    if prof.inputs:
+        return _main_fanout(args, profile_path, prof, instrument, outdir, run_id, mode, repo_root, perf)
+
+    input_path = _resolve(repo_root, prof.input)
     if not input_path.exists():
         raise SystemExit(f"Input not found: {input_path}")
 
-    rc = _run_instrument(instrument, input_path, outdir, prof.extra_args)
+    rc, execution, fp = score_incremental(
+        mode, instrument, input_path, outdir, prof, run_id, repo_root, force=args.force, server=args.server, perf=perf
+    )
 
     if args.write_run_manifest:
         manifest = {
@@ -124,6 +643,9 @@ def main() -> int:
             "core": asdict(prof),
             "outdir": str(outdir),
             "returncode": rc,
+            "execution": execution,
+            "fingerprint": fp,
+            "perf": perf.report(),
             "utc": datetime.now(timezone.utc).isoformat(),
         }
         (outdir / "run_manifest.json").write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
@@ -131,5 +653,114 @@ def main() -> int:
     return rc
 
 
+def score_incremental(
+    mode: str,
+    instrument: Path,
+    input_path: Path,
+    outdir: Path,
+    prof: CoreProfile,
+    run_id: str,
+    repo_root: Path,
+    force: bool = False,
+    server: Optional[str] = None,
+    perf: Optional[PerfRecorder] = None,
+) -> Tuple[int, Dict[str, Any], Dict[str, Any]]:
+    """run_scoring() unless the input fingerprint is up to date; returns (returncode, execution, fingerprint)."""
+    with _phase(perf, "fingerprint"):
+        store = FingerprintStore(outdir.parent)
+        fp = input_fingerprint(
+            input_path, profile_digest(prof), instrument_digest(instrument, repo_root), prof.score_args()
+        )
+        reused = None if force else reuse_outputs(store, fp, outdir)
+    if reused is not None:
+        print(f"[run_core] up to date: {input_path} -> {reused['reused_from']}")
+        return 0, reused, fp
+    with _phase(perf, "score"):
+        rc, execution = run_scoring(mode, instrument, input_path, outdir, prof.score_args(), server=server)
+    if rc == 0:
+        store.record(fp["fingerprint"], outdir, run_id, input_path)
+        store.save()
+    return rc, execution, fp
+
+
+def _main_fanout(
+    args: argparse.Namespace,
+    profile_path: Path,
+    prof: CoreProfile,
+    instrument: Path,
+    outdir: Path,
+    run_id: str,
+    mode: str,
+    repo_root: Path,
+    perf: Optional[PerfRecorder] = None,
+) -> int:
+    """[core].inputs: every input under outdir/<subdir>, aggregated run_manifest.json (always written)."""
+    inputs = expand_inputs(repo_root, prof)
+    jobs = args.jobs or prof.jobs
+    tasks = [
+        (mode, instrument, p, outdir / name, prof.score_args(), args.server)
+        for p, name in zip(inputs, _input_subdirs(inputs))
+    ]
+    t0 = time.perf_counter()
+
+    # up-to-date inputs are linked from their prior outputs, the rest go to the pool
+    fps: List[Optional[Dict[str, Any]]] = []
+    results: List[Optional[Dict[str, Any]]] = []
+    with _phase(perf, "fingerprint"):
+        store = FingerprintStore(outdir.parent)
+        profile_sha, instrument_sha = profile_digest(prof), instrument_digest(instrument, repo_root)
+        for task in tasks:
+            input_path, task_outdir = task[2], task[3]
+            fp = input_fingerprint(input_path, profile_sha, instrument_sha, task[4]) if input_path.exists() else None
+            reused = None if args.force or fp is None else reuse_outputs(store, fp, task_outdir)
+            fps.append(fp)
+            results.append(
+                None
+                if reused is None
+                else {
+                    "input": str(input_path),
+                    "outdir": str(task_outdir),
+                    "returncode": 0,
+                    "duration_s": 0.0,
+                    "execution": reused,
+                }
+            )
+    pending = [i for i, r in enumerate(results) if r is None]
+    print(
+        f"[run_core] fan-out: {len(tasks)} input(s), {len(tasks) - len(pending)} up to date, jobs={jobs}, run_id={run_id}"
+    )
+    with _phase(perf, "score"):
+        scored = run_fanout([tasks[i] for i in pending], jobs)
+    for i, r in zip(pending, scored):
+        results[i] = r
+        if r["returncode"] == 0 and fps[i] is not None:
+            store.record(fps[i]["fingerprint"], Path(r["outdir"]), run_id, Path(r["input"]))
+    if pending:
+        store.save()
+    for r, fp in zip(results, fps):
+        r["fingerprint"] = fp
+
+    failed = [r for r in results if r["returncode"] != 0]
+    rc = failed[0]["returncode"] if failed else 0
+
+    manifest = {
+        "run_id": run_id,
+        "profile": str(profile_path),
+        "core": asdict(prof),
+        "outdir": str(outdir),
+        "returncode": rc,
+        "jobs": jobs,
+        "mode": mode,
+        "duration_s": round(time.perf_counter() - t0, 6),
+        "counts": {"inputs": len(results), "ok": len(results) - len(failed), "failed": len(failed)},
+        "inputs": results,
+        "perf": perf.report() if perf is not None else None,
+        "utc": datetime.now(timezone.utc).isoformat(),
+    }
+    (outdir / "run_manifest.json").write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    print(f"[run_core] done: ok={manifest['counts']['ok']} failed={len(failed)} manifest={outdir / 'run_manifest.json'}")
+    return rc
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
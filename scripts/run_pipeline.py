@@ -9,6 +9,8 @@ Minimal orchestrator:
 
 Kept intentionally simple to preserve PhiO traceability:
 collector and core communicate only via files.
+The core step is skipped (prior outputs linked) when the collected dataset,
+core profile and instrument match an earlier successful run; --force rescores.
 
 Usage:
   python scripts/run_pipeline.py --profile profiles/pipeline_example.toml
@@ -36,6 +38,7 @@ def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--profile", required=True, help="TOML pipeline profile")
     ap.add_argument("--run-id", default=None, help="Shared run id for collector+core")
+    ap.add_argument("--force", action="store_true", help="Rescore even when the core input fingerprint is up to date")
     args = ap.parse_args()
 
     repo_root = Path(__file__).resolve().parents[1]
@@ -64,7 +67,7 @@ def main() -> int:
     collected_dataset = _collector_local_copy(repo_root, cprof, run_id)
 
     # 2) core, but override input to the collected dataset
-    from scripts.run_core import _parse_profile as _parse_core, _run_instrument, _ensure_dir
+    from scripts.run_core import _parse_profile as _parse_core, _ensure_dir, score_incremental
 
     core_prof_path = (repo_root / str(core_profile)).resolve()
     kprof = _parse_core(core_prof_path)
@@ -78,7 +81,9 @@ def main() -> int:
     outdir = out_base / run_id
     _ensure_dir(outdir)
 
-    rc = _run_instrument(instrument, collected_dataset, outdir, kprof.extra_args)
+    rc, _, _ = score_incremental(
+        kprof.mode, instrument, collected_dataset, outdir, kprof, run_id, repo_root, force=args.force
+    )
     print(f"[run_pipeline] done: run_id={run_id} rc={rc}")
     return rc
 
@@ -15,6 +15,15 @@ def _run(cmd, cwd=None) -> subprocess.CompletedProcess:
     return subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8", cwd=cwd)
 
 
+def _run_via_server(socket_path: str, cmd) -> subprocess.CompletedProcess:
+    """`score` servi par un instrument chaud (PHIO_SERVER_SOCKET), même contrat que le CLI."""
+    from scripts.phi_otimes_o_instrument_v0_1 import ScoringClient
+
+    with ScoringClient(socket_path) as client:
+        rc, out, err = client.run_score_argv(cmd[2:])
+    return subprocess.CompletedProcess(cmd, rc, out, err)
+
+
 @dataclass
 class CLIResult:
     """Résultat CLI compatible avec deux patterns de tests.
@@ -44,6 +53,14 @@ class CLIResult:
         yield self.outdir
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _isolated_cache_dir(tmp_path_factory):
+    """Le cache de résultats de l'instrument ne doit pas fuir hors de la session de tests."""
+    if "PHIO_CACHE_DIR" not in os.environ:
+        os.environ["PHIO_CACHE_DIR"] = str(tmp_path_factory.mktemp("phio_cache"))
+    yield
+
+
 @pytest.fixture(scope="session")
 def instrument_path():
     """
@@ -70,6 +87,8 @@ def run_cli(tmp_path, instrument_path):
     - Si input_json est fourni, on injecte automatiquement --input <tmpfile>
       (ou on remplace l'argument existant de --input).
     - Pour la commande score, on force --outdir si absent.
+    - Si PHIO_SERVER_SOCKET est défini, `score` passe par le serveur de scoring
+      (instrument `serve`) au lieu d'un sous-processus.
     - Retour: CLIResult (proxy CompletedProcess + outdir, itérable).
     """
 
@@ -109,7 +128,11 @@ def run_cli(tmp_path, instrument_path):
         if "score" in cmd and ("--outdir" not in cmd):
             cmd += ["--outdir", str(outdir_p)]
 
-        proc = _run(cmd)
+        server = os.getenv("PHIO_SERVER_SOCKET", "").strip()
+        if server and len(cmd) > 2 and cmd[2] == "score":
+            proc = _run_via_server(server, cmd)
+        else:
+            proc = _run(cmd)
 
         if tmp_input and tmp_input.exists():
             tmp_input.unlink(missing_ok=True)
@@ -1,30 +1,15 @@
-import re
-import pytest
+from scripts import phi_otimes_o_instrument_v0_1 as instr
 
-def _supports_bottleneck(help_text: str) -> bool:
-    return "bottleneck" in help_text.lower() or "--agg" in help_text
 
-def test_bottleneck_dominance_if_supported(run_cli, template_json, load_results):
-    help_res, _ = run_cli(["--help"])
-    assert help_res.returncode == 0
-    if not _supports_bottleneck(help_res.stdout + help_res.stderr):
-        pytest.skip("bottleneck non détecté dans --help")
+def test_bottleneck_dominance(template_json):
+    """Un seul parse: toutes les combinaisons median/bottleneck via aggregation_sweep."""
+    results, sweep = instr.aggregation_sweep(template_json, ("median", "bottleneck"))
+    assert results == instr.score_data(template_json, {})
 
-    # median (default)
-    rp_m, out_m = run_cli(["score", "--input", "placeholder"], input_json=template_json)
-    assert rp_m.returncode == 0, rp_m.stderr or rp_m.stdout
-    m = load_results(out_m)
-
-    # bottleneck flags with both tau labels; if one fails we try the other
-    flags_tau = ["--agg_τ", "bottleneck"]
-    flags_tau_ascii = ["--agg_tau", "bottleneck"]
-    base_flags = ["--agg_Cx", "bottleneck", "--agg_K", "bottleneck", "--agg_G", "bottleneck", "--agg_D", "bottleneck"]
-    # try unicode tau
-    rp_b, out_b = run_cli(["score", "--input", "placeholder"] + base_flags + flags_tau, input_json=template_json)
-    if rp_b.returncode != 0:
-        rp_b, out_b = run_cli(["score", "--input", "placeholder"] + base_flags + flags_tau_ascii, input_json=template_json)
-    assert rp_b.returncode == 0, rp_b.stderr or rp_b.stdout
-    b = load_results(out_b)
+    rows = {tuple(r["agg_modes"].values()): r for r in sweep["combinations"]}
+    assert len(rows) == 2 ** len(instr.SWEEP_DIMS)
+    m = rows[("median",) * len(instr.SWEEP_DIMS)]
+    b = rows[("bottleneck",) * len(instr.SWEEP_DIMS)]
 
     assert float(b["T"]) >= float(m["T"]), "bottleneck devrait être >= median sur T"
     assert float(b["K_eff"]) <= float(m["K_eff"]), "bottleneck devrait être <= median sur K_eff"
@@ -0,0 +1,41 @@
+import copy
+import json
+
+
+def test_score_batch_jsonl_matches_single_score(run_cli, template_json, load_results, tmp_path):
+    """score-batch: un process, une ligne par cas, erreurs capturées par cas."""
+    good = copy.deepcopy(template_json)
+    for i, it in enumerate(good["items"]):
+        it["score"] = i % 4
+    bad = copy.deepcopy(template_json)
+    bad["items"][0]["score"] = 7
+
+    src = tmp_path / "cases.jsonl"
+    with src.open("w", encoding="utf-8") as f:
+        f.write(json.dumps(dict(good, case_id="good"), ensure_ascii=False) + "\n")
+        f.write(json.dumps(dict(bad, case_id="bad"), ensure_ascii=False) + "\n")
+        f.write("{not json\n")
+    out = tmp_path / "rows.jsonl"
+
+    res, _ = run_cli(["score-batch", "--input", str(src), "--out", str(out)])
+    assert res.returncode == 2, "un cas invalide doit donner un returncode non nul"
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [r["case_id"] for r in rows] == ["good", "bad", "cases.jsonl:3"]
+    assert [r["ok"] for r in rows] == [True, False, False]
+
+    rp, outdir = run_cli(["score", "--input", "placeholder"], input_json=good)
+    assert rp.returncode == 0, rp.stderr or rp.stdout
+    assert rows[0]["results"] == load_results(outdir)
+
+
+def test_score_batch_directory(run_cli, template_json, tmp_path):
+    src = tmp_path / "cases"
+    src.mkdir()
+    for name in ("a", "b"):
+        (src / f"{name}.json").write_text(json.dumps(template_json, ensure_ascii=False), encoding="utf-8")
+    out = tmp_path / "rows.jsonl"
+
+    res, _ = run_cli(["score-batch", "--input", str(src), "--out", str(out), "--bottleneck"])
+    assert res.returncode == 0, res.stderr or res.stdout
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert len(rows) == 2 and all(r["ok"] for r in rows)
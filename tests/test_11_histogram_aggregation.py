@@ -0,0 +1,28 @@
+import random
+from statistics import median
+
+import pytest
+
+from scripts import phi_otimes_o_instrument_v0_1 as instr
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_histogram_aggregation_matches_sorted_reference(seed):
+    """median/bottleneck lus sur les histogrammes == statistics.median / min."""
+    rng = random.Random(seed)
+    dims = ["Cx", "K", "τ", "G", "D"]
+    items = [
+        {"dimension": rng.choice(dims), "score": rng.randint(instr.SCORE_MIN, instr.SCORE_MAX)}
+        for _ in range(rng.randint(1, 60))
+    ]
+    data = {"items": items}
+
+    ref_buckets = {}
+    for it in items:
+        ref_buckets.setdefault(it["dimension"], []).append(float(it["score"]))
+
+    for mode, ref in (("median", lambda v: float(median(v))), ("bottleneck", lambda v: float(min(v)))):
+        got = instr.aggregate_dimension_scores(data, instr.default_agg_modes({d: mode for d in dims}))
+        assert list(got) == list(ref_buckets), "ordre des dimensions modifié"
+        for d, vals in ref_buckets.items():
+            assert got[d] == ref(vals)
@@ -0,0 +1,81 @@
+import json
+import os
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts import phi_otimes_o_instrument_v0_1 as instr
+
+pytest.importorskip("numpy")
+
+
+def _random_case(rng, i):
+    labels = ["Cx", "K", rng.choice(["τ", "tau"]), "G", "D", "X"]
+    items = [
+        {"dimension": rng.choice(labels), "score": rng.randint(0, 3), "weight": 1.0}
+        for _ in range(rng.randint(1, 25))
+    ]
+    if i % 17 == 0:
+        items[0]["score"] = 9  # invalid case: captured per row
+    return {"case_id": f"c{i}", "items": items}
+
+
+@pytest.mark.parametrize("modes", [{}, {"K": "bottleneck", "τ": "bottleneck"}, {"Cx": "bottleneck", "D": "bottleneck"}])
+def test_numpy_engine_rows_identical_to_python(tmp_path, modes):
+    rng = random.Random(1234)
+    src = tmp_path / "cases.jsonl"
+    with src.open("w", encoding="utf-8") as f:
+        for i in range(300):
+            f.write(json.dumps(_random_case(rng, i), ensure_ascii=False) + "\n")
+        f.write("[1, 2]\n")
+
+    py_rows = list(instr.score_many(str(src), modes, engine="python"))
+    np_rows = list(instr.score_many(str(src), modes, engine="numpy"))
+    # bit-for-bit: compare the serialized rows (key order included)
+    assert [json.dumps(r, ensure_ascii=False) for r in np_rows] == [json.dumps(r, ensure_ascii=False) for r in py_rows]
+
+
+def test_numpy_engine_when_run_as_script(template_json, tmp_path):
+    src = tmp_path / "cases.jsonl"
+    src.write_text(json.dumps(dict(template_json, case_id="a"), ensure_ascii=False) + "\n", encoding="utf-8")
+    env = {k: v for k, v in os.environ.items() if k not in ("PYTHONPATH", "PHIO_SERVER_SOCKET")}
+    cmd = [sys.executable, str(Path(instr.__file__)), "score-batch", "--engine", "numpy"]
+    cmd += ["--input", str(src), "--out", str(tmp_path / "rows.jsonl")]
+    cp = subprocess.run(cmd, cwd=tmp_path, env=env, capture_output=True, text=True)
+    assert cp.returncode == 0, cp.stderr
+    (row,) = [json.loads(line) for line in (tmp_path / "rows.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert row["results"] == instr.score_data(template_json, {})
+
+
+def test_numpy_engine_sparse_cells_many_labels(tmp_path):
+    import tracemalloc
+
+    from scripts import phio_columnar
+
+    rng = random.Random(7)
+    labels = ["Cx", "K", "τ", "G", "D"] + [f"L{j}" for j in range(400)]
+    cases = [
+        (f"c{i}", {"items": [{"dimension": lb, "score": rng.randint(0, 3)} for lb in rng.sample(labels, 5)]})
+        for i in range(20000)
+    ]
+    cases.append(("big", {"items": [{"dimension": lb, "score": 2} for lb in labels]}))
+    src = tmp_path / "cases.jsonl"
+    src.write_text("".join(json.dumps(dict(d, case_id=c)) + "\n" for c, d in cases), encoding="utf-8")
+    py_rows = [json.dumps(r, ensure_ascii=False) for r in instr.score_many(str(src), {}, engine="python")]
+
+    # tiny passes split the batch on case boundaries (the large case gets a pass of its own)
+    batch = phio_columnar.ColumnarBatch.from_cases(iter(cases), instr.compile_plan({}))
+    rows = phio_columnar.score_columnar(batch, {}, chunk_bytes=3000).rows()
+    assert [json.dumps(r, ensure_ascii=False) for r in rows] == py_rows
+
+    # memory follows the items, not cases x distinct labels (dense counts alone would be ~260 MB)
+    tracemalloc.start()
+    try:
+        phio_columnar.score_columnar(batch, {})
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < 64 << 20
@@ -0,0 +1,43 @@
+import json
+
+from scripts import phi_otimes_o_instrument_v0_1 as instr
+
+
+def test_lookup_table_matches_compute_metrics_and_cache(tmp_path):
+    built = instr.ZoneLookupTable.load_or_build(str(tmp_path))
+    assert list(tmp_path.glob("phio_lut_*.bin")), "table non mise en cache"
+    cached = instr.ZoneLookupTable.load_or_build(str(tmp_path))
+    assert cached.T == built.T and cached.K_eff == built.K_eff and cached.zone == built.zone
+
+    for i in range(0, cached.size, 7):
+        dims = instr.ZoneLookupTable.decode(i)
+        T, K_eff = instr.compute_metrics(dims)
+        assert cached.lookup(dims) == (T, K_eff, instr.assign_zone(T))
+
+    # alias ASCII tau + dimensions absentes (0.0)
+    dims = {"tau": 1.5, "K": 2.0}
+    T, K_eff = instr.compute_metrics(dims)
+    assert cached.lookup(dims) == (T, K_eff, instr.assign_zone(T))
+
+
+def test_lookup_table_reverse_index_sorted_by_T(tmp_path):
+    table = instr.ZoneLookupTable.load_or_build(str(tmp_path))
+    rows = table.combinations(zone="Z2", t_min=1.6, t_max=2.2)
+    assert rows
+    Ts = [r["T"] for r in rows]
+    assert Ts == sorted(Ts)
+    assert all(r["zone"] == "Z2" and 1.6 <= r["T"] <= 2.2 for r in rows)
+    total = sum(len(table.combinations(zone=z)) for z in instr.ZONE_LABELS)
+    assert total == table.size
+
+
+def test_score_many_lut_engine_identical(tmp_path, monkeypatch, template_json):
+    monkeypatch.setenv("PHIO_CACHE_DIR", str(tmp_path / "cache"))
+    src = tmp_path / "cases.jsonl"
+    with src.open("w", encoding="utf-8") as f:
+        for s in range(4):
+            case = json.loads(json.dumps(template_json))
+            for i, it in enumerate(case["items"]):
+                it["score"] = (i + s) % 4
+            f.write(json.dumps(case, ensure_ascii=False) + "\n")
+    assert list(instr.score_many(str(src), engine="lut")) == list(instr.score_many(str(src)))
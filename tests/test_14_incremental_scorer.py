@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from scripts import phi_otimes_o_instrument_v0_1 as instr
+
+
+def test_incremental_edits_match_full_rescoring():
+    rng = random.Random(7)
+    dims = ["Cx", "K", "τ", "G", "D"]
+    items = [{"dimension": d, "score": rng.randint(0, 3)} for d in dims for _ in range(3)]
+    modes = {"K": "bottleneck"}
+    sc = instr.IncrementalScorer.from_data({"items": items}, modes)
+
+    for _ in range(200):
+        r = rng.random()
+        if r < 0.4 or len(items) < 2:
+            it = {"dimension": rng.choice(dims), "score": rng.randint(0, 3)}
+            items.append(it)
+            got = sc.add_item(it["dimension"], it["score"])
+        elif r < 0.7:
+            it = items.pop(rng.randrange(len(items)))
+            got = sc.remove_item(it["dimension"], it["score"])
+        else:
+            it = rng.choice(items)
+            new = rng.randint(0, 3)
+            got = sc.update_score(it["dimension"], it["score"], new)
+            it["score"] = new
+        ref = instr.score_data({"items": items}, instr.default_agg_modes(modes))
+        assert got["dimension_scores"] == ref["dimension_scores"]
+        assert (got["T"], got["K_eff"], got["zone"]) == (ref["T"], ref["K_eff"], ref["zone"])
+
+
+def test_incremental_event_replay_and_errors():
+    sc = instr.IncrementalScorer()
+    final = sc.apply(
+        [
+            {"op": "add", "dimension": "Cx", "score": 3},
+            {"op": "add", "dimension": "K", "score": 1},
+            {"op": "update", "dimension": "Cx", "old": 3, "new": 2},
+            {"op": "remove", "dimension": "K", "score": 1},
+        ]
+    )
+    assert final["dimension_scores"] == {"Cx": 2.0}
+    with pytest.raises(ValueError):
+        sc.remove_item("K", 1)
+    with pytest.raises(ValueError):
+        sc.add_item("Cx", 4)
+    with pytest.raises(ValueError):
+        sc.apply([{"op": "noop"}])
@@ -0,0 +1,49 @@
+import itertools
+import json
+import random
+
+from scripts import phi_otimes_o_instrument_v0_1 as instr
+
+
+def _brute_force(items, modes, k):
+    base = instr.score_data({"items": items}, modes)
+    total = changed = 0
+    swing = 0.0
+    for idxs in itertools.combinations(range(len(items)), k):
+        for deltas in itertools.product((-1, +1), repeat=k):
+            v = [dict(it) for it in items]
+            ok = True
+            for i, d in zip(idxs, deltas):
+                v[i]["score"] += d
+                ok = ok and instr.SCORE_MIN <= v[i]["score"] <= instr.SCORE_MAX
+            if not ok:
+                continue
+            r = instr.score_data({"items": v}, modes)
+            total += 1
+            changed += r["zone"] != base["zone"]
+            swing = max(swing, abs(r["T"] - base["T"]))
+    return total, changed, swing
+
+
+def test_exact_enumeration_matches_brute_force():
+    rng = random.Random(3)
+    items = [{"dimension": d, "score": rng.randint(0, 3)} for d in ["Cx", "K", "τ", "G", "D"] for _ in range(2)]
+    modes = instr.default_agg_modes({"K": "bottleneck"})
+    report = instr.robustness_analysis({"items": items}, modes, k=2)
+    for level in report["levels"]:
+        total, changed, swing = _brute_force(items, modes, level["k"])
+        assert level["perturbations"] == total
+        assert level["zone_changes"] == changed
+        assert level["max_T_swing"] == swing
+
+
+def test_robustness_cli_large_input(run_cli, tmp_path):
+    rng = random.Random(11)
+    items = [{"dimension": rng.choice(["Cx", "K", "τ", "G", "D"]), "score": rng.randint(0, 3)} for _ in range(10000)]
+    out = tmp_path / "robustness.json"
+    res, _ = run_cli(["robustness", "--out", str(out), "--k", "2"], input_json={"items": items})
+    assert res.returncode == 0, res.stderr or res.stdout
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert [lv["k"] for lv in report["levels"]] == [1, 2]
+    assert 0.0 <= report["levels"][0]["zone_change_rate"] <= 1.0
+    assert set(report["dimension_margins"]) == set(report["baseline"]["dimension_scores"])
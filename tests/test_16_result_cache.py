@@ -0,0 +1,89 @@
+import json
+import os
+
+from scripts import phi_otimes_o_instrument_v0_1 as instr
+
+
+def _case(scores):
+    return {"items": [{"dimension": d, "score": s} for d, s in scores]}
+
+
+def test_cache_key_is_order_insensitive_and_mode_sensitive():
+    modes = instr.default_agg_modes()
+    a = _case([("Cx", 1), ("K", 2), ("Cx", 3)])
+    b = _case([("Cx", 3), ("Cx", 1), ("K", 2)])
+    assert instr.ResultCache.key(a, modes) == instr.ResultCache.key(b, modes)
+    assert instr.ResultCache.key(a, modes) != instr.ResultCache.key(a, instr.default_agg_modes({"Cx": "bottleneck"}))
+    # a mode on an absent dimension does not fragment the cache
+    assert instr.ResultCache.key(a, modes) == instr.ResultCache.key(a, instr.default_agg_modes({"G": "bottleneck"}))
+    # malformed items never alias a valid input
+    bad = _case([("Cx", 1), ("K", 2), ("Cx", 3)])
+    bad["items"][0]["score"] = True
+    assert instr.ResultCache.key(bad, modes) != instr.ResultCache.key(a, modes)
+
+
+def test_cache_hits_and_lru_eviction(tmp_path):
+    cache = instr.ResultCache(str(tmp_path), max_entries=3)
+    plan = instr.compile_plan()
+    modes = plan.agg_modes
+    cases = [_case([("Cx", i % 4), ("K", i // 4)]) for i in range(6)]
+
+    for c in cases[:3]:
+        assert instr.cached_score_data(c, plan, cache) == instr.score_data(c, modes)
+    assert cache.misses == 3 and cache.hits == 0
+    first = cache._path(instr.ResultCache.key(cases[0], modes))
+    os.utime(first, (1, 1))  # make case 0 the least recently used
+    assert instr.cached_score_data(cases[1], plan, cache) == instr.score_data(cases[1], modes)
+    assert cache.hits == 1
+
+    instr.cached_score_data(cases[3], plan, cache)  # 4 entries > 3 -> evict down to 2
+    assert not first.exists()
+    assert len(list(cache.dir.glob("*/*.json"))) == 2
+    assert cache.stats() == {"hits": 0, "misses": 0, "entries": 2}  # counts stay in memory until flush()
+    cache.flush()
+    assert cache.stats() == {"hits": 1, "misses": 4, "entries": 2}
+
+
+def test_result_cache_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.delenv("PHIO_CACHE_DIR", raising=False)
+    argv = ["score", "--input", "in.json", "--outdir", "out"]
+    assert instr._result_cache(instr.parse_args(argv)) is None
+    assert instr._result_cache(instr.parse_args(argv + ["--cache"])) is not None
+    assert instr._result_cache(instr.parse_args(argv + ["--cache-dir", str(tmp_path)])).dir == tmp_path / "results"
+    assert instr._result_cache(instr.parse_args(argv + ["--cache", "--no-cache"])) is None
+    monkeypatch.setenv("PHIO_CACHE_DIR", str(tmp_path))
+    assert instr._result_cache(instr.parse_args(argv)) is not None
+
+
+def test_score_cli_uses_cache_and_no_cache(run_cli, template_json, load_results, tmp_path):
+    cache_dir = tmp_path / "cache"
+    for _ in range(2):
+        res, outdir = run_cli(["score", "--cache-dir", str(cache_dir)], input_json=template_json)
+        assert res.returncode == 0, res.stderr or res.stdout
+    stats = json.loads((cache_dir / "results" / "stats.json").read_text(encoding="utf-8"))
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    cached = load_results(outdir)
+
+    res, outdir = run_cli(["score", "--cache-dir", str(cache_dir), "--no-cache"], input_json=template_json)
+    assert res.returncode == 0, res.stderr or res.stdout
+    assert load_results(outdir) == cached
+    stats = json.loads((cache_dir / "results" / "stats.json").read_text(encoding="utf-8"))
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_file_cache_hit_skips_decoding(tmp_path, monkeypatch):
+    cache = instr.ResultCache(str(tmp_path / "cache"))
+    plan = instr.compile_plan()
+    src = tmp_path / "in.json"
+    src.write_text(json.dumps(_case([("Cx", 1), ("K", 2)])), encoding="utf-8")
+    first = instr.cached_score_file(src, plan, cache)
+
+    def _no_decode(*a, **k):
+        raise AssertionError("input decoded on a cache hit")
+
+    monkeypatch.setattr(instr, "input_histograms", _no_decode)
+    assert instr.cached_score_file(src, plan, cache) == first
+    assert cache.hits == 1
+    # same bytes under another mode: a different entry
+    other = instr.compile_plan({"K": "bottleneck"})
+    assert instr.ResultCache.key_from_file(src, other) != instr.ResultCache.key_from_file(src, plan)
@@ -0,0 +1,98 @@
+import json
+import threading
+
+import pytest
+
+from scripts import phi_otimes_o_instrument_v0_1 as instr
+
+
+@pytest.fixture
+def server(tmp_path):
+    sock = tmp_path / "phio.sock"
+    srv = instr.ScoringServer(str(sock))
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    yield str(sock)
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_server_replies_match_score_data(server, template_json):
+    modes = {"K": "bottleneck"}
+    with instr.ScoringClient(server) as c:
+        for s in range(4):
+            case = json.loads(json.dumps(template_json))
+            for it in case["items"]:
+                it["score"] = s
+            assert c.score(case, modes) == instr.score_data(case, instr.default_agg_modes(modes))
+        with pytest.raises(ValueError, match="hors borne"):
+            c.score({"items": [{"dimension": "Cx", "score": 5}]})
+        # the connection survives an error reply
+        assert c.request({"items": [{"dimension": "Cx", "score": 1}]})["ok"]
+
+
+def test_server_concurrent_clients(server):
+    errors = []
+
+    def worker(n):
+        try:
+            with instr.ScoringClient(server) as c:
+                for i in range(50):
+                    r = c.score({"items": [{"dimension": "Cx", "score": (n + i) % 4}]})
+                    assert r["dimension_scores"] == {"Cx": float((n + i) % 4)}
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+
+
+def test_run_score_argv_keeps_cli_contract(server, template_json, tmp_path):
+    inp = tmp_path / "in.json"
+    inp.write_text(json.dumps(template_json, ensure_ascii=False), encoding="utf-8")
+    with instr.ScoringClient(server) as c:
+        rc, _, _ = c.run_score_argv(["score", "--input", str(inp), "--outdir", str(tmp_path / "o"), "--bottleneck"])
+        assert rc == 0
+        assert (tmp_path / "o" / "results.json").exists()
+        bad = json.loads(json.dumps(template_json))
+        bad["items"][0]["score"] = 1.5
+        inp.write_text(json.dumps(bad), encoding="utf-8")
+        rc, _, err = c.run_score_argv(["score", "--input", str(inp), "--outdir", str(tmp_path / "o")])
+        assert rc == 2 and "int-only" in err
+
+
+def test_run_core_server_as_script(server, template_json, tmp_path):
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    data = tmp_path / "data"
+    data.mkdir()
+    for name in ("a", "b"):
+        (data / f"{name}.json").write_text(json.dumps(template_json), encoding="utf-8")
+    profile = tmp_path / "core.toml"
+    profile.write_text(f'[core]\ninputs = ["{data}/*.json"]\nout_base = "{tmp_path / "runs"}"\njobs = 2\n', encoding="utf-8")
+    env = {k: v for k, v in os.environ.items() if k not in ("PYTHONPATH", "PHIO_SERVER_SOCKET")}
+    run_core = Path(instr.__file__).with_name("run_core.py")
+
+    def run(socket_path, run_id):
+        cmd = [sys.executable, str(run_core), "--profile", str(profile), "--run-id", run_id, "--server", socket_path]
+        cmd.append("--force")
+        cp = subprocess.run(cmd, cwd=tmp_path, env=env, capture_output=True, text=True)
+        assert "Traceback" not in cp.stderr, cp.stderr
+        return cp, json.loads((tmp_path / "runs" / run_id / "run_manifest.json").read_text(encoding="utf-8"))
+
+    cp, manifest = run(server, "up")
+    assert cp.returncode == 0, cp.stderr
+    assert [r["execution"]["mode"] for r in manifest["inputs"]] == ["server", "server"]
+
+    # an unreachable server fails each input, not the pool
+    cp, manifest = run(str(tmp_path / "missing.sock"), "down")
+    assert cp.returncode == 2
+    assert manifest["counts"] == {"inputs": 2, "ok": 0, "failed": 2}
+    assert all("Scoring server unavailable" in r["execution"]["error"] for r in manifest["inputs"])
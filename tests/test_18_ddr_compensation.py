@@ -0,0 +1,52 @@
+import pytest
+
+from scripts import ddr_compensation as ddr
+
+np = pytest.importorskip("numpy")
+
+
+def _series(n_comp=50, rows=400, brk=200, swing=5.0, agg_shift=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    comps = rng.normal(10.0, 0.1, size=(rows, n_comp))
+    # after the rupture, half the components go up and half go down by the same amount
+    comps[brk:, : n_comp // 2] += swing
+    comps[brk:, n_comp // 2 :] -= swing
+    agg = comps.sum(axis=1) + np.where(np.arange(rows) >= brk, agg_shift, 0.0)
+    return np.column_stack([agg, comps])
+
+
+def _write_csv(path, mat):
+    names = ["aggregate"] + [f"c{i}" for i in range(1, mat.shape[1])]
+    with path.open("w", encoding="utf-8") as f:
+        f.write("ts," + ",".join(names) + "\n")
+        for r, row in enumerate(mat):
+            f.write(f"2026-01-01T00:00:{r % 60:02d}Z," + ",".join(repr(float(x)) for x in row) + "\n")
+
+
+def test_compensated_restoration_flagged_csv_and_npy(tmp_path):
+    mat = _series()
+    csv = tmp_path / "wide.csv"
+    _write_csv(csv, mat)
+    npy = tmp_path / "wide.npy"
+    np.save(npy, mat)
+
+    r_csv = ddr.run(csv, (0, 200), (200, 400), chunk_mb=0.01)  # many small chunks
+    r_npy = ddr.run(npy, (0, 200), (200, 400))
+    for r in (r_csv, r_npy):
+        assert r["verdict"] == "restored_by_compensation"
+        assert r["hidden_divergence"] is True
+        assert r["compensation_ratio"] > 0.99
+        assert len(r["top_positive"]) == 10 and len(r["top_negative"]) == 10
+    assert r_csv["gross_shift"] == pytest.approx(r_npy["gross_shift"])
+    assert r_csv["aggregate"]["std_pre"] == pytest.approx(r_npy["aggregate"]["std_pre"])
+
+
+def test_structural_restoration_and_non_restoration(tmp_path):
+    npy = tmp_path / "wide.npy"
+    np.save(npy, _series(swing=0.0))
+    assert ddr.run(npy, (0, 200), (200, 400))["verdict"] == "restored_structural"
+
+    np.save(npy, _series(swing=0.0, agg_shift=50.0))
+    assert ddr.run(npy, (0, 200), (200, 400))["verdict"] == "not_restored"
+
+    assert ddr.run(npy, (0, 1), (399, 400))["verdict"] == "inconclusive"
@@ -0,0 +1,50 @@
+import random
+
+from scripts import phi_otimes_o_instrument_v0_1 as instr
+
+
+def _reference(data, modes):
+    # pre-plan path: dict histograms + per-dimension mode resolution + compute_metrics
+    dims = instr.aggregate_dimension_scores(data, modes)
+    T, K_eff = instr.compute_metrics(dims)
+    return instr._results_payload(dims, T, K_eff, instr.assign_zone(T))
+
+
+def test_plan_matches_reference_path_including_aliases():
+    rng = random.Random(42)
+    labels = ["Cx", "K", "τ", "tau", "G", "D", "Extra"]
+    for modes in ({}, {"tau": "bottleneck"}, {"τ": "bottleneck", "Cx": "bottleneck"}, {"K": "BOTTLENECK "}):
+        plan = instr.ScoringPlan(modes)
+        full = instr.default_agg_modes(modes)
+        for _ in range(50):
+            data = {
+                "items": [
+                    {"dimension": rng.choice(labels), "score": rng.randint(0, 3)} for _ in range(rng.randint(1, 30))
+                ]
+            }
+            got = plan.score(data)
+            ref = _reference(data, full)
+            assert list(got["dimension_scores"].items()) == list(ref["dimension_scores"].items())
+            assert (got["T"], got["K_eff"], got["zone"]) == (ref["T"], ref["K_eff"], ref["zone"])
+
+
+def test_compile_plan_is_shared_per_configuration():
+    assert instr.compile_plan({"K": "bottleneck"}) is instr.compile_plan({"K": "bottleneck"})
+    assert instr.compile_plan({"K": "bottleneck"}) is not instr.compile_plan()
+    plan = instr.compile_plan({"tau": "bottleneck"})
+    assert plan.mode("τ") == plan.mode("tau") == "bottleneck"
+    assert plan.slot("τ") != plan.slot("tau")
+
+
+def test_shared_plan_retired_once_full(monkeypatch):
+    monkeypatch.setattr(instr.ScoringPlan, "MAX_LABELS", 10)
+    modes = {"G": "bottleneck", "D": "bottleneck"}
+    plan = instr.compile_plan(modes)
+    data = {"items": [{"dimension": f"L{i}", "score": i % 4} for i in range(8)] + [{"dimension": "K", "score": 2}]}
+    assert plan.score(data) == _reference(data, instr.default_agg_modes(modes))
+    assert len(plan.labels) == 14  # a plan in use keeps interning
+
+    fresh = instr.compile_plan(modes)
+    assert fresh is not plan and fresh.labels == list(instr.ScoringPlan.CORE)
+    assert instr.compile_plan(modes) is fresh
+    assert fresh.score(data) == plan.score(data)
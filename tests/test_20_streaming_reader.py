@@ -0,0 +1,114 @@
+import copy
+import json
+import tracemalloc
+
+import pytest
+
+from scripts import phi_otimes_o_instrument_v0_1 as instr
+
+
+def _write(tmp_path, text, name="in.json"):
+    p = tmp_path / name
+    p.write_text(text, encoding="utf-8")
+    return p
+
+
+@pytest.mark.parametrize("chunk", [1, 3, 7, 64, instr.STREAM_CHUNK])
+def test_stream_matches_json_loads(template_json, tmp_path, chunk):
+    data = copy.deepcopy(template_json)
+    data["items"] = [dict(it, score=(i * 7) % 4, note="x" * (i % 5)) for i, it in enumerate(data["items"] * 3)]
+    data["zz_after"] = {"nested": [1, 2.5, -30, None, True, "é"]}
+    p = _write(tmp_path, json.dumps(data, ensure_ascii=False, indent=1))
+
+    assert list(instr.iter_input_items(p, chunk_size=chunk)) == data["items"]
+    plan = instr.compile_plan()
+    assert plan.score_file(p) == instr.score_data(data, {})
+
+
+def test_stream_numbers_across_chunk_boundaries(tmp_path):
+    text = (
+        '{"version": 1.5, "items": [{"dimension": "K", "score": 2, "weight": 2e3},'
+        ' {"dimension": "G", "score": 1, "weight": -0.25E-1}], "z": [1.0e+2, true, null]}'
+    )
+    p = _write(tmp_path, text)
+    data = json.loads(text)
+    for chunk in range(1, len(text) + 1):
+        assert list(instr.iter_input_items(p, chunk_size=chunk)) == data["items"], chunk
+    # "1." and "2e" end the first refill exactly
+    assert list(instr.iter_input_items(p, chunk_size=text.index(".") + 1)) == data["items"]
+    assert list(instr.iter_input_items(p, chunk_size=text.index("e") + 1)) == data["items"]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"items": [{"dimension": "K", "score": 1}, {"dimension": "K", "score": 9}]}',
+        '{"items": [{"dimension": "K", "score": 1}, {"score": 2}]}',
+        '{"items": [{"dimension": "K", "score": 1.0}]}',
+        '{"items": [3]}',
+        '{"items": []}',
+        '{"system": {}}',
+        '{"items": {"dimension": "K"}}',
+        "[1, 2]",
+    ],
+)
+@pytest.mark.parametrize("streamed", [False, True])
+def test_stream_errors_identical(tmp_path, monkeypatch, text, streamed):
+    if streamed:
+        monkeypatch.setattr(instr, "STREAM_MIN_BYTES", 0)
+    p = _write(tmp_path, text)
+    with pytest.raises(ValueError) as ref:
+        instr.score_data(json.loads(text), {})
+    with pytest.raises(ValueError) as got:
+        instr.compile_plan().score_file(p)
+    assert str(got.value) == str(ref.value)
+
+
+@pytest.mark.parametrize("text", ['{"items": [{"dimension": "K", "score": 1}', '{"items": []} x', '{"items" [] }'])
+def test_stream_rejects_invalid_json(tmp_path, text):
+    with pytest.raises(ValueError):
+        instr.compile_plan().score_file(_write(tmp_path, text))
+
+
+def test_duplicate_items_key(tmp_path, monkeypatch):
+    text = '{"items": [{"dimension": "K", "score": 3}], "items": [{"dimension": "K", "score": 1}]}'
+    p = _write(tmp_path, text)
+    # small file, one json.loads: the last key wins, as before streaming
+    assert instr.compile_plan().score_file(p)["dimension_scores"] == {"K": 1.0}
+    monkeypatch.setattr(instr, "STREAM_MIN_BYTES", 0)
+    with pytest.raises(ValueError, match="input.items dupliqué"):
+        instr.compile_plan().score_file(p)
+
+
+def test_stream_batches_fall_back_inside_strings(tmp_path):
+    items = [{"dimension": "K", "score": i % 4, "note": "}, {" * (i % 3)} for i in range(3000)] + [7]
+    p = _write(tmp_path, json.dumps({"items": items}))
+    assert list(instr.iter_input_items(p, chunk_size=1000)) == items
+
+
+def test_stream_memory_is_flat(tmp_path):
+    n = 50_000
+    p = tmp_path / "big.json"
+    with p.open("w", encoding="utf-8") as f:
+        f.write('{"items": [')
+        f.write(",".join('{"dimension": "%s", "score": %d}' % ("CxKGD"[i % 5], i % 4) for i in range(n)))
+        f.write("]}")
+    size = p.stat().st_size
+    plan = instr.compile_plan()
+    tracemalloc.start()
+    try:
+        plan.score_file(p)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < size / 4, (peak, size)
+
+
+def test_cli_score_cache_key_unchanged(run_cli, template_json, load_results, tmp_path):
+    """Le cache alimenté par le flux partage ses clés avec ResultCache.key()."""
+    plan = instr.compile_plan()
+    hist = plan.accumulate(iter(template_json["items"]))
+    assert instr.ResultCache.key_from_histograms(plan, hist) == instr.ResultCache.key(template_json, plan.agg_modes)
+    res, outdir = run_cli(["score", "--input", "placeholder"], input_json=template_json)
+    assert res.returncode == 0, res.stderr or res.stdout
+    assert load_results(outdir) == instr.score_data(template_json, {})
@@ -0,0 +1,118 @@
+import copy
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts import phi_otimes_o_instrument_v0_1 as instr
+from scripts import phio_binary
+
+
+def _varied(template_json, n=3):
+    data = copy.deepcopy(template_json)
+    data["items"] = [dict(it, score=(i * 5) % 4, weight=0.5 + (i % 3)) for i, it in enumerate(data["items"] * n)]
+    return data
+
+
+def test_phib_roundtrip_and_score(template_json, tmp_path):
+    data = _varied(template_json)
+    p = tmp_path / "in.phib"
+    header = phio_binary.write_phib(data, p)
+    assert header["count"] == len(data["items"]) and header["cell_width"] == 1
+    assert header["cells_offset"] % 8 == 0
+
+    with phio_binary.PhibFile(p) as pf:
+        back = pf.to_json()
+    assert back["system"] == data["system"]
+    assert [(it["dimension"], it["score"], it["weight"]) for it in back["items"]] == [
+        (it["dimension"], it["score"], it["weight"]) for it in data["items"]
+    ]
+    assert instr.compile_plan().score_file(p) == instr.score_data(data, {})
+
+
+def test_phib_weights_match_json_in_weighted_modes(tmp_path):
+    import random
+
+    rng = random.Random(5)
+    modes = {"G": "weighted_median", "K": "weighted_bottleneck", "Cx": "weighted_median"}
+    plan = instr.compile_plan(modes)
+    for i in range(200):
+        data = {
+            "items": [
+                {"dimension": rng.choice(["Cx", "K", "G", "D"]), "score": rng.randint(0, 3), "weight": rng.random()}
+                for _ in range(rng.randint(1, 12))
+            ]
+        }
+        p = tmp_path / f"c{i}.phib"
+        phio_binary.write_phib(data, p)
+        assert plan.score_file(p) == instr.score_data(data, modes)
+        with phio_binary.PhibFile(p) as pf:
+            assert [it["weight"] for it in pf.to_json()["items"]] == [it["weight"] for it in data["items"]]
+
+
+def test_phib_invalid_weight_only_fails_weighted_modes(tmp_path):
+    data = {"items": [{"dimension": "K", "score": 2}, {"dimension": "G", "score": 1, "weight": "heavy"}]}
+    p = tmp_path / "in.phib"
+    phio_binary.write_phib(data, p)
+    assert instr.compile_plan().score_file(p) == instr.score_data(data, {})
+    assert instr.compile_plan({"K": "weighted_median"}).score_file(p) == instr.score_data(data, {"K": "weighted_median"})
+    with pytest.raises(ValueError, match=r"item\[1\]\.weight invalide"):
+        instr.compile_plan({"G": "weighted_median"}).score_file(p)
+
+
+def test_phib_wide_cells(tmp_path):
+    data = {"items": [{"dimension": f"d{i}", "score": i % 4} for i in range(100)] + [{"dimension": "K", "score": 2}]}
+    p = tmp_path / "wide.phib"
+    assert phio_binary.write_phib(data, p)["cell_width"] == 2
+    plan = instr.compile_plan({"K": "bottleneck"})
+    assert plan.score_file(p) == plan.score(data)
+
+
+def test_phib_rejects_corrupt(template_json, tmp_path):
+    p = tmp_path / "in.phib"
+    phio_binary.write_phib(template_json, p)
+    raw = bytearray(p.read_bytes())
+    with phio_binary.PhibFile(p) as pf:
+        raw[pf.header["cells_offset"]] = 250
+    p.write_bytes(bytes(raw))
+    with pytest.raises(ValueError):
+        instr.compile_plan().score_file(p)
+    p.write_bytes(b"NOTPHIB!" + bytes(raw[8:]))
+    with pytest.raises(ValueError):
+        instr.compile_plan().score_file(p)
+
+
+def test_cli_convert_and_score(run_cli, template_json, tmp_path):
+    data = _varied(template_json)
+    src = tmp_path / "in.json"
+    src.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    phib = tmp_path / "in.phib"
+    res, _ = run_cli(["convert", "--input", str(src), "--out", str(phib)])
+    assert res.returncode == 0, res.stderr or res.stdout
+
+    res, outdir = run_cli(["score", "--input", str(phib), "--bottleneck"])
+    assert res.returncode == 0, res.stderr or res.stdout
+    got = json.loads((outdir / "results.json").read_text(encoding="utf-8"))
+    plan = instr.compile_plan({k: "bottleneck" for k in instr.default_agg_modes()})
+    assert got == plan.score(data)
+
+
+def test_phib_cli_when_run_as_script(template_json, tmp_path):
+    script = Path(instr.__file__)
+    env = {k: v for k, v in os.environ.items() if k not in ("PYTHONPATH", "PHIO_SERVER_SOCKET")}
+    src = tmp_path / "in.json"
+    src.write_text(json.dumps(template_json, ensure_ascii=False), encoding="utf-8")
+
+    def run(*args):
+        cmd = [sys.executable, str(script), *map(str, args)]
+        return subprocess.run(cmd, cwd=tmp_path, env=env, capture_output=True, text=True)
+
+    cp = run("convert", "--input", src, "--out", tmp_path / "in.phib")
+    assert cp.returncode == 0, cp.stderr
+    cp = run("score", "--input", tmp_path / "in.phib", "--outdir", tmp_path / "out", "--no-cache")
+    assert cp.returncode == 0, cp.stderr
+    results = json.loads((tmp_path / "out" / "results.json").read_text(encoding="utf-8"))
+    assert results == instr.score_data(template_json, {})
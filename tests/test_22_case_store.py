@@ -0,0 +1,112 @@
+import copy
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts import phi_otimes_o_instrument_v0_1 as instr
+from scripts.phio_case_store import CaseStore, parse_slice
+
+
+def _cases(template_json, n):
+    out = []
+    for i in range(n):
+        c = copy.deepcopy(template_json)
+        c["case_id"] = f"c{i}"
+        for j, it in enumerate(c["items"]):
+            it["score"] = (i + j) % 4
+        out.append(c)
+    return out
+
+
+def _write(path, records, mode="w"):
+    with path.open(mode, encoding="utf-8") as f:
+        for r in records:
+            f.write((r if isinstance(r, str) else json.dumps(r, ensure_ascii=False)) + "\n")
+
+
+def test_store_matches_full_scan(template_json, tmp_path):
+    src = tmp_path / "cases.jsonl"
+    _write(src, _cases(template_json, 5)[:3] + ["", "{broken"] + _cases(template_json, 5)[3:])
+    store = CaseStore(src)
+    assert (tmp_path / "cases.jsonl.idx.json").is_file()
+    assert list(instr.iter_batch_inputs(str(src), span=slice(None))).__len__() == 6
+    full = [(cid, d if not isinstance(d, Exception) else None) for cid, d in instr.iter_batch_inputs(str(src))]
+    idx = [(cid, d if not isinstance(d, Exception) else None) for cid, d in store.iter_cases(span=slice(None))]
+    assert idx == full
+    assert store.get("c4")["case_id"] == "c4"
+    assert [cid for cid, _ in store.iter_cases(span=parse_slice("1:3"))] == ["c1", "c2"]
+    with pytest.raises(ValueError):
+        store.get("nope")
+
+
+def test_store_incremental_append(template_json, tmp_path):
+    src = tmp_path / "cases.jsonl"
+    cases = _cases(template_json, 6)
+    _write(src, cases[:4])
+    CaseStore(src)
+    size = src.stat().st_size
+
+    _write(src, cases[4:], mode="a")
+    store = CaseStore(src)
+    assert store.scanned == src.stat().st_size - size
+    assert store.refresh() == 0
+    assert len(store) == 6 and store.get("c5")["case_id"] == "c5"
+    assert store.offsets[4] == size
+
+    # rewrite (not an append): full rebuild
+    _write(src, cases[:2])
+    store = CaseStore(src)
+    assert store.ids == ["c0", "c1"]
+
+
+def test_store_unterminated_last_line(template_json, tmp_path):
+    src = tmp_path / "cases.jsonl"
+    a, b = _cases(template_json, 2)
+    src.write_text(json.dumps(a) + "\n" + json.dumps(b)[:10], encoding="utf-8")
+    assert len(CaseStore(src)) == 2
+    with src.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(b)[10:] + "\n")
+    store = CaseStore(src)
+    assert store.ids == ["c0", "c1"] and store.get("c1") == b
+
+
+def test_cli_case_and_slice(run_cli, template_json, load_results, tmp_path):
+    src = tmp_path / "cases.jsonl"
+    cases = _cases(template_json, 4)
+    _write(src, cases)
+
+    res, outdir = run_cli(["score", "--input", str(src), "--case", "c2"])
+    assert res.returncode == 0, res.stderr or res.stdout
+    assert load_results(outdir) == instr.score_data(cases[2], {})
+
+    res, _ = run_cli(["score", "--input", str(src), "--case", "missing"])
+    assert res.returncode == 2
+
+    out = tmp_path / "rows.jsonl"
+    res, _ = run_cli(["score-batch", "--input", str(src), "--slice=-2:", "--out", str(out)])
+    assert res.returncode == 0, res.stderr or res.stdout
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [r["case_id"] for r in rows] == ["c2", "c3"]
+
+
+def test_case_store_when_run_as_script(template_json, tmp_path):
+    src = tmp_path / "cases.jsonl"
+    cases = _cases(template_json, 3)
+    _write(src, cases)
+    env = {k: v for k, v in os.environ.items() if k not in ("PYTHONPATH", "PHIO_SERVER_SOCKET")}
+
+    def run(*args):
+        cmd = [sys.executable, str(Path(instr.__file__)), *map(str, args)]
+        return subprocess.run(cmd, cwd=tmp_path, env=env, capture_output=True, text=True)
+
+    cp = run("score", "--input", src, "--case", "c1", "--outdir", tmp_path / "out", "--no-cache")
+    assert cp.returncode == 0, cp.stderr
+    assert json.loads((tmp_path / "out" / "results.json").read_text(encoding="utf-8")) == instr.score_data(cases[1], {})
+    cp = run("score-batch", "--input", src, "--case", "c0", "--case", "c2", "--out", tmp_path / "rows.jsonl")
+    assert cp.returncode == 0, cp.stderr
+    rows = [json.loads(line) for line in (tmp_path / "rows.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [r["case_id"] for r in rows] == ["c0", "c2"]
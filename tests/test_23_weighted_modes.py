@@ -0,0 +1,111 @@
+import copy
+import json
+import random
+
+import pytest
+
+from scripts import phi_otimes_o_instrument_v0_1 as instr
+
+
+def _expand(data):
+    """Reference: items repeated by their integer weight (the old upstream workaround)."""
+    out = copy.deepcopy(data)
+    out["items"] = [dict(it, weight=1.0) for it in data["items"] for _ in range(int(it["weight"]))]
+    return out
+
+
+WEIGHTED = {d: "weighted_median" for d in ("Cx", "K", "G", "D", "τ")}
+
+
+def _random_input(rng, template_json, n=40):
+    data = copy.deepcopy(template_json)
+    dims = [it["dimension"] for it in data["items"]]
+    data["items"] = [
+        {"dimension": rng.choice(dims), "score": rng.randint(0, 3), "weight": rng.randint(1, 4)} for _ in range(n)
+    ]
+    return data
+
+
+def test_weighted_matches_expanded_items(template_json):
+    rng = random.Random(7)
+    for _ in range(200):
+        data = _random_input(rng, template_json)
+        for mode, ref in (("weighted_median", "median"), ("weighted_bottleneck", "bottleneck")):
+            modes = {d: mode for d in WEIGHTED}
+            ref_modes = {d: ref for d in WEIGHTED}
+            assert instr.score_data(data, modes) == instr.score_data(_expand(data), ref_modes)
+
+
+def test_weighted_median_masses():
+    assert instr._weighted_median_from_masses([0.5, 0.0, 0.5, 0.0]) == 1.0
+    assert instr._weighted_median_from_masses([0.2, 0.0, 0.0, 3.0]) == 3.0
+    assert instr._weighted_median_from_masses([0.0, 0.0, 0.0, 0.0]) == 0.0
+    assert instr._weighted_bottleneck_from_masses([0.0, 0.0, 2.0, 1.0]) == 2.0
+
+
+def test_weighted_median_split_ignores_item_order():
+    np = pytest.importorskip("numpy")
+    items = [
+        {"dimension": "G", "score": 0, "weight": 0.1},
+        {"dimension": "G", "score": 0, "weight": 0.2},
+        {"dimension": "G", "score": 3, "weight": 0.3},
+        {"dimension": "G", "score": 1, "weight": 0.0},
+        {"dimension": "G", "score": 3, "weight": 0.4},
+        {"dimension": "G", "score": 0, "weight": 0.4},
+    ]
+    rng = random.Random(3)
+    seen = set()
+    for _ in range(50):
+        rng.shuffle(items)
+        masses = [0.0] * instr.N_BINS
+        for it in items:
+            masses[it["score"] - instr.SCORE_MIN] += it["weight"]
+        got = instr._weighted_median_from_masses(masses)
+        assert float(instr._weighted_median_batched(np, np.array(masses))) == got
+        seen.add(instr.score_data({"items": items}, {"G": "weighted_median"})["dimension_scores"]["G"])
+        seen.add(got)
+    assert seen == {1.5}  # 0.1 + 0.2 + 0.4 against 0.3 + 0.4: a half split, midpoint of 0 and 3
+
+
+@pytest.mark.parametrize("weight", [-1, "1", True, float("nan")])
+def test_weighted_rejects_bad_weight(template_json, weight):
+    data = copy.deepcopy(template_json)
+    data["items"][1]["weight"] = weight
+    with pytest.raises(ValueError, match=r"item\[1\]\.weight invalide"):
+        instr.score_data(data, {"K": "weighted_median", "Cx": "weighted_median"})
+    instr.score_data(data, {})  # weights are ignored by unweighted modes
+
+
+def test_weighted_cache_key_and_engines(template_json, tmp_path):
+    data = copy.deepcopy(template_json)
+    data["items"][1]["weight"] = 3.0
+    plan = instr.compile_plan({"K": "weighted_median"})
+    assert instr.ResultCache.key(data, plan.agg_modes) != instr.ResultCache.key(template_json, plan.agg_modes)
+    hist = plan.accumulate(iter(data["items"]))
+    assert instr.ResultCache.key_from_histograms(plan, hist) == instr.ResultCache.key(data, plan.agg_modes)
+
+    rng = random.Random(3)
+    src = tmp_path / "cases.jsonl"
+    src.write_text(
+        "".join(json.dumps(_random_input(rng, template_json), ensure_ascii=False) + "\n" for _ in range(30)),
+        encoding="utf-8",
+    )
+    modes = {"K": "weighted_median", "G": "weighted_bottleneck", "D": "bottleneck"}
+    rows = list(instr.score_many(str(src), modes))
+    assert rows == list(instr.score_many(str(src), modes, engine="lut"))
+    pytest.importorskip("numpy")
+    assert rows == list(instr.score_many(str(src), modes, engine="numpy"))
+
+
+def test_cli_weighted_flag_and_phib(run_cli, template_json, load_results, tmp_path):
+    from scripts import phio_binary
+
+    data = _random_input(random.Random(11), template_json)
+    res, outdir = run_cli(["score", "--input", "placeholder", "--agg_K", "weighted_median"], input_json=data)
+    assert res.returncode == 0, res.stderr or res.stdout
+    assert load_results(outdir) == instr.score_data(data, {"K": "weighted_median"})
+
+    phib = tmp_path / "in.phib"
+    phio_binary.write_phib(data, phib)
+    plan = instr.compile_plan({"K": "weighted_median", "τ": "weighted_bottleneck"})
+    assert plan.score_file(phib) == plan.score(data)
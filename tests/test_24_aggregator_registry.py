@@ -0,0 +1,98 @@
+import json
+import random
+
+import pytest
+
+from scripts import phi_otimes_o_instrument_v0_1 as instr
+
+SPECS = [
+    "median",
+    "bottleneck",
+    "mode",
+    "quantile-0",
+    "quantile-0.25",
+    "quantile-0.9",
+    "quantile-1",
+    "trimmed_mean",
+    "trimmed_mean-0.25",
+    "weighted_median",
+    "weighted_bottleneck",
+]
+
+
+def _histograms(rng, n):
+    out = [[0] * instr.N_BINS]
+    for _ in range(n):
+        size = rng.choice([1, 2, 3, 5, 10, 57])
+        counts = [0] * instr.N_BINS
+        for _ in range(size):
+            counts[rng.randrange(instr.N_BINS)] += 1
+        out.append(counts)
+    return out
+
+
+@pytest.mark.parametrize("spec", SPECS)
+def test_scalar_counts_batched_agree(spec):
+    agg = instr.resolve_aggregator(spec)
+    rng = random.Random(spec)
+    hists = _histograms(rng, 300)
+    from_counts = [agg.from_counts(list(c)) for c in hists]
+    values = [[b + instr.SCORE_MIN for b, c in enumerate(h) for _ in range(c)] for h in hists]
+    scalar = [agg.scalar(rng.sample(v, len(v))) for v in values]
+    assert scalar == from_counts
+
+    np = pytest.importorskip("numpy")
+    arr = np.array(hists, dtype=np.float64 if agg.weighted else np.int64)
+    batched = agg.batched(np, arr.reshape(len(hists), 1, instr.N_BINS))
+    assert batched.reshape(-1).tolist() == from_counts
+
+
+def test_unknown_and_bad_params_rejected_at_plan_time():
+    for spec in ("avg", "quantile", "quantile-2", "trimmed_mean-0.5", "median-1"):
+        with pytest.raises(ValueError):
+            instr.ScoringPlan({"K": spec})
+    assert instr.resolve_aggregator(" Quantile-0.50 ").name == "quantile-0.5"
+
+
+def test_register_custom_aggregator():
+    @instr.register_aggregator("top", "top")
+    def _top(param):
+        return instr.Aggregator("top", lambda c: float(max(i for i, n in enumerate(c) if n)) if any(c) else 0.0, None)
+
+    try:
+        plan = instr.ScoringPlan({"K": "top"})
+        assert plan.score({"items": [{"dimension": "K", "score": 1}, {"dimension": "K", "score": 3}]})[
+            "dimension_scores"
+        ] == {"K": 3.0}
+        assert "top" in instr.aggregation_modes()
+    finally:
+        del instr._AGGREGATOR_FACTORIES["top"]
+        instr.resolve_aggregator.cache_clear()
+
+
+def test_cli_modes_help_and_errors(run_cli, template_json, load_results, tmp_path):
+    help_res, _ = run_cli(["--help"])
+    for usage in instr.aggregation_modes():
+        assert usage in help_res.stdout
+
+    res, _ = run_cli(["score", "--input", "placeholder", "--agg_K", "avg"], input_json=template_json)
+    assert res.returncode == 2 and "avg" in res.stderr
+
+    res, outdir = run_cli(["score", "--input", "placeholder", "--agg_K", "quantile-0.75"], input_json=template_json)
+    assert res.returncode == 0, res.stderr or res.stdout
+    assert load_results(outdir) == instr.score_data(template_json, {"K": "quantile-0.75"})
+
+
+def test_off_grid_modes_with_lut_engine(template_json, tmp_path):
+    rng = random.Random(5)
+    src = tmp_path / "cases.jsonl"
+    with src.open("w", encoding="utf-8") as f:
+        for _ in range(20):
+            items = [{"dimension": d, "score": rng.randint(0, 3)} for d in ("Cx", "K", "τ", "G", "D") for _ in range(3)]
+            f.write(json.dumps({"items": items}, ensure_ascii=False) + "\n")
+    modes = {"Cx": "trimmed_mean-0.2", "K": "quantile-0.3", "G": "mode"}
+    rows = list(instr.score_many(str(src), modes))
+    assert all(r["ok"] for r in rows)
+    assert rows == list(instr.score_many(str(src), modes, engine="lut"))
+    pytest.importorskip("numpy")
+    assert rows == list(instr.score_many(str(src), modes, engine="numpy"))
@@ -0,0 +1,63 @@
+import copy
+import json
+import os
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+from scripts import phi_otimes_o_instrument_v0_1 as instr
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+def _varied(template_json, seed=1, n=4):
+    rng = random.Random(seed)
+    data = copy.deepcopy(template_json)
+    data["items"] = [dict(it, score=rng.randint(0, 3), weight=rng.randint(1, 3)) for it in data["items"] * n]
+    return data
+
+
+def test_sweep_rows_match_individual_scores(template_json):
+    data = _varied(template_json)
+    modes = ("median", "bottleneck", "weighted_median")
+    results, sweep = instr.aggregation_sweep(data, modes, {"G": "mode"})
+    assert results == instr.score_data(data, {"G": "mode"})
+    assert len(sweep["combinations"]) == len(modes) ** 5
+    for row in sweep["combinations"]:
+        ref = instr.score_data(data, row["agg_modes"])
+        assert (row["T"], row["K_eff"], row["zone"]) == (ref["T"], ref["K_eff"], ref["zone"])
+    assert sum(sweep["zone_counts"].values()) == len(sweep["combinations"])
+
+
+def test_cli_sweep(run_cli, template_json, load_results, tmp_path):
+    data = _varied(template_json, seed=2)
+    res, outdir = run_cli(["score", "--input", "placeholder", "--sweep", "--sweep-modes", "median,mode"], input_json=data)
+    assert res.returncode == 0, res.stderr or res.stdout
+    assert load_results(outdir) == instr.score_data(data, {})
+    sweep = json.loads((outdir / "sweep.json").read_text(encoding="utf-8"))
+    assert sweep["modes"] == ["median", "mode"] and len(sweep["combinations"]) == 32
+
+    res, _ = run_cli(["score", "--input", "placeholder", "--sweep", "--sweep-modes", "median,avg"], input_json=data)
+    assert res.returncode == 2
+
+
+def test_run_core_profile_sweep(template_json, tmp_path):
+    inp = tmp_path / "in.json"
+    inp.write_text(json.dumps(template_json, ensure_ascii=False), encoding="utf-8")
+    profile = tmp_path / "core.toml"
+    profile.write_text(
+        f'[core]\ninput = "{inp}"\nout_base = "{tmp_path / "runs"}"\nsweep = true\n', encoding="utf-8"
+    )
+    env = dict(os.environ, PYTHONPATH=str(REPO))
+    env.pop("PHIO_SERVER_SOCKET", None)
+    cp = subprocess.run(
+        [sys.executable, str(REPO / "scripts" / "run_core.py"), "--profile", str(profile), "--run-id", "r1"],
+        cwd=REPO,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert cp.returncode == 0, cp.stderr or cp.stdout
+    sweep = json.loads((tmp_path / "runs" / "r1" / "sweep.json").read_text(encoding="utf-8"))
+    assert len(sweep["combinations"]) == 32
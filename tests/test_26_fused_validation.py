@@ -0,0 +1,78 @@
+import copy
+import json
+
+import pytest
+
+from scripts import phi_otimes_o_instrument_v0_1 as instr
+
+BAD_ITEMS = [
+    "pas un objet",
+    {"score": 1},
+    {"dimension": ["K"], "score": 1},
+    {"dimension": "  ", "score": 1},
+    {"dimension": "K"},
+    {"dimension": "K", "score": True},
+    {"dimension": "K", "score": 1.0},
+    {"dimension": "K", "score": 9},
+]
+
+
+def _with_items(template_json, items):
+    data = copy.deepcopy(template_json)
+    data["items"] = items
+    return data
+
+
+@pytest.mark.parametrize("bad", BAD_ITEMS)
+@pytest.mark.parametrize("pos", [0, 3])
+def test_fused_pass_reports_validate_input_message(template_json, bad, pos):
+    items = copy.deepcopy(template_json["items"])
+    items.insert(pos, bad)
+    data = _with_items(template_json, items)
+    with pytest.raises(ValueError) as ref:
+        instr.validate_input(data)
+    with pytest.raises(ValueError) as got:
+        instr.compile_plan().score(data)
+    assert str(got.value) == str(ref.value)
+
+
+def test_fused_pass_matches_two_pass_scores(template_json):
+    data = copy.deepcopy(template_json)
+    data["items"] = [dict(it, score=(i * 7) % 4) for i, it in enumerate(data["items"] * 5)]
+    plan = instr.compile_plan({"K": "bottleneck"})
+    assert plan.score(data) == plan.score_histograms(plan.histograms(data["items"]))
+    assert plan.score(data)["dimension_scores"] == instr.aggregate_dimension_scores(data, {"K": "bottleneck"})
+
+
+def test_all_errors_lists_every_invalid_item(template_json):
+    items = copy.deepcopy(template_json["items"]) + BAD_ITEMS
+    data = _with_items(template_json, items)
+    with pytest.raises(instr.InputErrors) as exc:
+        instr.compile_plan().score(data, all_errors=True)
+    assert len(exc.value.errors) == len(BAD_ITEMS)
+    assert exc.value.errors[0] == f"item[{len(template_json['items'])}] doit être un objet"
+    assert str(exc.value).splitlines() == exc.value.errors
+
+
+def test_cli_all_errors_exit_code(run_cli, template_json):
+    data = _with_items(template_json, copy.deepcopy(template_json["items"]) + BAD_ITEMS[-3:])
+
+    res, _ = run_cli(["score", "--input", "placeholder", "--no-cache"], input_json=data)
+    assert res.returncode == 2
+    assert len(res.stderr.strip().splitlines()) == 1
+
+    res, _ = run_cli(["score", "--input", "placeholder", "--no-cache", "--all-errors"], input_json=data)
+    assert res.returncode == 2
+    assert len(res.stderr.strip().splitlines()) == 3
+
+
+def test_score_batch_all_errors(run_cli, template_json, tmp_path):
+    bad = _with_items(template_json, copy.deepcopy(template_json["items"]) + BAD_ITEMS[-2:])
+    src = tmp_path / "cases.jsonl"
+    src.write_text(json.dumps(dict(bad, case_id="bad"), ensure_ascii=False) + "\n", encoding="utf-8")
+    out = tmp_path / "rows.jsonl"
+
+    res, _ = run_cli(["score-batch", "--input", str(src), "--out", str(out), "--all-errors"])
+    assert res.returncode == 2
+    (row,) = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert len(row["error"].splitlines()) == 2
@@ -0,0 +1,73 @@
+import copy
+import json
+import random
+import tracemalloc
+
+import pytest
+
+from scripts import phi_otimes_o_instrument_v0_1 as instr
+
+
+def _random_input(template_json, n, seed=3, tau="τ"):
+    rng = random.Random(seed)
+    data = copy.deepcopy(template_json)
+    dims = ["Cx", "K", tau, "G", "D", "extra"]
+    data["items"] = [
+        {"dimension": rng.choice(dims), "score": rng.randint(0, 3), "weight": rng.choice([0.5, 1.0, 2, 3.25])}
+        for _ in range(n)
+    ]
+    return data
+
+
+@pytest.mark.parametrize("modes", [{}, {"K": "bottleneck", "G": "quantile-0.9"}, {"Cx": "weighted_median"}])
+def test_table_scores_like_dicts(template_json, modes):
+    data = _random_input(template_json, 300)
+    table = instr.ItemTable.from_data(data)
+    assert len(table) == 300 and table.labels == list(dict.fromkeys(it["dimension"] for it in data["items"]))
+    instr.validate_input(table)
+    assert instr.aggregate_dimension_scores(table, modes) == instr.aggregate_dimension_scores(data, modes)
+    assert instr.score_data(table, modes) == instr.score_data(data, modes)
+
+
+def test_table_from_file_and_tau_resolution(template_json, tmp_path):
+    data = _random_input(template_json, 50, tau="tau")
+    data["items"].append({"dimension": "τ", "score": 3})
+    src = tmp_path / "in.json"
+    src.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    table = instr.ItemTable.from_file(src)
+    assert table.to_items()[-1] == {"dimension": "τ", "score": 3, "weight": 1.0}
+    assert instr.compile_plan().score(table) == instr.score_data(data, {})
+
+
+def test_table_validation_messages(template_json):
+    data = copy.deepcopy(template_json)
+    data["items"].append({"dimension": "K", "score": 4})
+    with pytest.raises(ValueError) as ref:
+        instr.validate_input(data)
+    with pytest.raises(ValueError) as got:
+        instr.ItemTable.from_data(data)
+    assert str(got.value) == str(ref.value)
+
+    data["items"][-1] = {"dimension": "K", "score": 1, "weight": -1}
+    table = instr.ItemTable.from_data(data)  # weights only matter to weighted modes
+    instr.score_data(table, {})
+    with pytest.raises(ValueError, match=r"item\[5\]\.weight invalide"):
+        instr.score_data(table, {"K": "weighted_median"})
+
+
+def test_table_memory_is_an_order_of_magnitude_smaller(template_json):
+    data = _random_input(template_json, 20000)
+    text = json.dumps(data, ensure_ascii=False)
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        parsed = json.loads(text)
+        as_dicts = tracemalloc.get_traced_memory()[0] - base
+        del parsed
+        base = tracemalloc.get_traced_memory()[0]
+        table = instr.ItemTable.from_data(data)
+        as_table = tracemalloc.get_traced_memory()[0] - base
+    finally:
+        tracemalloc.stop()
+    assert len(table) == 20000
+    assert as_table * 10 < as_dicts
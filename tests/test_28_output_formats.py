@@ -0,0 +1,44 @@
+import json
+
+
+def test_default_results_json_is_indented(run_cli, template_json):
+    res, outdir = run_cli(["score", "--input", "placeholder"], input_json=template_json)
+    assert res.returncode == 0, res.stderr or res.stdout
+    text = (outdir / "results.json").read_text(encoding="utf-8")
+    assert text == json.dumps(json.loads(text), ensure_ascii=False, indent=2)
+
+
+def test_compact_and_stdout(run_cli, template_json, load_results):
+    res, outdir = run_cli(["score", "--input", "placeholder"], input_json=template_json)
+    expected = load_results(outdir)
+
+    res, outdir = run_cli(["score", "--input", "placeholder", "--format", "compact"], input_json=template_json)
+    assert res.returncode == 0, res.stderr or res.stdout
+    text = (outdir / "results.json").read_text(encoding="utf-8")
+    assert "\n" not in text and json.loads(text) == expected
+
+    res, _ = run_cli(["score", "--input", "placeholder", "--outdir", "-", "--format", "compact"], input_json=template_json)
+    assert res.returncode == 0, res.stderr
+    assert json.loads(res.stdout) == expected
+
+
+def test_ndjson_appends_records(run_cli, template_json, tmp_path):
+    src = tmp_path / "in.json"
+    src.write_text(json.dumps(template_json, ensure_ascii=False), encoding="utf-8")
+    outdir = tmp_path / "out"
+    for _ in range(3):
+        res, _ = run_cli(["score", "--input", str(src), "--outdir", str(outdir), "--format", "ndjson"])
+        assert res.returncode == 0, res.stderr or res.stdout
+    rows = [json.loads(line) for line in (outdir / "results.ndjson").read_text(encoding="utf-8").splitlines()]
+    assert len(rows) == 3 and all(r["ok"] and r["case_id"] == str(src) for r in rows)
+    assert not (outdir / "results.json").exists()
+
+
+def test_score_batch_to_stdout(run_cli, template_json, tmp_path):
+    src = tmp_path / "cases.jsonl"
+    src.write_text("\n".join(json.dumps(dict(template_json, case_id=f"c{i}")) for i in range(3)) + "\n", encoding="utf-8")
+    res, _ = run_cli(["score-batch", "--input", str(src), "--out", "-"])
+    assert res.returncode == 0, res.stderr
+    rows = [json.loads(line) for line in res.stdout.splitlines()]
+    assert [r["case_id"] for r in rows] == ["c0", "c1", "c2"]
+    assert "[score-batch]" in res.stderr
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from scripts import phi_otimes_o_instrument_v0_1 as instr
+
+POINTS = [
+    {"Cx": 1.0, "K": 2.0, "τ": 0.5, "G": 1.5, "D": 0.0},
+    {"Cx": 0.0, "K": 3.0, "tau": 1.0, "G": 0.0, "D": 2.5},
+    {"K": 1.0},
+]
+
+
+@pytest.mark.parametrize("dims", POINTS)
+def test_partials_match_finite_differences(dims):
+    T, K_eff, sens = instr.compute_metrics_sensitivity(dims)
+    assert (T, K_eff) == instr.compute_metrics(dims)
+    h = 1e-6
+    for d in instr.METRIC_DIMS:
+        key = "tau" if d == "τ" and "τ" not in dims and "tau" in dims else d
+        up = dict(dims, **{key: dims.get(key, 0.0) + h})
+        T1, K1 = instr.compute_metrics(up)
+        assert sens["dT"][d] == pytest.approx((T1 - T) / h, rel=1e-4, abs=1e-6)
+        assert sens["dK_eff"][d] == pytest.approx((K1 - K_eff) / h, rel=1e-4, abs=1e-6)
+
+
+def test_zone_margin_and_to_boundary():
+    margin, t = instr.zone_margin(1.4)
+    assert t == 1.5 and margin == pytest.approx(-0.1)
+    dims = {"Cx": 1.0, "K": 2.0, "τ": 0.25, "G": 1.5, "D": 0.0}
+    T, _, sens = instr.compute_metrics_sensitivity(dims)
+    step = sens["to_boundary"]["G"]
+    T_at, _ = instr.compute_metrics(dict(dims, G=dims["G"] + step))
+    assert abs(T_at - sens["nearest_threshold"]) < abs(sens["zone_margin"]) / 10
+    assert sens["driver"] == "G"
+
+
+def test_score_batch_boundary_index(run_cli, template_json, tmp_path):
+    src = tmp_path / "cases.jsonl"
+    with src.open("w", encoding="utf-8") as f:
+        for i, score in enumerate([0, 1, 2, 3]):
+            case = dict(template_json, case_id=f"c{i}")
+            case["items"] = [dict(it, score=score) for it in template_json["items"]]
+            f.write(json.dumps(case, ensure_ascii=False) + "\n")
+    out, index_path = tmp_path / "rows.jsonl", tmp_path / "boundary.json"
+
+    res, _ = run_cli(
+        ["score-batch", "--input", str(src), "--out", str(out), "--sensitivity", "--boundary-index", str(index_path)]
+    )
+    assert res.returncode == 0, res.stderr or res.stdout
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert all("sensitivity" in r["results"] for r in rows)
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    margins = [abs(c["zone_margin"]) for c in index["cases"]]
+    assert index["count"] == 4 and margins == sorted(margins)
+    by_id = {r["case_id"]: r["results"]["sensitivity"]["zone_margin"] for r in rows}
+    assert all(c["zone_margin"] == by_id[c["case_id"]] for c in index["cases"])
+
+
+def test_score_sensitivity_flag(run_cli, template_json, load_results):
+    res, outdir = run_cli(["score", "--input", "placeholder", "--sensitivity"], input_json=template_json)
+    assert res.returncode == 0, res.stderr or res.stdout
+    out = load_results(outdir)
+    assert set(out["sensitivity"]["dT"]) == set(instr.METRIC_DIMS)
@@ -0,0 +1,125 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+def _run_core(profile, *extra):
+    env = dict(os.environ, PYTHONPATH=str(REPO))
+    env.pop("PHIO_SERVER_SOCKET", None)
+    return subprocess.run(
+        [sys.executable, str(REPO / "scripts" / "run_core.py"), "--profile", str(profile), "--write-run-manifest", *extra],
+        cwd=REPO,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+
+def _profile(tmp_path, inp, **core):
+    lines = [f'input = "{inp}"', f'out_base = "{tmp_path / "runs"}"'] + [f"{k} = {json.dumps(v)}" for k, v in core.items()]
+    path = tmp_path / "core.toml"
+    path.write_text("[core]\n" + "\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_inproc_matches_subprocess(template_json, tmp_path):
+    inp = tmp_path / "in.json"
+    inp.write_text(json.dumps(template_json, ensure_ascii=False), encoding="utf-8")
+    profile = _profile(tmp_path, inp, mode="inproc")
+
+    cp = _run_core(profile, "--run-id", "inproc")
+    assert cp.returncode == 0, cp.stderr or cp.stdout
+    cp = _run_core(_profile(tmp_path, inp), "--run-id", "sub", "--force")
+    assert cp.returncode == 0, cp.stderr or cp.stdout
+
+    runs = tmp_path / "runs"
+    manifest = json.loads((runs / "inproc" / "run_manifest.json").read_text(encoding="utf-8"))
+    assert manifest["execution"]["mode"] == "inproc"
+    assert json.loads((runs / "sub" / "run_manifest.json").read_text(encoding="utf-8"))["execution"]["mode"] == "subprocess"
+    read = lambda r: json.loads((runs / r / "results.json").read_text(encoding="utf-8"))  # noqa: E731
+    assert read("inproc") == read("sub")
+
+
+def test_inproc_captures_errors(template_json, tmp_path):
+    bad = dict(template_json, items=[{"dimension": "K", "score": 9}])
+    inp = tmp_path / "bad.json"
+    inp.write_text(json.dumps(bad), encoding="utf-8")
+
+    cp = _run_core(_profile(tmp_path, inp), "--inproc", "--run-id", "r")
+    assert cp.returncode == 2
+    execution = json.loads((tmp_path / "runs" / "r" / "run_manifest.json").read_text(encoding="utf-8"))["execution"]
+    assert execution["mode"] == "inproc"
+    assert "hors borne" in execution["stderr"]
+
+
+def test_inproc_falls_back_without_main(template_json, tmp_path):
+    tool = tmp_path / "third_party.py"
+    tool.write_text(
+        "import sys, pathlib\n"
+        "out = pathlib.Path(sys.argv[sys.argv.index('--outdir') + 1])\n"
+        "out.mkdir(parents=True, exist_ok=True)\n"
+        "(out / 'results.json').write_text('{}')\n",
+        encoding="utf-8",
+    )
+    inp = tmp_path / "in.json"
+    inp.write_text(json.dumps(template_json), encoding="utf-8")
+
+    cp = _run_core(_profile(tmp_path, inp, instrument=str(tool), mode="inproc"), "--run-id", "r")
+    assert cp.returncode == 0, cp.stderr or cp.stdout
+    execution = json.loads((tmp_path / "runs" / "r" / "run_manifest.json").read_text(encoding="utf-8"))["execution"]
+    assert execution["mode"] == "subprocess"
+
+
+def test_fanout_inputs_and_jobs(template_json, tmp_path):
+    data = tmp_path / "data"
+    (data / "nightly").mkdir(parents=True)
+    for name in ("b", "a", "c"):
+        (data / "nightly" / f"{name}.json").write_text(json.dumps(template_json), encoding="utf-8")
+    (data / "a.json").write_text(json.dumps(dict(template_json, items=[])), encoding="utf-8")  # invalid
+    profile = _profile(tmp_path, "", inputs=[str(data / "a.json"), str(data / "nightly" / "*.json")], jobs=3)
+    profile.write_text(profile.read_text(encoding="utf-8").replace('input = ""\n', ""), encoding="utf-8")
+
+    cp = _run_core(profile, "--run-id", "r")
+    assert cp.returncode == 2, cp.stderr or cp.stdout
+    runs = tmp_path / "runs" / "r"
+    manifest = json.loads((runs / "run_manifest.json").read_text(encoding="utf-8"))
+    assert [Path(r["input"]).relative_to(data).as_posix() for r in manifest["inputs"]] == [
+        "a.json",
+        "nightly/a.json",
+        "nightly/b.json",
+        "nightly/c.json",
+    ]
+    assert [Path(r["outdir"]).name for r in manifest["inputs"]] == ["a", "a-2", "b", "c"]
+    assert [r["returncode"] for r in manifest["inputs"]] == [2, 0, 0, 0]
+    assert manifest["counts"] == {"inputs": 4, "ok": 3, "failed": 1}
+    assert all((runs / name / "results.json").exists() for name in ("a-2", "b", "c"))
+
+
+def test_fanout_rejects_jobs_below_one(template_json, tmp_path):
+    inp = tmp_path / "in.json"
+    inp.write_text(json.dumps(template_json), encoding="utf-8")
+    cp = _run_core(_profile(tmp_path, "", inputs=[str(inp)]), "--jobs", "0")
+    assert cp.returncode == 2
+    assert "--jobs: must be an integer >= 1: 0" in cp.stderr and "Traceback" not in cp.stderr
+
+    cp = _run_core(_profile(tmp_path, "", inputs=[str(inp)], jobs=-1))
+    assert cp.returncode != 0
+    assert "Invalid profile: [core].jobs must be an integer >= 1" in cp.stderr and "Traceback" not in cp.stderr
+
+
+def test_inproc_load_leaves_sys_path_alone(template_json, tmp_path):
+    from scripts import run_core
+
+    inp = tmp_path / "in.json"
+    inp.write_text(json.dumps(template_json, ensure_ascii=False), encoding="utf-8")
+    before = list(sys.path)
+    main_fn = run_core._load_inproc_main(REPO / "scripts" / "phi_otimes_o_instrument_v0_1.py")
+    assert sys.path == before
+    rc, _, err = run_core._run_instrument_inproc(main_fn, inp, tmp_path / "out", ["--no-cache"])
+    assert rc == 0, err
+    assert sys.path == before
+    assert (tmp_path / "out" / "results.json").exists()
@@ -0,0 +1,94 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+def _run_core(profile, run_id, *extra):
+    env = dict(os.environ, PYTHONPATH=str(REPO))
+    env.pop("PHIO_SERVER_SOCKET", None)
+    cp = subprocess.run(
+        [sys.executable, str(REPO / "scripts" / "run_core.py"), "--profile", str(profile), "--run-id", run_id]
+        + ["--write-run-manifest", *extra],
+        cwd=REPO,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert cp.returncode == 0, cp.stderr or cp.stdout
+    return json.loads((Path(profile).parent / "runs" / run_id / "run_manifest.json").read_text(encoding="utf-8"))
+
+
+def test_single_input_skips_up_to_date_runs(template_json, tmp_path):
+    inp = tmp_path / "in.json"
+    inp.write_text(json.dumps(template_json, ensure_ascii=False), encoding="utf-8")
+    profile = tmp_path / "core.toml"
+    profile.write_text(f'[core]\ninput = "{inp}"\nout_base = "{tmp_path / "runs"}"\n', encoding="utf-8")
+
+    assert _run_core(profile, "r1")["execution"]["mode"] == "subprocess"
+    m2 = _run_core(profile, "r2")
+    assert m2["execution"]["mode"] == "reused" and m2["execution"]["reused_run_id"] == "r1"
+    assert m2["fingerprint"]["input_sha256"]
+    r1, r2 = (tmp_path / "runs" / r / "results.json" for r in ("r1", "r2"))
+    assert r2.read_text(encoding="utf-8") == r1.read_text(encoding="utf-8")
+
+    assert _run_core(profile, "r3", "--force")["execution"]["mode"] == "subprocess"
+    inp.write_text(json.dumps(dict(template_json, items=template_json["items"][:3])), encoding="utf-8")
+    assert _run_core(profile, "r4")["execution"]["mode"] == "subprocess"
+
+    profile.write_text(profile.read_text(encoding="utf-8") + 'extra_args = ["--bottleneck"]\n', encoding="utf-8")
+    assert _run_core(profile, "r5")["execution"]["mode"] == "subprocess"
+
+
+def test_fanout_reruns_only_changed_inputs(template_json, tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    for name in ("a", "b", "c"):
+        (data / f"{name}.json").write_text(json.dumps(template_json), encoding="utf-8")
+    profile = tmp_path / "core.toml"
+    profile.write_text(
+        f'[core]\ninputs = ["{data}/*.json"]\nout_base = "{tmp_path / "runs"}"\njobs = 2\n', encoding="utf-8"
+    )
+
+    first = _run_core(profile, "n1")
+    assert [r["execution"]["mode"] for r in first["inputs"]] == ["subprocess"] * 3
+    (data / "b.json").write_text(json.dumps(dict(template_json, items=template_json["items"][:2])), encoding="utf-8")
+    second = _run_core(profile, "n2")
+    assert [r["execution"]["mode"] for r in second["inputs"]] == ["reused", "subprocess", "reused"]
+    assert all((tmp_path / "runs" / "n2" / n / "results.json").exists() for n in ("a", "b", "c"))
+
+
+def test_sibling_module_edit_triggers_rescore(template_json, tmp_path):
+    scripts = tmp_path / "scripts"
+    scripts.mkdir()
+    for src in (REPO / "scripts").glob("*.py"):
+        (scripts / src.name).write_bytes(src.read_bytes())
+    inp = tmp_path / "in.json"
+    inp.write_text(json.dumps(template_json, ensure_ascii=False), encoding="utf-8")
+    profile = tmp_path / "core.toml"
+    core = f'instrument = "{scripts / "phi_otimes_o_instrument_v0_1.py"}"\ninput = "{inp}"\n'
+    profile.write_text(f'[core]\n{core}out_base = "{tmp_path / "runs"}"\n', encoding="utf-8")
+
+    _run_core(profile, "r1")
+    assert _run_core(profile, "r2")["execution"]["mode"] == "reused"
+    # loaded through _sibling(), not an import statement
+    with (scripts / "phio_columnar.py").open("a", encoding="utf-8") as f:
+        f.write("\n# edited\n")
+    assert _run_core(profile, "r3")["execution"]["mode"] == "subprocess"
+
+
+def test_reuse_links_scoring_outputs_only(template_json, tmp_path):
+    inp = tmp_path / "in.json"
+    inp.write_text(json.dumps(template_json, ensure_ascii=False), encoding="utf-8")
+    profile = tmp_path / "core.toml"
+    core = f'input = "{inp}"\nout_base = "{tmp_path / "runs"}"\nextra_args = ["--perf", "--cprofile"]\n'
+    profile.write_text("[core]\n" + core, encoding="utf-8")
+
+    _run_core(profile, "r1", "--cprofile")
+    r1 = tmp_path / "runs" / "r1"
+    assert {"run_core.pstats", "score.pstats"} <= {p.name for p in r1.iterdir()}
+    assert _run_core(profile, "r2")["execution"]["mode"] == "reused"
+    assert sorted(p.name for p in (tmp_path / "runs" / "r2").iterdir()) == ["results.json", "run_manifest.json"]
@@ -0,0 +1,109 @@
+import json
+import os
+import pstats
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+def _run(script, *args):
+    env = dict(os.environ, PYTHONPATH=str(REPO))
+    env.pop("PHIO_SERVER_SOCKET", None)
+    env.pop("PHIO_PERF_OUT", None)
+    return subprocess.run(
+        [sys.executable, str(REPO / "scripts" / script), *map(str, args)],
+        cwd=REPO,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+
+def _names(perf):
+    return [p["name"] for p in perf["phases"]]
+
+
+@pytest.mark.parametrize("mode", ["subprocess", "inproc"])
+def test_run_core_manifest_perf(template_json, tmp_path, mode):
+    inp = tmp_path / "in.json"
+    inp.write_text(json.dumps(template_json, ensure_ascii=False), encoding="utf-8")
+    profile = tmp_path / "core.toml"
+    core = f'input = "{inp}"\nout_base = "{tmp_path / "runs"}"\nmode = "{mode}"\n'
+    # an empty cache, so the instrument decodes the input
+    core += f'extra_args = ["--cache-dir", "{tmp_path / "cache"}"]\n'
+    profile.write_text("[core]\n" + core, encoding="utf-8")
+
+    cp = _run("run_core.py", "--profile", profile, "--write-run-manifest", "--run-id", "r", "--cprofile")
+    assert cp.returncode == 0, cp.stderr or cp.stdout
+    outdir = tmp_path / "runs" / "r"
+    manifest = json.loads((outdir / "run_manifest.json").read_text(encoding="utf-8"))
+
+    perf = manifest["perf"]
+    assert {"profile", "fingerprint", "score"} <= set(_names(perf))
+    assert perf["total"]["wall_s"] >= sum(p["wall_s"] for p in perf["phases"]) * 0.99
+    assert perf["peak_rss_bytes"] > 0
+
+    child = manifest["execution"]["perf"]
+    assert "decode_validate" in _names(child["instrument"]) and "write" in _names(child["instrument"])
+    assert child["startup_s"] >= 0.0
+    assert not (outdir / "perf.json").exists()  # reported through the manifest only
+
+    pstats.Stats(str(outdir / "run_core.pstats"))
+
+
+def test_instrument_perf_and_cprofile(run_cli, template_json, tmp_path):
+    res, outdir = run_cli(
+        ["score", "--input", "placeholder", "--no-cache", "--perf", "--cprofile"], input_json=template_json
+    )
+    assert res.returncode == 0, res.stderr
+    perf = json.loads((outdir / "perf.json").read_text(encoding="utf-8"))
+    assert perf["command"] == "score"
+    assert _names(perf)[:2] == ["args", "setup"]
+    assert {"decode_validate", "aggregate", "write"} <= set(_names(perf))
+    assert set(perf["total"]) == {"wall_s", "cpu_s", "read_bytes", "write_bytes"}
+    assert "perf" not in json.loads((outdir / "results.json").read_text(encoding="utf-8"))
+    assert pstats.Stats(str(outdir / "score.pstats")).total_calls > 0
+
+
+def test_instrument_perf_when_run_as_script(template_json, tmp_path):
+    src = tmp_path / "in.json"
+    src.write_text(json.dumps(template_json, ensure_ascii=False), encoding="utf-8")
+    env = {k: v for k, v in os.environ.items() if k not in ("PYTHONPATH", "PHIO_SERVER_SOCKET", "PHIO_PERF_OUT")}
+    script = REPO / "scripts" / "phi_otimes_o_instrument_v0_1.py"
+    cmd = [sys.executable, str(script), "score", "--input", str(src), "--outdir", str(tmp_path / "out")]
+    cp = subprocess.run(cmd + ["--no-cache", "--perf", "--cprofile"], cwd=tmp_path, env=env, capture_output=True, text=True)
+    assert cp.returncode == 0, cp.stderr
+    assert "decode_validate" in _names(json.loads((tmp_path / "out" / "perf.json").read_text(encoding="utf-8")))
+    pstats.Stats(str(tmp_path / "out" / "score.pstats"))
+
+
+def test_score_batch_perf(run_cli, template_json, tmp_path):
+    src = tmp_path / "cases.jsonl"
+    src.write_text(json.dumps(dict(template_json, case_id="a"), ensure_ascii=False) + "\n", encoding="utf-8")
+    out = tmp_path / "rows.jsonl"
+    res, _ = run_cli(["score-batch", "--input", str(src), "--out", str(out), "--perf", "--boundary-index", str(tmp_path / "b.json")])
+    assert res.returncode == 0, res.stderr
+    perf = json.loads((tmp_path / "rows.jsonl.perf.json").read_text(encoding="utf-8"))
+    assert _names(perf) == ["args", "score_rows", "boundary_index"]
+
+
+def test_collector_manifest_perf(tmp_path):
+    src = tmp_path / "series.csv"
+    src.write_text("ts,value\n2024-01-01T00:00:00Z,1.5\n", encoding="utf-8")
+    profile = tmp_path / "collector.toml"
+    profile.write_text(
+        f'[collector]\nkind = "local_copy"\nsource = "{src}"\nout_base = "{tmp_path / "collected"}"\n', encoding="utf-8"
+    )
+    cp = _run("run_collector.py", "--profile", profile, "--run-id", "c", "--cprofile")
+    assert cp.returncode == 0, cp.stderr or cp.stdout
+    outdir = tmp_path / "collected" / "c"
+    perf = json.loads((outdir / "collector_manifest.json").read_text(encoding="utf-8"))["perf"]
+    assert _names(perf) == ["profile", "copy", "hash"]
+    copy = perf["phases"][1]
+    if copy["write_bytes"] is not None:
+        assert copy["write_bytes"] >= src.stat().st_size
+    pstats.Stats(str(outdir / "run_collector.pstats"))
@@ -0,0 +1,112 @@
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from scripts import phio_timeseries as ts
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+def _iso(t):
+    return datetime.fromtimestamp(t, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def test_fixed_format_parser_matches_datetime():
+    rng = random.Random(5)
+    for _ in range(2000):
+        t = rng.randint(0, 4_000_000_000)
+        assert ts.parse_ts(_iso(t)) == t
+    assert ts.parse_ts("2024-02-29T23:59:59Z") == 1709251199
+
+
+@pytest.mark.parametrize(
+    "bad",
+    ["2026-02-29T00:00:00Z", "2026-13-01T00:00:00Z", "2026-01-01T24:00:00Z", "2026-01-01 00:00:00Z",
+     "2026-01-01T00:00:00+00:00", "2026-01-01T00:00:00.5Z", "2026-1-01T00:00:00Z", "+026-01-01T00:00:00Z"],
+)
+def test_parser_rejects_other_shapes(bad):
+    with pytest.raises(ValueError):
+        ts.parse_ts(bad)
+
+
+def _write(path, rows, header="ts,value"):
+    path.write_text(header + "\n" + "".join(f"{a},{b}\n" for a, b in rows), encoding="utf-8")
+    return path
+
+
+def test_summary_is_independent_of_chunk_size(tmp_path):
+    rng = random.Random(7)
+    t0 = 1767225600
+    times = [t0 + 60 * i for i in range(3000)]
+    times[100] = times[99]  # duplicate, then a 120 s gap
+    times[2000] += 600  # gap, then out of order
+    vals = [rng.uniform(-5, 5) + 1e6 for _ in times]
+    src = _write(tmp_path / "s.csv", [(_iso(t), repr(v)) for t, v in zip(times, vals)])
+
+    ref = ts.summarize_csv(src)
+    small = ts.summarize_csv(src, chunk_bytes=97)
+    assert ref["chunks"] == 1 and small["chunks"] > 100
+    assert small["ts"] == ref["ts"]
+    assert small["value"] == pytest.approx(ref["value"], rel=1e-12)
+    assert ref["rows"] == 3000
+    assert ref["ts"]["first"] == _iso(t0) and ref["ts"]["span_s"] == times[-1] - t0
+    assert (ref["ts"]["duplicates"], ref["ts"]["out_of_order"]) == (1, 1)
+    assert (ref["ts"]["step_min_s"], ref["ts"]["step_max_s"], ref["ts"]["gaps"]) == (60, 660, 2)
+    mean = math.fsum(vals) / len(vals)
+    assert ref["value"]["mean"] == pytest.approx(mean, rel=1e-15)
+    assert ref["value"]["std"] == pytest.approx((sum((v - mean) ** 2 for v in vals) / len(vals)) ** 0.5, rel=1e-9)
+
+
+def test_crlf_blank_lines_and_errors(tmp_path):
+    src = tmp_path / "s.csv"
+    src.write_bytes(b"ts,value\r\n2026-01-01T00:00:00Z,1\r\n\r\n2026-01-01T00:00:10Z,3\r\n")
+    out = ts.summarize_csv(src)
+    assert out["rows"] == 2 and out["value"]["mean"] == 2.0 and out["ts"]["step_min_s"] == 10
+
+    bad = _write(tmp_path / "b.csv", [("2026-01-01T00:00:00Z", "1"), ("2026-01-01T00:00:01Z", "x")])
+    with pytest.raises(ValueError, match=r"ligne 3: valeur invalide"):
+        ts.summarize_csv(bad)
+    bad = _write(tmp_path / "b.csv", [("2026-01-01T00:00:00Z", "1"), ("2026-01-01T25:00:00Z", "1")])
+    with pytest.raises(ValueError, match=r"ligne 3: heure invalide"):
+        ts.summarize_csv(bad)
+    bad = _write(tmp_path / "b.csv", [("2026-01-01T00:00:00Z", "nan")])
+    with pytest.raises(ValueError, match=r"ligne 2: valeur non finie"):
+        ts.summarize_csv(bad)
+    with pytest.raises(ValueError, match="en-tête CSV"):
+        ts.summarize_csv(_write(tmp_path / "h.csv", [], header="time,v"))
+    with pytest.raises(ValueError, match="vide"):
+        ts.summarize_csv(_write(tmp_path / "e.csv", []))
+
+
+def test_run_core_example_profile(tmp_path):
+    profile = tmp_path / "core.toml"
+    src = REPO / "profiles" / "core_example.toml"
+    profile.write_text(
+        src.read_text(encoding="utf-8")
+        .replace('"./test_data/minimal_timeseries.csv"', json.dumps(str(REPO / "test_data" / "minimal_timeseries.csv")))
+        .replace('out_base = "./runs"', f"out_base = {json.dumps(str(tmp_path / 'runs'))}"),
+        encoding="utf-8",
+    )
+    env = dict(os.environ, PYTHONPATH=str(REPO))
+    env.pop("PHIO_SERVER_SOCKET", None)
+    cmd = [sys.executable, str(REPO / "scripts" / "run_core.py"), "--profile", str(profile), "--write-run-manifest"]
+    cp = subprocess.run(cmd + ["--run-id", "r1"], cwd=REPO, env=env, capture_output=True, text=True)
+    assert cp.returncode == 0, cp.stderr or cp.stdout
+
+    outdir = tmp_path / "runs" / "r1"
+    summary = json.loads((outdir / "timeseries.json").read_text(encoding="utf-8"))
+    assert summary["rows"] == 5 and summary["ts"]["step_min_s"] == 86400 and summary["value"]["max"] == 1.4
+    manifest = json.loads((outdir / "run_manifest.json").read_text(encoding="utf-8"))
+    assert manifest["execution"]["mode"] == "timeseries" and "adapter_sha256" in manifest["fingerprint"]
+
+    cp = subprocess.run(cmd + ["--run-id", "r2"], cwd=REPO, env=env, capture_output=True, text=True)
+    assert cp.returncode == 0, cp.stderr or cp.stdout
+    manifest = json.loads((tmp_path / "runs" / "r2" / "run_manifest.json").read_text(encoding="utf-8"))
+    assert manifest["execution"]["mode"] == "reused"